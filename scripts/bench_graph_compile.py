@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# scripts/bench_graph_compile.py
+"""
+Benchmark: LangGraph compile cost vs steady-state invoke overhead.
+
+Compares a per-message ``workflow.compile(checkpointer=...)`` (old behaviour)
+with the cached compiled graph returned by ``get_compiled_graph()``.
+The LLM is replaced by a fake model and an in-memory checkpointer is used,
+so the numbers isolate graph/framework overhead (no Ollama/Postgres needed).
+
+Usage:
+    uv run python scripts/bench_graph_compile.py [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+
+from src.core import agent_graph  # noqa: E402
+
+
+def _fmt(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"mean={statistics.fmean(ordered) * 1000:8.3f} ms  p50={p50:8.3f} ms  p99={p99:8.3f} ms"
+
+
+async def _invoke(graph, thread_id: str) -> None:
+    config = {"configurable": {"thread_id": thread_id}}
+    await graph.ainvoke({"messages": [HumanMessage(content="ping")]}, config=config)
+
+
+async def main(iterations: int) -> None:
+    agent_graph.llm_with_tools = GenericFakeChatModel(messages=itertools.repeat(AIMessage(content="pong")))
+    checkpointer = InMemorySaver()
+
+    async def fake_get_checkpointer():
+        return checkpointer
+
+    agent_graph.get_checkpointer = fake_get_checkpointer
+
+    # Warm-up
+    await _invoke(await agent_graph.get_compiled_graph(), "warmup")
+
+    compile_times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        agent_graph.workflow.compile(checkpointer=checkpointer)
+        compile_times.append(time.perf_counter() - start)
+
+    per_message = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        graph = agent_graph.workflow.compile(checkpointer=checkpointer)
+        await _invoke(graph, f"uncached-{i}")
+        per_message.append(time.perf_counter() - start)
+
+    cached = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        graph = await agent_graph.get_compiled_graph()
+        await _invoke(graph, f"cached-{i}")
+        cached.append(time.perf_counter() - start)
+
+    nodes = len(agent_graph.workflow.nodes)
+    tools = len(agent_graph.tool_node.tools_by_name)
+    print(f"Graph: {nodes} nodes, {tools} tools, {iterations} iterations")
+    print(f"compile only            {_fmt(compile_times)}")
+    print(f"compile + invoke (old)  {_fmt(per_message)}")
+    print(f"cached + invoke (new)   {_fmt(cached)}")
+    saved = statistics.fmean(per_message) - statistics.fmean(cached)
+    print(f"fixed cost saved per message: {saved * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# scripts/bench_kb_profiles.py
+"""
+Benchmark: memory footprint and search latency of the KB collection profiles.
+
+For each profile in ``COLLECTION_PROFILES`` a scratch collection is filled
+with synthetic unit vectors (768 dims), the script waits for indexing to
+finish, then reports p50/p99 latency of top-10 queries, recall@10 against
+exact search, and the estimated RAM/disk footprint. Needs a Qdrant server
+(local mode ignores quantization and HNSW); scratch collections are dropped
+at the end unless ``--keep`` is given.
+
+Usage:
+    uv run python scripts/bench_kb_profiles.py [--vectors 1000000] [--queries 500] [--profiles default balanced]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qdrant_client import AsyncQdrantClient, models  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+from src.services.vector_store import COLLECTION_PROFILES, CollectionProfile, VectorStoreService  # noqa: E402
+
+DIM = VectorStoreService.VECTOR_SIZE
+UPLOAD_CHUNK = 10_000
+RECALL_QUERIES = 100
+
+
+def _unit_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, DIM), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _footprint_mb(profile: CollectionProfile, n: int) -> tuple[float, float]:
+    """Estimated (RAM, disk-only) MB: vectors, int8 copy and HNSW level-0 links (2*m uint32 per point)."""
+    original = n * DIM * 4
+    quantized = n * DIM if profile.quantization else 0
+    graph = n * profile.hnsw_m * 2 * 4
+    ram = quantized + graph + (0 if profile.on_disk else original)
+    disk_only = original if profile.on_disk else 0
+    return ram / 2**20, disk_only / 2**20
+
+
+async def _fill(client: AsyncQdrantClient, name: str, profile: CollectionProfile, n: int, seed: int) -> None:
+    if await client.collection_exists(name):
+        await client.delete_collection(name)
+    await client.create_collection(
+        collection_name=name,
+        vectors_config=profile.vector_params(DIM),
+        hnsw_config=profile.hnsw_config(),
+        quantization_config=profile.quantization_config(),
+    )
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, UPLOAD_CHUNK):
+        count = min(UPLOAD_CHUNK, n - start)
+        client.upload_collection(
+            collection_name=name,
+            vectors=_unit_vectors(rng, count),
+            ids=range(start, start + count),
+            batch_size=256,
+            wait=True,
+        )
+    while (await client.get_collection(name)).status != models.CollectionStatus.GREEN:
+        await asyncio.sleep(2)
+
+
+async def _bench(client: AsyncQdrantClient, name: str, profile: CollectionProfile, queries: np.ndarray) -> dict:
+    params = profile.search_params()
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        response = await client.query_points(name, query=query.tolist(), limit=10, search_params=params)
+        latencies.append(time.perf_counter() - start)
+        results.append({p.id for p in response.points})
+
+    recall = 0.0
+    for query, found in zip(queries[:RECALL_QUERIES], results, strict=False):
+        exact = await client.query_points(
+            name, query=query.tolist(), limit=10, search_params=models.SearchParams(exact=True)
+        )
+        recall += len(found & {p.id for p in exact.points}) / 10
+    ordered = sorted(latencies)
+    return {
+        "p50": statistics.median(ordered) * 1000,
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+        "recall": recall / min(RECALL_QUERIES, len(queries)),
+    }
+
+
+async def main(n: int, n_queries: int, profiles: list[str], keep: bool) -> None:
+    client = AsyncQdrantClient(
+        host=settings.QDRANT_HOST,
+        port=settings.QDRANT_PORT,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+        timeout=300,
+    )
+    queries = _unit_vectors(np.random.default_rng(1), n_queries)
+    print(f"{n:,} vectors x {DIM} dims, {n_queries} queries (top-10), recall vs exact on {RECALL_QUERIES}")
+    print(f"{'profile':<12} {'RAM MB':>9} {'disk MB':>9} {'p50 ms':>8} {'p99 ms':>8} {'recall':>7}  build")
+    try:
+        for name in profiles:
+            profile = COLLECTION_PROFILES[name]
+            collection = f"bench_profile_{name}"
+            start = time.perf_counter()
+            await _fill(client, collection, profile, n, seed=0)
+            build = time.perf_counter() - start
+            stats = await _bench(client, collection, profile, queries)
+            ram, disk = _footprint_mb(profile, n)
+            print(
+                f"{name:<12} {ram:9.0f} {disk:9.0f} {stats['p50']:8.2f} {stats['p99']:8.2f} "
+                f"{stats['recall']:7.3f}  {build:.0f}s"
+            )
+            if not keep:
+                await client.delete_collection(collection)
+    finally:
+        await client.close()
+    print("RAM/disk are estimates (vectors + int8 copy + HNSW links); add ~20% for payloads and overhead.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--profiles", nargs="+", default=list(COLLECTION_PROFILES), choices=list(COLLECTION_PROFILES))
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    args = parser.parse_args()
+    asyncio.run(main(args.vectors, args.queries, args.profiles, args.keep))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# scripts/bench_kb_recall.py
+"""
+Benchmark: KB recall@k, dense-only vs hybrid (dense + BM25 sparse, RRF).
+
+Indexes a fixed financial corpus into an in-memory Qdrant collection twice
+(with and without sparse vectors) and scores a fixed query set heavy on
+tickers and acronyms. Embeddings come from the configured Ollama embedding
+model, so Ollama must be reachable; Qdrant is not needed.
+
+Usage:
+    uv run python scripts/bench_kb_recall.py [--fixture scripts/data/kb_recall_queries.json] [--k 1 3 5]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qdrant_client import AsyncQdrantClient  # noqa: E402
+
+from src.services.llm import OllamaService, close_http_client  # noqa: E402
+from src.services.vector_store import VectorStoreService  # noqa: E402
+
+DEFAULT_FIXTURE = Path(__file__).resolve().parent / "data" / "kb_recall_queries.json"
+
+
+async def _build_store(hybrid: bool, documents: list[dict], vectors) -> VectorStoreService:
+    store = VectorStoreService(client=AsyncQdrantClient(location=":memory:"))
+    store.hybrid = hybrid
+    for document, vector in zip(documents, vectors, strict=True):
+        await store.add_context(question_id=document["id"], embedding=vector.tolist(), text=document["text"])
+    return store
+
+
+async def _recall(store: VectorStoreService, queries: list[dict], vectors, k: int, hybrid: bool) -> float:
+    total = 0.0
+    for query, vector in zip(queries, vectors, strict=True):
+        hits = await store.query(vector.tolist(), top_k=k, query_text=query["query"] if hybrid else None)
+        relevant = set(query["relevant"])
+        total += len(relevant & {hit["id"] for hit in hits}) / len(relevant)
+    return total / len(queries)
+
+
+async def main(fixture: Path, ks: list[int]) -> None:
+    data = json.loads(fixture.read_text(encoding="utf-8"))
+    documents, queries = data["documents"], data["queries"]
+
+    ollama = OllamaService()
+    try:
+        doc_vectors = await ollama.create_embeddings([d["text"] for d in documents])
+        query_vectors = await ollama.create_embeddings([q["query"] for q in queries])
+    finally:
+        await close_http_client()
+
+    dense = await _build_store(False, documents, doc_vectors)
+    hybrid = await _build_store(True, documents, doc_vectors)
+
+    print(f"Corpus: {len(documents)} documents, {len(queries)} queries, model={ollama.embedding_model}")
+    print(f"{'k':>3}  {'dense':>8}  {'hybrid':>8}")
+    for k in ks:
+        dense_recall = await _recall(dense, queries, query_vectors, k, hybrid=False)
+        hybrid_recall = await _recall(hybrid, queries, query_vectors, k, hybrid=True)
+        print(f"{k:>3}  {dense_recall:8.3f}  {hybrid_recall:8.3f}")
+
+    await dense.close()
+    await hybrid.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    args = parser.parse_args()
+    asyncio.run(main(args.fixture, args.k))
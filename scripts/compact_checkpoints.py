@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# scripts/compact_checkpoints.py
+"""
+One-off migration: compact checkpointed threads bloated by full-history replay.
+
+Before checkpoint-aware assembly every chat turn re-sent the system prompt and
+the whole DB history to a thread that already stored them. This removes those
+duplicates from every conversation's checkpoint (threads are also compacted
+lazily on their next message, so running this is optional).
+
+Usage:
+    uv run python scripts/compact_checkpoints.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import agent_graph  # noqa: E402
+from src.services.database import get_conversations, get_db_session  # noqa: E402
+
+
+async def main(dry_run: bool) -> None:
+    async with get_db_session() as session:
+        conversations = await get_conversations(session)
+
+    graph = await agent_graph.get_compiled_graph()
+    total = 0
+    try:
+        for conv in conversations:
+            thread_id = f"conv_{conv.id}"
+            if dry_run:
+                snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+                removed = len(agent_graph.find_redundant_messages(snapshot.values.get("messages", [])))
+            else:
+                removed = await agent_graph.compact_thread(thread_id, graph)
+            if removed:
+                print(f"{thread_id}: {removed} redundant messages{' (dry run)' if dry_run else ' removed'}")
+            total += removed
+    finally:
+        await agent_graph.close_checkpointer()
+
+    print(f"{len(conversations)} threads scanned, {total} redundant messages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
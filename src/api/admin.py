@@ -22,6 +22,7 @@ from src.services.auth_service import (
     get_user_by_username,
     update_user,
 )
+from src.services.principal_cache import Principal
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -162,7 +163,7 @@ def _user_to_response(u: User) -> UserResponseAdmin:
 
 @router.get("/users", response_model=PaginatedUsersResponse)
 async def list_users(
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     search: str | None = Query(default=None, description="Search by username, email, or role"),
     offset: int = Query(default=0, ge=0),
@@ -181,7 +182,7 @@ async def list_users(
 @router.get("/users/{user_id}", response_model=UserResponseAdmin)
 async def get_user(
     user_id: int,
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get a specific user by ID (sysadmin only)."""
@@ -197,7 +198,7 @@ async def get_user(
 @router.post("/users", response_model=UserResponseAdmin, status_code=status.HTTP_201_CREATED)
 async def create_user_admin(
     user_data: UserCreateAdmin,
-    current_user: Annotated[User, Depends(get_current_sysadmin_user)],
+    current_user: Annotated[Principal, Depends(get_current_sysadmin_user)],
     request: Request,
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -262,7 +263,7 @@ async def create_user_admin(
 async def update_user_admin(
     user_id: int,
     user_data: UserUpdateAdmin,
-    current_user: Annotated[User, Depends(get_current_sysadmin_user)],
+    current_user: Annotated[Principal, Depends(get_current_sysadmin_user)],
     request: Request,
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -340,7 +341,7 @@ async def update_user_admin(
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_admin(
     user_id: int,
-    current_user: Annotated[User, Depends(get_current_sysadmin_user)],
+    current_user: Annotated[Principal, Depends(get_current_sysadmin_user)],
     request: Request,
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -381,7 +382,7 @@ async def delete_user_admin(
 
 @router.get("/database/tables", response_model=list[TableInfo])
 async def list_tables(
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get list of all database tables with their columns (sysadmin only)."""
@@ -420,7 +421,7 @@ async def list_tables(
 @router.get("/database/tables/{table_name}")
 async def get_table_data(
     table_name: str,
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(default=100, le=1000),
     offset: int = Query(default=0, ge=0),
@@ -461,7 +462,7 @@ async def get_table_data(
 @router.post("/database/query", response_model=QueryResponse)
 async def execute_query(
     query_request: QueryRequest,
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Execute a raw SQL query (sysadmin only). Use with caution!"""
@@ -500,7 +501,7 @@ async def execute_query(
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get dashboard statistics (sysadmin only)."""
@@ -544,7 +545,7 @@ async def get_dashboard_stats(
 
 @router.get("/audit-logs", response_model=PaginatedAuditLogsResponse)
 async def list_audit_logs(
-    _: Annotated[User, Depends(get_current_sysadmin_user)],
+    _: Annotated[Principal, Depends(get_current_sysadmin_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
     action: str | None = Query(default=None, description="Filter by action type"),
     user_id: int | None = Query(default=None, description="Filter by user ID"),
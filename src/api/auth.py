@@ -12,12 +12,12 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
+from src.core.password_hasher import password_hasher
 from src.core.security import (
     create_access_token,
     create_refresh_token,
     decode_access_token,
     validate_password_strength,
-    verify_password,
 )
 from src.services.auth_models import User, UserRole
 from src.services.auth_service import (
@@ -36,6 +36,7 @@ from src.services.auth_service import (
 )
 from src.services.database import AsyncSessionLocal
 from src.services.models import Conversation, Message
+from src.services.principal_cache import Principal, get_principal
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -124,11 +125,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def get_current_user(
+async def get_current_principal(
     token: Annotated[str, Depends(oauth2_scheme)],
     session: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Get the current authenticated user from JWT token."""
+) -> Principal:
+    """Get the current authenticated principal from JWT token (no DB query in steady state)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -152,22 +153,37 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    user = await get_user_by_id(session, int(user_id))
-    if user is None:
+    principal = await get_principal(session, int(user_id))
+    if principal is None:
         raise credentials_exception
 
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
 
+    return principal
+
+
+async def get_current_user(
+    principal: Annotated[Principal, Depends(get_current_principal)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """Get the full User row of the current principal (for endpoints that need more than the principal)."""
+    user = await get_user_by_id(session, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 async def get_current_admin_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_principal)],
+) -> Principal:
     """Get the current user and verify they are an admin."""
     if not current_user.is_admin:
         raise HTTPException(
@@ -178,8 +194,8 @@ async def get_current_admin_user(
 
 
 async def get_current_sysadmin_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_principal)],
+) -> Principal:
     """Get the current user and verify they are a sysadmin."""
     if not current_user.is_sysadmin:
         raise HTTPException(
@@ -482,7 +498,7 @@ async def update_me(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="La password attuale è richiesta per cambiare password",
             )
-        if not verify_password(user_data.current_password, current_user.hashed_password):
+        if not await password_hasher.verify(user_data.current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password attuale non corretta",
@@ -569,7 +585,7 @@ async def delete_me(
         )
 
     # Verify password
-    if not verify_password(delete_data.password, current_user.hashed_password):
+    if not await password_hasher.verify(delete_data.password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password non corretta",
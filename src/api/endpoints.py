@@ -8,8 +8,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.auth import get_current_user
-from src.services.auth_models import User
+from src.api.auth import get_current_principal
 from src.services.database import (
     AsyncSessionLocal,
     add_message,
@@ -17,6 +16,7 @@ from src.services.database import (
     get_conversations,
     get_messages,
 )
+from src.services.principal_cache import Principal
 
 logging.basicConfig(
     level=logging.INFO,
@@ -85,7 +85,7 @@ db_dependency = Depends(get_db)
 
 @router.get("/conversations/", response_model=list[ConversationResponse])
 async def list_conversations(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     session: AsyncSession = db_dependency,
 ):
     """Get all conversations for the current user."""
@@ -95,7 +95,7 @@ async def list_conversations(
 @router.post("/conversations/", response_model=ConversationResponse)
 async def new_conversation(
     data: ConversationCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     session: AsyncSession = db_dependency,
 ):
     """Create a new conversation for the current user."""
@@ -107,7 +107,7 @@ async def new_conversation(
 )
 async def list_messages(
     conv_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     session: AsyncSession = db_dependency,
 ):
     """Get all messages for a conversation."""
@@ -120,7 +120,7 @@ async def list_messages(
 async def new_message(
     conv_id: int,
     data: MessageCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_principal)],
     session: AsyncSession = db_dependency,
 ):
     """Add a message to a conversation."""
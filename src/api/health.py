@@ -10,9 +10,19 @@ from fastapi import APIRouter, Response, status
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from src.core import context_manager
+from src.core.agent_graph import checkpointer_pool_stats
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.password_hasher import password_hasher
+from src.core.tool_executor import tool_executor
+from src.services import market_data
 from src.services.database import async_engine
+from src.services.embedding_cache import embedding_cache
+from src.services.knowledge import search_cache_stats
+from src.services.llm import get_http_client
+from src.services.principal_cache import principal_cache_stats
+from src.services.revocation_cache import revocation_cache
 
 logger = get_logger("health")
 
@@ -61,17 +71,18 @@ async def check_ollama() -> ComponentHealth:
     """Check Ollama LLM service."""
     start = asyncio.get_event_loop().time()
     try:
-        async with httpx.AsyncClient(timeout=settings.HEALTH_CHECK_TIMEOUT) as client:
-            response = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags")
-            latency = (asyncio.get_event_loop().time() - start) * 1000
-            if response.status_code == 200:
-                return ComponentHealth(status=HealthStatus.HEALTHY, latency_ms=round(latency, 2))
-            return ComponentHealth(
-                status=HealthStatus.DEGRADED,
-                latency_ms=round(latency, 2),
-                message=f"Status {response.status_code}",
-            )
-    except asyncio.TimeoutError:
+        response = await get_http_client().get(
+            f"{settings.OLLAMA_BASE_URL}/api/tags", timeout=settings.HEALTH_CHECK_TIMEOUT
+        )
+        latency = (asyncio.get_event_loop().time() - start) * 1000
+        if response.status_code == 200:
+            return ComponentHealth(status=HealthStatus.HEALTHY, latency_ms=round(latency, 2))
+        return ComponentHealth(
+            status=HealthStatus.DEGRADED,
+            latency_ms=round(latency, 2),
+            message=f"Status {response.status_code}",
+        )
+    except (asyncio.TimeoutError, httpx.TimeoutException):
         return ComponentHealth(status=HealthStatus.UNHEALTHY, message="Ollama timeout")
     except Exception as e:
         logger.warning("Ollama health check failed", extra={"error": str(e)})
@@ -177,3 +188,23 @@ async def startup_probe(response: Response):
         return {"status": "starting", "reason": "waiting for database"}
 
     return {"status": "started"}
+
+
+@router.get("/health/metrics")
+async def runtime_metrics():
+    """
+    Runtime metrics for capacity tuning.
+    Returns connection pool saturation and cache statistics.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "checkpoint_pool": checkpointer_pool_stats(),
+        "market_data_cache": market_data.cache_stats(),
+        "context_token_cache": context_manager.token_cache_stats(),
+        "tool_executor": tool_executor.stats(),
+        "password_hasher": password_hasher.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "search_cache": await search_cache_stats(),
+        "token_revocation_cache": revocation_cache.stats(),
+        "principal_cache": principal_cache_stats(),
+    }
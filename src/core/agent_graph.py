@@ -1,24 +1,34 @@
 # src/core/agent_graph.py
 """LangGraph agent for financial analysis."""
 
-from typing import Annotated, Sequence, TypedDict
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, NotRequired, Sequence, TypedDict
 
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, RemoveMessage, SystemMessage
 from langchain_ollama import ChatOllama
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 
+from src.core import context_manager
 from src.core.agent_tools import available_tools_list
 from src.core.config import settings
+from src.core.logging import get_logger
 from src.core.prompts import prompts
 
+logger = get_logger("agent_graph")
+
 
 class AgentState(TypedDict):
     """State for the agent graph."""
 
     messages: Annotated[Sequence[BaseMessage], add_messages]
+    summary: NotRequired[str]  # Rolling summary of turns removed from ``messages``
 
 
 # Tool node
@@ -36,11 +46,56 @@ llm = ChatOllama(
 
 llm_with_tools = llm.bind_tools(available_tools_list)
 
+# Token budget for the prompt: context window minus room for the answer and the tool schemas
+_TOOL_SCHEMA_TOKENS = context_manager.text_tokens(json.dumps(llm_with_tools.kwargs.get("tools", [])))
+CONTEXT_BUDGET = settings.LLM_NUM_CTX - settings.CONTEXT_RESPONSE_RESERVE - _TOOL_SCHEMA_TOKENS
+
+
+async def _summarize(summary: str, messages: list[BaseMessage]) -> str:
+    """Fold ``messages`` into the rolling summary, chunk by chunk so every call fits the context."""
+    chunk_budget = CONTEXT_BUDGET // 2
+    for chunk in context_manager.chunk_for_summary(messages, chunk_budget):
+        transcript = context_manager.render_transcript(chunk, settings.CONTEXT_TOOL_OUTPUT_MAX_TOKENS)
+        transcript = transcript[: chunk_budget * context_manager.CHARS_PER_TOKEN]
+        prompt = prompts.format("summary_prompt", summary=summary or "(vuoto)", conversation=transcript)
+        response = await llm.ainvoke([HumanMessage(content=prompt)], config={"tags": ["context_summary"]})
+        summary = response.content.strip()
+    return summary
+
+
+async def manage_context_node(state: AgentState) -> dict:
+    """Fold old turns into the rolling summary once the prompt approaches the budget."""
+    summary = state.get("summary", "")
+    to_fold = context_manager.select_messages_to_summarize(
+        state["messages"],
+        summary,
+        budget=CONTEXT_BUDGET,
+        keep_recent_turns=settings.CONTEXT_KEEP_RECENT_TURNS,
+        threshold=settings.CONTEXT_SUMMARY_THRESHOLD,
+        tool_output_max_tokens=settings.CONTEXT_TOOL_OUTPUT_MAX_TOKENS,
+    )
+    if not to_fold:
+        return {}
+    logger.info("Summarizing old messages", extra={"messages": len(to_fold)})
+    try:
+        new_summary = await _summarize(summary, to_fold)
+    except Exception as e:
+        # build_prompt still enforces the budget by dropping the oldest turns
+        logger.warning("Context summarization failed", extra={"error": str(e)})
+        return {}
+    return {"summary": new_summary, "messages": [RemoveMessage(id=m.id) for m in to_fold]}
+
 
 async def call_model_node(state: AgentState) -> dict:
     """Call the LLM node."""
     print("--- GRAPH: Calling LLM ---")
-    messages = state["messages"]
+    messages = context_manager.build_prompt(
+        state["messages"],
+        state.get("summary", ""),
+        prompts.summary_context_prompt,
+        budget=CONTEXT_BUDGET,
+        tool_output_max_tokens=settings.CONTEXT_TOOL_OUTPUT_MAX_TOKENS,
+    )
     response = await llm_with_tools.ainvoke(messages)
     return {"messages": [response]}
 
@@ -55,38 +110,100 @@ def should_continue_edge(state: AgentState) -> str:
 
 # Build the graph
 workflow = StateGraph(AgentState)
+workflow.add_node("context", manage_context_node)
 workflow.add_node("agent", call_model_node)
 workflow.add_node("action", tool_node)
-workflow.set_entry_point("agent")
+workflow.set_entry_point("context")
+workflow.add_edge("context", "agent")
 workflow.add_conditional_edges(
     "agent",
     should_continue_edge,
     {"continue_to_tools": "action", "end_conversation": END},
 )
-workflow.add_edge("action", "agent")
+workflow.add_edge("action", "context")
 
 # Compile without checkpointer first (will be added dynamically)
 app = workflow.compile()
 
-# Async checkpointer for PostgreSQL
-_checkpointer = None
-_checkpointer_cm = None
+# Async checkpointer for PostgreSQL, backed by a connection pool
+_checkpointer: AsyncPostgresSaver | None = None
+_checkpointer_pool: AsyncConnectionPool | None = None
+_checkpointer_lock = asyncio.Lock()
+
+
+async def open_checkpointer() -> AsyncPostgresSaver:
+    """Open the checkpointer connection pool and create the checkpoint tables (idempotent)."""
+    global _checkpointer, _checkpointer_pool
+    async with _checkpointer_lock:
+        if _checkpointer is None:
+            pool = AsyncConnectionPool(
+                settings.CHECKPOINT_PG_DSN,
+                min_size=settings.DB_POOL_SIZE,
+                max_size=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+                timeout=settings.CHECKPOINT_POOL_TIMEOUT,
+                max_idle=settings.CHECKPOINT_POOL_MAX_IDLE,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                name="checkpointer",
+                open=False,
+            )
+            await pool.open(wait=True, timeout=settings.CHECKPOINT_POOL_TIMEOUT)
+            checkpointer = AsyncPostgresSaver(conn=pool)
+            try:
+                await checkpointer.setup()
+            except Exception:
+                await pool.close()
+                raise
+            _checkpointer_pool, _checkpointer = pool, checkpointer
+            logger.info(
+                "Checkpointer pool opened",
+                extra={"min_size": pool.min_size, "max_size": pool.max_size},
+            )
+    return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    """Close the checkpointer connection pool (waits for in-flight checkpoint writes)."""
+    global _checkpointer, _checkpointer_pool
+    async with _checkpointer_lock:
+        if _checkpointer_pool is not None:
+            await _checkpointer_pool.close(timeout=settings.CHECKPOINT_POOL_TIMEOUT)
+            logger.info("Checkpointer pool closed")
+        _checkpointer, _checkpointer_pool = None, None
 
 
 async def get_checkpointer() -> AsyncPostgresSaver:
-    """Get or create the async Postgres checkpointer."""
-    global _checkpointer, _checkpointer_cm
+    """Get the async Postgres checkpointer (opened lazily if the lifespan did not)."""
     if _checkpointer is None:
-        _checkpointer_cm = AsyncPostgresSaver.from_conn_string(settings.CHECKPOINT_PG_DSN)
-        _checkpointer = await _checkpointer_cm.__aenter__()
-        await _checkpointer.setup()
+        return await open_checkpointer()
     return _checkpointer
 
 
+def checkpointer_pool_stats() -> dict[str, Any]:
+    """Saturation metrics of the checkpointer pool (empty if not open)."""
+    if _checkpointer_pool is None:
+        return {}
+    stats = _checkpointer_pool.get_stats()
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    return {
+        **stats,
+        "in_use": in_use,
+        "saturation": round(in_use / _checkpointer_pool.max_size, 3),
+    }
+
+
+# Compiled checkpointed graph, reused across requests (recompiled only if the checkpointer changes)
+_compiled_graph = None
+_compiled_graph_checkpointer = None
+
+
 async def get_compiled_graph():
-    """Get the compiled graph with checkpointer."""
+    """Get the compiled graph with checkpointer (compiled once per checkpointer)."""
+    global _compiled_graph, _compiled_graph_checkpointer
     checkpointer = await get_checkpointer()
-    return workflow.compile(checkpointer=checkpointer)
+    if _compiled_graph is None or _compiled_graph_checkpointer is not checkpointer:
+        _compiled_graph = workflow.compile(checkpointer=checkpointer)
+        _compiled_graph_checkpointer = checkpointer
+    return _compiled_graph
 
 
 def format_history_to_langchain(messages: list[dict]) -> list[BaseMessage]:
@@ -102,19 +219,85 @@ def format_history_to_langchain(messages: list[dict]) -> list[BaseMessage]:
     return history
 
 
-async def get_agent_graph_response(
+def find_redundant_messages(messages: Sequence[BaseMessage]) -> list[str]:
+    """Return ids of messages duplicated by full-history replays in a checkpointed thread.
+
+    Before checkpoint-aware assembly every turn appended [system, *db_history, human]
+    to the checkpoint. The first SystemMessage is kept; every later one is redundant,
+    together with the replayed dialog that follows it (the user messages and final
+    assistant answers already present earlier in the thread).
+    """
+    redundant: list[str] = []
+    dialog: list[tuple[str, Any]] = []  # (type, content) of kept user/final-assistant messages
+    seen_system = False
+    replay_pos: int | None = None  # position in ``dialog`` while skipping a replay
+
+    for msg in messages:
+        if isinstance(msg, SystemMessage):
+            if seen_system:
+                redundant.append(msg.id)
+                replay_pos = 0
+            seen_system = True
+            continue
+
+        key = (msg.type, msg.content)
+        if replay_pos is not None:
+            if replay_pos < len(dialog) and dialog[replay_pos] == key and not getattr(msg, "tool_calls", None):
+                redundant.append(msg.id)
+                replay_pos += 1
+                continue
+            replay_pos = None
+
+        if isinstance(msg, HumanMessage) or (isinstance(msg, AIMessage) and not msg.tool_calls):
+            dialog.append(key)
+
+    return redundant
+
+
+async def compact_thread(thread_id: str, graph: Any = None) -> int:
+    """Remove replayed history from a checkpointed thread. Returns the number of messages removed."""
+    graph = graph or await get_compiled_graph()
+    config = {"configurable": {"thread_id": thread_id}}
+    snapshot = await graph.aget_state(config)
+    redundant = find_redundant_messages(snapshot.values.get("messages", []))
+    if redundant:
+        await graph.aupdate_state(
+            config,
+            {"messages": [RemoveMessage(id=msg_id) for msg_id in redundant]},
+            as_node="agent",
+        )
+        logger.info("Thread compacted", extra={"thread_id": thread_id, "removed": len(redundant)})
+    return len(redundant)
+
+
+async def _prepare_invocation(
     user_query: str,
     chat_history: list[dict],
-    thread_id: str | None = None,
-) -> AIMessage:
-    """Invoke the agent graph and return the response.
+    thread_id: str | None,
+) -> tuple[Any, dict, dict | None]:
+    """Build (graph, input, config) for a graph invocation.
 
-    Args:
-        user_query: The user's question
-        chat_history: Previous messages in the conversation
-        thread_id: Optional thread ID for checkpointing. If provided,
-                   the graph will use PostgreSQL checkpointing to save state.
+    Checkpointed threads that already hold messages only receive the new
+    HumanMessage: prior turns (and the system prompt) come from the checkpoint.
     """
+    new_message = HumanMessage(content=user_query)
+
+    # Use checkpointed graph if thread_id is provided
+    if thread_id:
+        graph = await get_compiled_graph()
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = await graph.aget_state(config)
+        stored = snapshot.values.get("messages", [])
+        if stored:
+            # Threads bloated by the old full-history replay are compacted lazily
+            if sum(isinstance(m, SystemMessage) for m in stored) > 1:
+                await compact_thread(thread_id, graph)
+            logger.debug(
+                "Checkpointed thread, sending new message only",
+                extra={"thread_id": thread_id, "stored_messages": len(stored)},
+            )
+            return graph, {"messages": [new_message]}, config
+
     formatted_history = format_history_to_langchain(chat_history)
 
     # Log per debug
@@ -128,16 +311,63 @@ async def get_agent_graph_response(
     messages = [
         SystemMessage(content=prompts.system_prompt),
         *formatted_history,
-        HumanMessage(content=user_query),
+        new_message,
     ]
 
-    # Use checkpointed graph if thread_id is provided
     if thread_id:
-        graph = await get_compiled_graph()
-        config = {"configurable": {"thread_id": thread_id}}
-        final_state = await graph.ainvoke({"messages": messages}, config=config)
-    else:
-        # Use non-checkpointed graph for simple invocations
-        final_state = await app.ainvoke({"messages": messages})
+        # First turn of a checkpointed thread: seed it with the stored history
+        return graph, {"messages": messages}, config
+
+    # Use non-checkpointed graph for simple invocations
+    return app, {"messages": messages}, None
+
+
+async def get_agent_graph_response(
+    user_query: str,
+    chat_history: list[dict],
+    thread_id: str | None = None,
+) -> AIMessage:
+    """Invoke the agent graph and return the response.
 
+    Args:
+        user_query: The user's question
+        chat_history: Previous messages in the conversation
+        thread_id: Optional thread ID for checkpointing. If provided,
+                   the graph will use PostgreSQL checkpointing to save state.
+    """
+    graph, graph_input, config = await _prepare_invocation(user_query, chat_history, thread_id)
+    final_state = await graph.ainvoke(graph_input, config=config)
     return final_state["messages"][-1]
+
+
+async def stream_agent_graph_response(
+    user_query: str,
+    chat_history: list[dict],
+    thread_id: str | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream the agent graph execution as UI-friendly events.
+
+    Yields dicts with a ``type`` key:
+        - ``token``: LLM output chunk (``content``)
+        - ``tool_start`` / ``tool_end``: tool activity (``name``)
+        - ``final``: the final AIMessage (``message``), emitted once at the end
+    """
+    graph, graph_input, config = await _prepare_invocation(user_query, chat_history, thread_id)
+
+    final_state = None
+    async for event in graph.astream_events(graph_input, config=config, version="v2"):
+        kind = event["event"]
+        if kind == "on_chat_model_stream" and "context_summary" not in event.get("tags", []):
+            content = event["data"]["chunk"].content
+            if isinstance(content, str) and content:
+                yield {"type": "token", "content": content}
+        elif kind == "on_tool_start":
+            yield {"type": "tool_start", "name": event["name"], "input": event["data"].get("input")}
+        elif kind == "on_tool_end":
+            yield {"type": "tool_end", "name": event["name"]}
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            final_state = event["data"].get("output")
+
+    if not final_state or not final_state.get("messages"):
+        raise RuntimeError("Agent graph finished without a final message")
+    yield {"type": "final", "message": final_state["messages"][-1]}
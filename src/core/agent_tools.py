@@ -1,12 +1,11 @@
 # src/core/agent_tools.py
 """LangChain tools for the financial agent."""
 
-import asyncio
 import json
-import uuid
 
 from langchain.tools import tool
 
+from src.core.config import settings
 from src.core.logging import get_logger
 from src.core.schemas import (
     CompanyProfileSchema,
@@ -19,10 +18,14 @@ from src.core.schemas import (
     StockNewsSchema,
     StockPriceSchema,
     TechnicalIndicatorsSchema,
+    UniverseScoringSchema,
     WebSearchSchema,
 )
+from src.core.tool_executor import tool_executor
+from src.services.embedding_cache import point_id_for
 from src.services.financial import (
     analyze_stock_sync,
+    analyze_universe,
     company_profile_sync,
     compare_stocks_sync,
     dividend_analysis_sync,
@@ -33,7 +36,7 @@ from src.services.financial import (
 )
 from src.services.knowledge import google_search
 from src.services.llm import OllamaService
-from src.services.vector_store import VectorStoreService
+from src.services.vector_store import get_vector_store
 
 logger = get_logger("tools")
 
@@ -47,8 +50,8 @@ async def web_search_tool(query: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "web_search_tool", "query": query})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, google_search, query, 1)
+        async with tool_executor.track("web_search_tool"):
+            result = await google_search(query, 1)
         logger.debug("Tool completed", extra={"tool_name": "web_search_tool"})
         return result
     except Exception as e:
@@ -57,30 +60,43 @@ async def web_search_tool(query: str) -> str:
 
 
 @tool("read_from_kb_tool", args_schema=KBReadSchema)
-async def read_from_kb_tool(query: str) -> str:
+async def read_from_kb_tool(query: str, top_k: int = settings.KB_TOP_K, topic: str | None = None) -> str:
     """
     Read information from the internal knowledge base.
     Use this for conceptual, procedural, or stable information.
+    Returns JSON with the top-k relevant passages and their cosine similarity scores
+    (rrf_score is the hybrid ranking score, not a similarity).
     """
-    logger.info("Tool invoked", extra={"tool_name": "read_from_kb_tool", "query": query})
+    logger.info("Tool invoked", extra={"tool_name": "read_from_kb_tool", "query": query, "top_k": top_k})
     try:
         ollama = OllamaService()
-        vector_store = VectorStoreService()
-
-        embedding = await ollama.create_embedding(query)
-        if not embedding:
-            return "Error: Could not create embedding."
-
-        context = await vector_store.search(embedding, limit=1)
-        logger.debug("Tool completed", extra={"tool_name": "read_from_kb_tool"})
-        return context
+        vector_store = get_vector_store()
+
+        async with tool_executor.track("read_from_kb_tool"):
+            embedding = await ollama.create_embedding(query)
+            if not embedding:
+                return "Error: Could not create embedding."
+
+            hits = await vector_store.query(
+                embedding,
+                top_k=top_k,
+                query_text=query,
+                score_threshold=settings.KB_SCORE_THRESHOLD,
+                mmr=settings.KB_MMR_ENABLED,
+                mmr_lambda=settings.KB_MMR_LAMBDA,
+                topic=topic,
+            )
+        logger.debug("Tool completed", extra={"tool_name": "read_from_kb_tool", "hits": len(hits)})
+        if not hits:
+            return "No relevant context found."
+        return json.dumps({"query": query, "results": hits}, ensure_ascii=False, default=str)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "read_from_kb_tool", "error": str(e)})
         return f"KB read error: {str(e)}"
 
 
 @tool("write_to_kb_tool", args_schema=KBWriteSchema)
-async def write_to_kb_tool(content: str) -> str:
+async def write_to_kb_tool(content: str, topic: str | None = None) -> str:
     """
     Save information to the internal knowledge base.
     Use for reusable definitions, guidelines, or stable information.
@@ -89,18 +105,28 @@ async def write_to_kb_tool(content: str) -> str:
     logger.info("Tool invoked", extra={"tool_name": "write_to_kb_tool", "content_length": len(content)})
     try:
         ollama = OllamaService()
-        vector_store = VectorStoreService()
-
-        embedding = await ollama.create_embedding(content)
-        if not embedding:
-            return "Error: Could not create embedding."
-
-        point_id = uuid.uuid4().int & ((1 << 63) - 1)
-        await vector_store.add_context(
-            question_id=point_id, embedding=embedding, text=content
+        vector_store = get_vector_store()
+
+        async with tool_executor.track("write_to_kb_tool"):
+            embedding = await ollama.create_embedding(content)
+            if not embedding:
+                return "Error: Could not create embedding."
+
+            point_id, action = await vector_store.write_deduplicated(
+                point_id_for(content),
+                embedding,
+                content,
+                similarity_threshold=settings.KB_DEDUP_THRESHOLD,
+                topic=topic,
+            )
+        logger.debug(
+            "Tool completed", extra={"tool_name": "write_to_kb_tool", "point_id": point_id, "action": action}
         )
-        logger.debug("Tool completed", extra={"tool_name": "write_to_kb_tool", "point_id": point_id})
-        return f"Information saved to KB (ID: {point_id})."
+        if action == "created":
+            return f"Information saved to KB (ID: {point_id})."
+        if action == "replaced":
+            return f"Similar KB entry updated with the new content (ID: {point_id})."
+        return f"Information already in KB, entry refreshed (ID: {point_id})."
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "write_to_kb_tool", "error": str(e)})
         return f"KB write error: {str(e)}"
@@ -115,8 +141,7 @@ async def stock_scoring_tool(ticker: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "stock_scoring_tool", "ticker": ticker})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, analyze_stock_sync, ticker)
+        result = await tool_executor.run("stock_scoring_tool", analyze_stock_sync, ticker)
         logger.debug("Tool completed", extra={"tool_name": "stock_scoring_tool", "ticker": ticker})
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
@@ -136,8 +161,7 @@ async def stock_price_tool(ticker: str, period: str = "1mo") -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "stock_price_tool", "ticker": ticker, "period": period})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, get_stock_price_sync, ticker, period)
+        result = await tool_executor.run("stock_price_tool", get_stock_price_sync, ticker, period)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "stock_price_tool", "error": str(e)})
@@ -147,20 +171,35 @@ async def stock_price_tool(ticker: str, period: str = "1mo") -> str:
 @tool("compare_stocks_tool", args_schema=CompareStocksSchema)
 async def compare_stocks_tool(tickers: list[str]) -> str:
     """
-    Compare 2-5 stocks side by side.
-    Returns comparison of P/E, ROE, Market Cap, Dividend Yield, Beta.
-    Also provides rankings: lowest P/E, highest ROE, largest market cap.
+    Compare 2-50 stocks side by side.
+    Returns comparison of P/E, ROE, Market Cap, Dividend Yield, Beta, 1y performance.
+    Also provides rankings: lowest P/E, highest ROE, largest market cap, best 1y performance.
     """
     logger.info("Tool invoked", extra={"tool_name": "compare_stocks_tool", "tickers": tickers})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, compare_stocks_sync, tickers)
+        result = await tool_executor.run("compare_stocks_tool", compare_stocks_sync, tickers)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "compare_stocks_tool", "error": str(e)})
         return json.dumps({"tickers": tickers, "error": str(e)}, ensure_ascii=False)
 
 
+@tool("universe_scoring_tool", args_schema=UniverseScoringSchema)
+async def universe_scoring_tool(tickers: list[str], sort_by: str = "total_score", top_n: int = 10) -> str:
+    """
+    Score and rank a list of stocks (BUY/HOLD/SELL) in one call, up to 500 tickers.
+    Uses the same fundamental scoring as stock_scoring_tool.
+    Use sort_by to rank by a single metric (e.g., "dividend" for best dividend stocks).
+    """
+    logger.info("Tool invoked", extra={"tool_name": "universe_scoring_tool", "tickers": len(tickers)})
+    try:
+        result = await tool_executor.run("universe_scoring_tool", analyze_universe, tickers, sort_by, top_n)
+        return json.dumps(result, ensure_ascii=False)
+    except Exception as e:
+        logger.error("Tool failed", extra={"tool_name": "universe_scoring_tool", "error": str(e)})
+        return json.dumps({"tickers": tickers, "error": str(e)}, ensure_ascii=False)
+
+
 @tool("dividend_analysis_tool", args_schema=DividendAnalysisSchema)
 async def dividend_analysis_tool(ticker: str) -> str:
     """
@@ -170,8 +209,7 @@ async def dividend_analysis_tool(ticker: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "dividend_analysis_tool", "ticker": ticker})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, dividend_analysis_sync, ticker)
+        result = await tool_executor.run("dividend_analysis_tool", dividend_analysis_sync, ticker)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "dividend_analysis_tool", "error": str(e)})
@@ -186,8 +224,7 @@ async def company_profile_tool(ticker: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "company_profile_tool", "ticker": ticker})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, company_profile_sync, ticker)
+        result = await tool_executor.run("company_profile_tool", company_profile_sync, ticker)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "company_profile_tool", "error": str(e)})
@@ -203,8 +240,7 @@ async def stock_news_tool(ticker: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "stock_news_tool", "ticker": ticker})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, stock_news_sync, ticker)
+        result = await tool_executor.run("stock_news_tool", stock_news_sync, ticker)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "stock_news_tool", "error": str(e)})
@@ -220,8 +256,7 @@ async def technical_indicators_tool(ticker: str, period: str = "3mo") -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "technical_indicators_tool", "ticker": ticker, "period": period})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, technical_indicators_sync, ticker, period)
+        result = await tool_executor.run("technical_indicators_tool", technical_indicators_sync, ticker, period)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "technical_indicators_tool", "error": str(e)})
@@ -237,8 +272,7 @@ async def earnings_calendar_tool(ticker: str) -> str:
     """
     logger.info("Tool invoked", extra={"tool_name": "earnings_calendar_tool", "ticker": ticker})
     try:
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, earnings_calendar_sync, ticker)
+        result = await tool_executor.run("earnings_calendar_tool", earnings_calendar_sync, ticker)
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
         logger.error("Tool failed", extra={"tool_name": "earnings_calendar_tool", "error": str(e)})
@@ -252,6 +286,7 @@ available_tools_list = [
     stock_scoring_tool,
     stock_price_tool,
     compare_stocks_tool,
+    universe_scoring_tool,
     dividend_analysis_tool,
     company_profile_tool,
     stock_news_tool,
@@ -28,6 +28,17 @@ class Settings(BaseSettings):
     MAX_LOGIN_ATTEMPTS: int = 5
     LOCKOUT_DURATION_MINUTES: int = 15
     PASSWORD_MIN_LENGTH: int = 8
+    BCRYPT_ROUNDS: int = 12  # Cambiandolo, gli hash esistenti vengono aggiornati al login successivo
+    PASSWORD_HASHER_MAX_WORKERS: int = 4  # Thread dedicati a bcrypt (rilascia il GIL)
+    PASSWORD_HASHER_MAX_QUEUE: int = 32  # Oltre questa coda le richieste ricevono 503
+    # Cache revoche token (Bloom filter per processo, sincronizzato da token_blacklist)
+    REVOCATION_SYNC_INTERVAL: float = 5.0  # Secondi: ritardo massimo per revoche fatte da altri processi
+    REVOCATION_PURGE_INTERVAL: int = 3600  # Pulizia righe scadute e ricostruzione del filtro
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Cache utente autenticato (ruolo, stato attivo, email verificata) per get_current_user
+    PRINCIPAL_CACHE_TTL: float = 5.0  # Secondi; 0 disabilita la cache
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
     STORAGE_SECRET: str
 
     # Email verification (Resend API)
@@ -41,6 +52,9 @@ class Settings(BaseSettings):
     CHECKPOINT_PG_DSN: str = ""
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
+    # Checkpointer pool: min = DB_POOL_SIZE, max = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    CHECKPOINT_POOL_TIMEOUT: float = 30.0  # Max seconds to wait for a free connection
+    CHECKPOINT_POOL_MAX_IDLE: float = 600.0  # Idle connections above min size are closed after this
 
     # Ollama LLM
     OLLAMA_BASE_URL: str
@@ -50,16 +64,90 @@ class Settings(BaseSettings):
     LLM_SEED: int = 42
     LLM_NUM_CTX: int = 16384  # Context window per la memoria conversazione
     LLM_TIMEOUT: int = 120  # Timeout in seconds
+    OLLAMA_CONNECT_TIMEOUT: float = 5.0
+    OLLAMA_MAX_CONNECTIONS: int = 20  # Pooled HTTP client (keep-alive)
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    OLLAMA_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Context window management (token budget = LLM_NUM_CTX - CONTEXT_RESPONSE_RESERVE)
+    CONTEXT_RESPONSE_RESERVE: int = 2048  # Tokens lasciati per la risposta
+    CONTEXT_KEEP_RECENT_TURNS: int = 4  # Turni recenti mantenuti alla lettera
+    CONTEXT_SUMMARY_THRESHOLD: float = 0.75  # Riassume i turni vecchi oltre questa quota del budget
+    CONTEXT_TOOL_OUTPUT_MAX_TOKENS: int = 1500  # Output dei tool nei turni passati troncati a questa soglia
 
     # Qdrant Vector Store
     QDRANT_HOST: str
     QDRANT_PORT: int = 6333
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = True  # gRPC per search/upsert se disponibile
     EMBEDDING_MODEL_NAME: str = "nomic-embed-text"
     QDRANT_TIMEOUT: int = 30
+    KB_TOP_K: int = 3  # Risultati restituiti da read_from_kb_tool
+    KB_SCORE_THRESHOLD: float = 0.5  # Similarità coseno minima
+    KB_MMR_ENABLED: bool = True
+    KB_MMR_LAMBDA: float = 0.7  # 1 = solo rilevanza, 0 = solo diversità
+    KB_MMR_FETCH_MULTIPLIER: int = 4  # Candidati = top_k * moltiplicatore
+    KB_DEDUP_THRESHOLD: float = 0.95  # Similarità coseno oltre cui una scrittura è un duplicato
+    KB_HYBRID_ENABLED: bool = True  # Vettori sparsi BM25 + fusione RRF con i vettori densi
+    KB_HYBRID_PREFETCH_MULTIPLIER: int = 4  # Candidati per ramo = top_k * moltiplicatore
+    # Profilo della collection (default, balanced, high_recall, low_memory): applicato alla creazione
+    KB_COLLECTION_PROFILE: str = "default"
+    KB_HNSW_EF: int | None = None  # Override di hnsw_ef in ricerca (None = valore del profilo)
+
+    # Bulk KB ingestion (python -m src.services.ingestion)
+    INGEST_CHUNK_SIZE: int = 1200  # Caratteri per chunk
+    INGEST_CHUNK_OVERLAP: int = 200
+    INGEST_BATCH_SIZE: int = 64  # Chunk per batch di embedding/upsert
+    INGEST_UPSERT_CONCURRENCY: int = 4
+    INGEST_PROGRESS_FILE: str = "data/ingestion_progress.json"
+
+    # Embedding cache: LRU in-process + optional Postgres tier (table embedding_cache)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_PERSISTENT: bool = False
+    EMBEDDING_BATCH_SIZE: int = 64  # Max testi per chiamata /api/embed
+    EMBEDDING_BATCH_MAX_TOKENS: int = 16384  # Budget token stimato per batch
+
+    # Tool execution engine (dedicated pool + per-tool concurrency limits)
+    TOOL_EXECUTOR_MAX_WORKERS: int = 16
+    TOOL_CONCURRENCY_DEFAULT: int = 8
+    TOOL_CONCURRENCY_LIMITS: dict[str, int] = {
+        "web_search_tool": 2,
+        "compare_stocks_tool": 2,
+        "universe_scoring_tool": 1,
+    }
+
+    # Market data cache (yfinance) — TTL in seconds per dataset
+    MARKET_CACHE_MAX_ENTRIES: int = 2048
+    MARKET_CACHE_TTL_INFO: int = 300
+    MARKET_CACHE_TTL_HISTORY: int = 60
+    MARKET_CACHE_TTL_DIVIDENDS: int = 21600
+    MARKET_CACHE_TTL_NEWS: int = 300
+    MARKET_CACHE_TTL_CALENDAR: int = 21600
+    MARKET_CACHE_TTL_EARNINGS: int = 21600
+    MARKET_DATA_MAX_WORKERS: int = 8  # Bounded pool for multi-ticker fetches
+
+    # Local OHLCV history store (SQLite, delta refresh)
+    OHLCV_STORE_ENABLED: bool = True
+    OHLCV_STORE_PATH: str = "data/ohlcv.sqlite3"  # Deve essere scrivibile, altrimenti lo storico va diretto a yfinance
+    OHLCV_REFRESH_INTERVAL: int = 60  # Min seconds between upstream tail refreshes
 
     # API Keys
     SERPAPI_API_KEY: str
 
+    # Web search (SerpAPI) — persistent result cache, TTL in seconds
+    SERPAPI_BASE_URL: str = "https://serpapi.com"  # Sostituibile con un server locale nei test
+    SERPAPI_TIMEOUT: float = 10.0  # Timeout per richiesta (secondi)
+    SERPAPI_MAX_RETRIES: int = 2  # Retry su timeout/errori di rete/429/5xx
+    SERPAPI_BACKOFF_BASE: float = 0.5  # Backoff esponenziale con jitter: [0, base * 2^tentativo]
+    SERPAPI_BACKOFF_MAX: float = 4.0
+    SERPAPI_MAX_CONNECTIONS: int = 10
+    SERPAPI_GL: str = "it"
+    SERPAPI_HL: str = "it"
+    SERPAPI_CACHE_ENABLED: bool = True
+    SERPAPI_CACHE_PATH: str = "data/search_cache.sqlite3"  # Deve essere scrivibile, altrimenti ricerca senza cache
+    SERPAPI_CACHE_TTL_NEWS: int = 900  # Query su notizie/prezzi/eventi recenti
+    SERPAPI_CACHE_TTL_EVERGREEN: int = 604800  # Definizioni e concetti (7 giorni)
+
     # Kubernetes / Health checks
     HEALTH_CHECK_TIMEOUT: int = 5
 
@@ -0,0 +1,209 @@
+# src/core/context_manager.py
+"""Token-budgeted context window management for the agent graph."""
+
+from collections.abc import Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.core.cache import TTLCache
+from src.core.logging import get_logger
+
+logger = get_logger("context_manager")
+
+CHARS_PER_TOKEN = 4  # Conservative estimate for mixed Italian/English text and JSON
+MESSAGE_OVERHEAD_TOKENS = 4  # Role markers / separators added by the chat template
+MIN_TRUNCATED_TOKENS = 64
+
+# Token counts per message id (messages are immutable once stored in the checkpoint)
+_token_cache = TTLCache(max_entries=20000)
+
+
+def text_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        content += "".join(f"{call['name']}{call['args']}" for call in tool_calls)
+    return content
+
+
+def count_tokens(message: BaseMessage) -> int:
+    """Estimate the tokens of a message (cached per message id)."""
+    if message.id is None:
+        return text_tokens(_message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+    tokens = _token_cache.get(message.id)
+    if tokens is None:
+        tokens = text_tokens(_message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+        _token_cache.set(message.id, tokens)
+    return tokens
+
+
+def count_messages_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Estimate the tokens of a list of messages."""
+    return sum(count_tokens(m) for m in messages)
+
+
+def token_cache_stats() -> dict:
+    """Statistics of the per-message token count cache."""
+    return _token_cache.stats()
+
+
+def truncate_message(message: BaseMessage, max_tokens: int) -> BaseMessage:
+    """Return a copy of ``message`` whose text content fits ``max_tokens`` (same message if it already fits)."""
+    if not isinstance(message.content, str) or text_tokens(message.content) <= max_tokens:
+        return message
+    keep = max(max_tokens, 1) * CHARS_PER_TOKEN
+    omitted = text_tokens(message.content[keep:])
+    content = f"{message.content[:keep]}\n…[troncato: ~{omitted} token omessi]"
+    # A different id keeps the token cache consistent with the truncated content
+    new_id = f"{message.id}:trunc{max_tokens}" if message.id else None
+    return message.model_copy(update={"content": content, "id": new_id})
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> tuple[list[BaseMessage], list[list[BaseMessage]]]:
+    """Split messages into (leading system messages, turns); each turn starts at a HumanMessage."""
+    index = 0
+    while index < len(messages) and isinstance(messages[index], SystemMessage):
+        index += 1
+    system, turns = list(messages[:index]), []
+    for message in messages[index:]:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return system, turns
+
+
+def _compress_tool_outputs(turn: list[BaseMessage], max_tokens: int) -> list[BaseMessage]:
+    return [truncate_message(m, max_tokens) if isinstance(m, ToolMessage) else m for m in turn]
+
+
+def summary_message(summary: str, template: str) -> SystemMessage:
+    """System message carrying the rolling summary of older turns."""
+    return SystemMessage(content=template.format(summary=summary))
+
+
+def select_messages_to_summarize(
+    messages: Sequence[BaseMessage],
+    summary: str,
+    budget: int,
+    keep_recent_turns: int,
+    threshold: float,
+    tool_output_max_tokens: int,
+    overhead: int = 0,
+) -> list[BaseMessage]:
+    """
+    Return the older messages to fold into the rolling summary.
+
+    Nothing is folded until the prompt exceeds ``threshold`` of the budget; then
+    every turn except the last ``keep_recent_turns`` (the current one included)
+    is folded at once, so summarization runs in batches rather than every turn.
+    """
+    system, turns = split_turns(messages)
+    if len(turns) <= keep_recent_turns:
+        return []
+
+    used = overhead + count_messages_tokens(system) + text_tokens(summary)
+    used += sum(count_messages_tokens(_compress_tool_outputs(t, tool_output_max_tokens)) for t in turns[:-1])
+    used += count_messages_tokens(turns[-1])
+    if used <= budget * threshold:
+        return []
+    return [m for turn in turns[: len(turns) - max(keep_recent_turns, 1)] for m in turn]
+
+
+def build_prompt(
+    messages: Sequence[BaseMessage],
+    summary: str,
+    summary_template: str,
+    budget: int,
+    tool_output_max_tokens: int,
+    overhead: int = 0,
+) -> list[BaseMessage]:
+    """
+    Assemble the prompt for the LLM within ``budget`` tokens.
+
+    Tool outputs of past turns are truncated, then the oldest turns are dropped,
+    then tool outputs of the current turn are shrunk, and finally the summary and
+    the current user message are truncated. The current turn is never dropped.
+    """
+    system, turns = split_turns(messages)
+    if not turns:
+        return list(system)
+    head = list(system)
+    if summary:
+        head.append(summary_message(summary, summary_template))
+
+    history = [_compress_tool_outputs(t, tool_output_max_tokens) for t in turns[:-1]]
+    current = list(turns[-1])
+
+    def total() -> int:
+        return (
+            overhead
+            + count_messages_tokens(head)
+            + sum(count_messages_tokens(t) for t in history)
+            + count_messages_tokens(current)
+        )
+
+    dropped = 0
+    while history and total() > budget:
+        history.pop(0)
+        dropped += 1
+
+    # Shrink the largest tool output of the current turn until the prompt fits
+    limit = tool_output_max_tokens
+    while total() > budget and limit > MIN_TRUNCATED_TOKENS:
+        current = _compress_tool_outputs(current, limit)
+        limit //= 2
+
+    if total() > budget and summary:
+        excess = total() - budget
+        head[-1] = truncate_message(head[-1], max(count_tokens(head[-1]) - excess, MIN_TRUNCATED_TOKENS))
+
+    if total() > budget and isinstance(current[0], HumanMessage):
+        excess = total() - budget
+        current[0] = truncate_message(current[0], max(count_tokens(current[0]) - excess, MIN_TRUNCATED_TOKENS))
+
+    prompt_tokens = total()
+    if dropped or prompt_tokens > budget:
+        logger.warning(
+            "Context window trimmed",
+            extra={"dropped_turns": dropped, "prompt_tokens": prompt_tokens, "budget": budget},
+        )
+    return [*head, *(m for t in history for m in t), *current]
+
+
+def render_transcript(messages: Sequence[BaseMessage], tool_output_max_tokens: int) -> str:
+    """Plain-text transcript of messages for the summarizer."""
+    lines = []
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            message = truncate_message(message, tool_output_max_tokens)
+            lines.append(f"[strumento {message.name or ''}]: {message.content}")
+        elif isinstance(message, HumanMessage):
+            lines.append(f"[utente]: {message.content}")
+        elif getattr(message, "tool_calls", None):
+            calls = ", ".join(f"{c['name']}({c['args']})" for c in message.tool_calls)
+            lines.append(f"[assistente → strumenti]: {calls}")
+        elif not isinstance(message, SystemMessage):
+            lines.append(f"[assistente]: {message.content}")
+    return "\n".join(lines)
+
+
+def chunk_for_summary(messages: Sequence[BaseMessage], max_tokens: int) -> list[list[BaseMessage]]:
+    """Group whole turns into chunks of at most ~``max_tokens`` for incremental summarization."""
+    _, turns = split_turns(messages)
+    chunks: list[list[BaseMessage]] = []
+    size = 0
+    for turn in turns:
+        tokens = count_messages_tokens(turn)
+        if chunks and size + tokens <= max_tokens:
+            chunks[-1].extend(turn)
+            size += tokens
+        else:
+            chunks.append(list(turn))
+            size = tokens
+    return chunks
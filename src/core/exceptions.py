@@ -112,3 +112,15 @@ class ExternalServiceError(AppError):
             status_code=502,
             details={"service": service, **(details or {})},
         )
+
+
+class ServiceOverloadedError(AppError):
+    """A bounded internal resource (worker pool, queue) is saturated; the client should retry later."""
+
+    def __init__(self, service: str, message: str, details: dict[str, Any] | None = None):
+        super().__init__(
+            message=message,
+            code="SERVICE_OVERLOADED",
+            status_code=503,
+            details={"service": service, **(details or {})},
+        )
@@ -0,0 +1,149 @@
+# src/core/password_hasher.py
+"""bcrypt hashing/verification on a dedicated, bounded thread pool (keeps the event loop free)."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import bcrypt
+
+from src.core.config import settings
+from src.core.exceptions import ServiceOverloadedError
+from src.core.logging import get_logger
+from src.core.tool_executor import Histogram
+
+logger = get_logger("password_hasher")
+
+
+def hash_rounds(hashed_password: str) -> int | None:
+    """Cost factor encoded in a bcrypt hash (``$2b$<rounds>$...``), None if unparsable."""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own thread pool with a queue-depth limit.
+
+    bcrypt releases the GIL, so ``max_workers`` hashes run in parallel. At
+    most ``max_queue`` further calls may wait for a worker; beyond that calls
+    fail fast with ``ServiceOverloadedError`` (HTTP 503) instead of piling up
+    behind a login storm.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, rounds: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0  # queued + running
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceOverloadedError(
+                    "password_hasher",
+                    "Troppe richieste di autenticazione, riprova tra qualche secondo",
+                    details={"pending": self.pending},
+                )
+            self.pending += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            pool = self._pool
+        submitted = time.perf_counter()
+
+        def timed() -> Any:
+            started = time.perf_counter()
+            self.queue_wait.observe((started - submitted) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                self.run_time.observe((time.perf_counter() - started) * 1000)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, timed)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash ``password`` with the configured cost factor."""
+        return await self._submit(self._hash_sync, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check ``password`` against a bcrypt hash."""
+        return await self._submit(self._verify_sync, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if the hash was made with a different cost factor than configured."""
+        return hash_rounds(hashed_password) != self.rounds
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verify and, on success, return a new hash if the cost factor changed.
+
+        Returns:
+            (valid, new_hash) where new_hash is None when no rehash is needed.
+        """
+        if not await self.verify(password, hashed_password):
+            return False, None
+        if not self.needs_rehash(hashed_password):
+            return True, None
+        new_hash = await self.hash(password)
+        with self._lock:
+            self.rehashed += 1
+        logger.info(
+            "Password rehashed with new cost factor",
+            extra={"from_rounds": hash_rounds(hashed_password), "to_rounds": self.rounds},
+        )
+        return True, new_hash
+
+    @staticmethod
+    def _hash_sync(password: str, rounds: int) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+    @staticmethod
+    def _verify_sync(password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    def stats(self) -> dict[str, Any]:
+        """Pool saturation, rejections and latency histograms."""
+        with self._lock:
+            pending, rejected, rehashed = self.pending, self.rejected, self.rehashed
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "rounds": self.rounds,
+            "pending": pending,
+            "rejected": rejected,
+            "rehashed": rehashed,
+            "queue_wait": self.queue_wait.stats(),
+            "run_time": self.run_time.stats(),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (cancelling queued calls); the next call starts a new pool.
+
+        Blocks until running hashes finish when ``wait``: call it off the event loop.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASHER_MAX_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+    rounds=settings.BCRYPT_ROUNDS,
+)
@@ -60,6 +60,16 @@ class Prompts:
         """Prompt per generare il titolo della conversazione."""
         return self.agent.get("title_generation_prompt", "")
 
+    @property
+    def summary_prompt(self) -> str:
+        """Prompt per il riepilogo incrementale dei turni più vecchi."""
+        return self.agent.get("summary_prompt", "")
+
+    @property
+    def summary_context_prompt(self) -> str:
+        """Contesto con il riepilogo dei turni precedenti."""
+        return self.agent.get("summary_context_prompt", "")
+
     @property
     def error_prompt(self) -> str:
         """Prompt per messaggi di errore."""
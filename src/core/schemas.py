@@ -3,6 +3,8 @@
 
 from pydantic import BaseModel, Field
 
+from src.core.config import settings
+
 # --- Web & Knowledge Base Schemas ---
 
 
@@ -16,12 +18,15 @@ class KBReadSchema(BaseModel):
     """Schema for KB read tool."""
 
     query: str = Field(description="The query to search in the knowledge base.")
+    top_k: int = Field(default=settings.KB_TOP_K, ge=1, le=10, description="Number of passages to return (1-10).")
+    topic: str | None = Field(default=None, description="Optional topic to restrict the search (e.g., 'valuation').")
 
 
 class KBWriteSchema(BaseModel):
     """Schema for KB write tool."""
 
     content: str = Field(description="The content to save to the knowledge base.")
+    topic: str | None = Field(default=None, description="Optional short topic label (e.g., 'valuation', 'dividends').")
 
 
 # --- Stock Analysis Schemas ---
@@ -47,8 +52,21 @@ class CompareStocksSchema(BaseModel):
     """Schema for compare stocks tool."""
 
     tickers: list[str] = Field(
-        description="List of 2-5 stock tickers to compare (e.g., ['AAPL', 'MSFT', 'GOOGL'])."
+        description="List of 2-50 stock tickers to compare (e.g., ['AAPL', 'MSFT', 'GOOGL'])."
+    )
+
+
+class UniverseScoringSchema(BaseModel):
+    """Schema for universe scoring tool."""
+
+    tickers: list[str] = Field(
+        description="List of stock tickers to score and rank (up to 500, e.g., ['KO', 'PEP', 'JNJ'])."
+    )
+    sort_by: str = Field(
+        default="total_score",
+        description="Ranking key: total_score, pe, roe, de, beta, dividend, growth, evebitda",
     )
+    top_n: int = Field(default=10, description="Number of top-ranked tickers to return.")
 
 
 class DividendAnalysisSchema(BaseModel):
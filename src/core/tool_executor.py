@@ -0,0 +1,200 @@
+# src/core/tool_executor.py
+"""Dedicated execution engine for agent tools: sized thread pool, per-tool limits, latency histograms."""
+
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger("tool_executor")
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float("inf"))
+
+
+class Histogram:
+    """Thread-safe fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            for index, bound in enumerate(self.buckets):
+                if value_ms <= bound:
+                    self.counts[index] += 1
+                    break
+            self.count += 1
+            self.total += value_ms
+            self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the ``q`` quantile (observed max for the last bucket)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            cumulative = 0
+            for bound, count in zip(self.buckets, self.counts, strict=True):
+                cumulative += count
+                if cumulative >= rank:
+                    return min(bound, self.max)
+            return self.max
+
+    def stats(self) -> dict[str, Any]:
+        """Summary plus cumulative bucket counts (Prometheus-style ``le`` labels)."""
+        with self._lock:
+            count, total, maximum, counts = self.count, self.total, self.max, list(self.counts)
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.buckets, counts, strict=True):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 2) if count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(maximum, 2),
+            "buckets": buckets,
+        }
+
+
+class _ToolMetrics:
+    def __init__(self):
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+        self.errors = 0
+        self.in_flight = 0
+
+
+class ToolExecutor:
+    """
+    Runs blocking tool functions on a dedicated, bounded thread pool.
+
+    Each tool has its own concurrency limit (``limits``, falling back to
+    ``default_limit``) so a burst of one tool cannot take every worker, and
+    tool work never competes with the event loop's default executor.
+    Queue wait (semaphore + pool queue) and run time are recorded per tool.
+    """
+
+    def __init__(self, max_workers: int, default_limit: int, limits: dict[str, int] | None = None):
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._metrics: dict[str, _ToolMetrics] = {}
+        self._metrics_lock = threading.Lock()
+        # asyncio semaphores are bound to one event loop: keep one set per loop
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created on first use (and again after ``shutdown``)."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+            return self._pool
+
+    def _tool_metrics(self, tool_name: str) -> _ToolMetrics:
+        with self._metrics_lock:
+            metrics = self._metrics.get(tool_name)
+            if metrics is None:
+                metrics = self._metrics[tool_name] = _ToolMetrics()
+            return metrics
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        per_loop = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = per_loop.get(tool_name)
+        if semaphore is None:
+            semaphore = per_loop[tool_name] = asyncio.Semaphore(self.limits.get(tool_name, self.default_limit))
+        return semaphore
+
+    async def run(self, tool_name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking ``fn(*args)`` on the tool pool under the tool's concurrency limit."""
+        metrics = self._tool_metrics(tool_name)
+        submitted = time.perf_counter()
+
+        def timed() -> Any:
+            started = time.perf_counter()
+            metrics.queue_wait.observe((started - submitted) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                metrics.run_time.observe((time.perf_counter() - started) * 1000)
+
+        async with self._semaphore(tool_name):
+            metrics.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor(), timed)
+            except Exception:
+                metrics.errors += 1
+                raise
+            finally:
+                metrics.in_flight -= 1
+
+    @contextlib.asynccontextmanager
+    async def track(self, tool_name: str) -> AsyncIterator[None]:
+        """Concurrency limit and timings for async (I/O-bound) tools that do not need a thread."""
+        metrics = self._tool_metrics(tool_name)
+        submitted = time.perf_counter()
+        async with self._semaphore(tool_name):
+            started = time.perf_counter()
+            metrics.queue_wait.observe((started - submitted) * 1000)
+            metrics.in_flight += 1
+            try:
+                yield
+            except Exception:
+                metrics.errors += 1
+                raise
+            finally:
+                metrics.in_flight -= 1
+                metrics.run_time.observe((time.perf_counter() - started) * 1000)
+
+    def stats(self) -> dict[str, Any]:
+        """Pool configuration and per-tool histograms."""
+        with self._metrics_lock:
+            items = list(self._metrics.items())
+        return {
+            "max_workers": self.max_workers,
+            "default_limit": self.default_limit,
+            "tools": {
+                name: {
+                    "limit": self.limits.get(name, self.default_limit),
+                    "in_flight": m.in_flight,
+                    "errors": m.errors,
+                    "queue_wait": m.queue_wait.stats(),
+                    "run_time": m.run_time.stats(),
+                }
+                for name, m in items
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the current pool (cancelling queued calls); the next ``run`` starts a new one.
+
+        Blocks until running calls finish when ``wait``: call it off the event loop.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+tool_executor = ToolExecutor(
+    max_workers=settings.TOOL_EXECUTOR_MAX_WORKERS,
+    default_limit=settings.TOOL_CONCURRENCY_DEFAULT,
+    limits=settings.TOOL_CONCURRENCY_LIMITS,
+)
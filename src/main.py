@@ -1,6 +1,7 @@
 # src/main.py
 """Application entry point - FastAPI backend with NiceGUI frontend."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -12,10 +13,17 @@ from src.api.admin import router as admin_router
 from src.api.auth import router as auth_router
 from src.api.endpoints import router
 from src.api.health import router as health_router
+from src.core.agent_graph import close_checkpointer, open_checkpointer
 from src.core.config import settings
 from src.core.exceptions import AppError
 from src.core.logging import get_logger, setup_logging
+from src.core.password_hasher import password_hasher
+from src.core.tool_executor import tool_executor
 from src.services.database import init_db
+from src.services.llm import close_http_client, get_http_client
+from src.services.revocation_cache import start_revocation_maintenance, stop_revocation_maintenance
+from src.services.search_provider import close_search_http_client, get_search_http_client
+from src.services.vector_store import close_vector_store, init_vector_store
 from src.ui.pages.admin_page import AdminDashboard
 from src.ui.pages.chat_page import ChatPage
 from src.ui.pages.login_page import LoginPage, RegisterPage
@@ -43,8 +51,20 @@ async def lifespan(fastapi_application: FastAPI):
     )
     await init_db()
     logger.info("Database initialized")
+    await open_checkpointer()
+    get_http_client()
+    get_search_http_client()
+    await init_vector_store()
+    await start_revocation_maintenance()
     yield
     logger.info("Shutting down application")
+    await stop_revocation_maintenance()
+    await close_checkpointer()
+    await asyncio.to_thread(tool_executor.shutdown)
+    await asyncio.to_thread(password_hasher.shutdown)
+    await close_http_client()
+    await close_search_http_client()
+    await close_vector_store()
 
 
 # Create FastAPI app
@@ -4,12 +4,14 @@
 import json
 from datetime import datetime, timezone
 
-from sqlalchemy import delete, func, or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
-from src.core.security import get_password_hash, verify_password
+from src.core.password_hasher import password_hasher
 from src.services.auth_models import AuditLog, TokenBlacklist, User, UserRole
+from src.services.principal_cache import invalidate_principal
+from src.services.revocation_cache import purge_expired, revocation_cache
 
 # --- User CRUD ---
 
@@ -55,6 +57,7 @@ async def verify_user_email(session: AsyncSession, user: User) -> None:
     user.email_verification_token = None
     user.email_verification_sent_at = None
     await session.commit()
+    invalidate_principal(user.id)
 
 
 async def create_user(
@@ -65,7 +68,7 @@ async def create_user(
     role: UserRole = UserRole.USER,
 ) -> User:
     """Create a new user."""
-    hashed_password = get_password_hash(password)
+    hashed_password = await password_hasher.hash(password)
     user = User(
         username=username,
         email=email,
@@ -97,7 +100,8 @@ async def authenticate_user(session: AsyncSession, username: str, password: str)
             user.failed_login_attempts = 0
             user.locked_until = None
 
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         # Increment failed attempts
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
         if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
@@ -105,9 +109,13 @@ async def authenticate_user(session: AsyncSession, username: str, password: str)
 
             user.locked_until = datetime.now(timezone.utc) + timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES)
         await session.commit()
+        if user.locked_until:
+            invalidate_principal(user.id)
         return None
 
-    # Successful login: reset failed attempts
+    # Successful login: reset failed attempts (and upgrade the hash if the cost factor changed)
+    if new_hash is not None:
+        user.hashed_password = new_hash
     user.failed_login_attempts = 0
     user.locked_until = None
     user.last_login = datetime.now(timezone.utc)
@@ -165,13 +173,14 @@ async def update_user(
     if email is not None:
         user.email = email
     if password is not None:
-        user.hashed_password = get_password_hash(password)
+        user.hashed_password = await password_hasher.hash(password)
     if role is not None:
         user.role = role.value
     if is_active is not None:
         user.is_active = is_active
 
     await session.commit()
+    invalidate_principal(user_id)
     await session.refresh(user)
     return user
 
@@ -182,6 +191,7 @@ async def delete_user(session: AsyncSession, user_id: int) -> bool:
     if user:
         await session.delete(user)
         await session.commit()
+        invalidate_principal(user_id)
         return True
     return False
 
@@ -214,20 +224,17 @@ async def blacklist_token(session: AsyncSession, token_jti: str, user_id: int, e
     )
     session.add(entry)
     await session.commit()
+    revocation_cache.add(token_jti)
 
 
 async def is_token_blacklisted(session: AsyncSession, token_jti: str) -> bool:
-    """Check if a token JTI is blacklisted."""
-    result = await session.execute(select(TokenBlacklist).filter(TokenBlacklist.token_jti == token_jti))
-    return result.scalars().first() is not None
+    """Check if a token JTI is blacklisted (Bloom filter first, DB only on a filter hit)."""
+    return await revocation_cache.is_revoked(session, token_jti)
 
 
 async def cleanup_expired_blacklist(session: AsyncSession) -> int:
     """Remove expired tokens from blacklist. Returns count of removed entries."""
-    now = datetime.now(timezone.utc)
-    result = await session.execute(delete(TokenBlacklist).where(TokenBlacklist.expires_at < now))
-    await session.commit()
-    return result.rowcount
+    return await purge_expired(session)
 
 
 # --- Audit Log ---
@@ -0,0 +1,168 @@
+# src/services/embedding_cache.py
+"""Two-tier embedding cache keyed by (embedding model, normalized text hash)."""
+
+import hashlib
+import re
+import threading
+import unicodedata
+import uuid
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.database import AsyncSessionLocal
+from src.services.models import EmbeddingCacheEntry
+
+logger = get_logger("embedding_cache")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Namespace for deterministic KB point IDs (uuid5 of the normalized content hash)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c7a52-3d0e-4b8f-9a61-2f4b7e0c9d13")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFKC, case-folded, collapsed whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def text_hash(text: str) -> str:
+    """sha256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def point_id_for(text: str) -> str:
+    """Deterministic point ID: identical (normalized) content always maps to the same point."""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, text_hash(text)))
+
+
+class EmbeddingCache:
+    """
+    In-process LRU tier backed by an optional Postgres table.
+
+    Vectors are stored as float32. Lookups check memory first, then the
+    persistent tier (if enabled); persistent hits are promoted to memory.
+    Persistent-tier failures are logged and treated as misses.
+    """
+
+    def __init__(self, max_entries: int, persistent: bool = False):
+        self._memory = TTLCache(max_entries=max_entries)
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    async def get(self, model: str, text: str) -> np.ndarray | None:
+        """Return the cached float32 vector or None."""
+        return (await self.get_many(model, [text]))[0]
+
+    async def set(self, model: str, text: str, embedding: list[float] | np.ndarray) -> np.ndarray:
+        """Cache an embedding; returns it as a read-only float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        await self.set_many(model, [text], vector[np.newaxis, :])
+        return self._memory.peek((model, text_hash(text)))
+
+    async def get_many(self, model: str, texts: list[str]) -> list[np.ndarray | None]:
+        """Batch lookup: one persistent-tier query for all memory misses."""
+        keys = [(model, text_hash(text)) for text in texts]
+        vectors = [self._memory.get(key) for key in keys]
+        hits = sum(v is not None for v in vectors)
+
+        missing = {key[1] for key, vector in zip(keys, vectors, strict=True) if vector is None}
+        persistent = 0
+        if self.persistent and missing:
+            loaded = await self._load_many(model, sorted(missing))
+            for index, key in enumerate(keys):
+                if vectors[index] is None and key[1] in loaded:
+                    vectors[index] = loaded[key[1]]
+                    self._memory.set(key, vectors[index])
+                    persistent += 1
+
+        with self._lock:
+            self.memory_hits += hits
+            self.persistent_hits += persistent
+            self.misses += len(texts) - hits - persistent
+        return vectors
+
+    async def set_many(self, model: str, texts: list[str], matrix: np.ndarray) -> None:
+        """Cache one embedding per row of ``matrix``."""
+        rows = {}
+        for text, row in zip(texts, np.asarray(matrix, dtype=np.float32), strict=True):
+            vector = row.copy()
+            vector.setflags(write=False)
+            key = (model, text_hash(text))
+            self._memory.set(key, vector)
+            rows[key[1]] = vector
+        if self.persistent and rows:
+            await self._store_many(model, rows)
+
+    def clear(self) -> None:
+        """Empty the in-process tier."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters per tier."""
+        with self._lock:
+            memory_hits, persistent_hits, misses = self.memory_hits, self.persistent_hits, self.misses
+        lookups = memory_hits + persistent_hits + misses
+        return {
+            "persistent": self.persistent,
+            "memory": self._memory.stats(),
+            "memory_hits": memory_hits,
+            "persistent_hits": persistent_hits,
+            "misses": misses,
+            "hit_rate": round((memory_hits + persistent_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    # --- Persistent tier (Postgres) ---
+
+    @staticmethod
+    async def _load_many(model: str, digests: list[str]) -> dict[str, np.ndarray]:
+        try:
+            async with AsyncSessionLocal() as session:
+                rows = await session.scalars(
+                    select(EmbeddingCacheEntry).where(
+                        EmbeddingCacheEntry.model == model,
+                        EmbeddingCacheEntry.text_hash.in_(digests),
+                    )
+                )
+                entries = list(rows)
+        except Exception as e:
+            logger.warning("Embedding cache read failed", extra={"error": str(e)})
+            return {}
+        loaded = {}
+        for row in entries:
+            vector = np.frombuffer(row.vector, dtype=np.float32)
+            if vector.size == row.dim:
+                loaded[row.text_hash] = vector
+        return loaded
+
+    @staticmethod
+    async def _store_many(model: str, rows: dict[str, np.ndarray]) -> None:
+        statement = (
+            insert(EmbeddingCacheEntry)
+            .values(
+                [
+                    {"model": model, "text_hash": digest, "dim": int(vector.size), "vector": vector.tobytes()}
+                    for digest, vector in rows.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["model", "text_hash"])
+        )
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception as e:
+            logger.warning("Embedding cache write failed", extra={"error": str(e)})
+
+
+embedding_cache = EmbeddingCache(
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    persistent=settings.EMBEDDING_CACHE_PERSISTENT,
+)
@@ -3,7 +3,13 @@
 
 from typing import Any
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
+
+from src.services import market_data
+
+# Upper bound on tickers accepted by compare_stocks_sync (screener-style queries)
+MAX_COMPARE_TICKERS = 50
 
 # --- Scoring Functions ---
 
@@ -110,8 +116,7 @@ def analyze_stock_sync(ticker: str) -> dict[str, Any]:
     Perform simplified fundamental analysis using yfinance.
     Returns weighted score with BUY/HOLD/SELL decision.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info or {}
+    info = market_data.get_info(ticker)
 
     pe = info.get("trailingPE")
     roe = info.get("returnOnEquity")
@@ -158,6 +163,138 @@ def analyze_stock_sync(ticker: str) -> dict[str, Any]:
     }
 
 
+# --- Vectorized Universe Scoring ---
+
+# Upper bound on tickers accepted by analyze_universe
+MAX_UNIVERSE_TICKERS = 500
+
+# Score key -> yfinance info field, in WEIGHTS order
+METRIC_FIELDS: dict[str, str] = {
+    "pe": "trailingPE",
+    "roe": "returnOnEquity",
+    "de": "debtToEquity",
+    "beta": "beta",
+    "dividend": "dividendYield",
+    "growth": "revenueGrowth",
+    "evebitda": "enterpriseToEbitda",
+}
+
+# Vectorized equivalents of the score_* if-chains: (conditions, choices, default).
+# Conditions are evaluated in order like the scalar functions; NaN falls through to default.
+_SCORE_RULES: dict[str, Any] = {
+    "pe": (lambda v: [v < 15, v < 30, v < 45], [10, 7, 5], 2),
+    "roe": (lambda v: [v > 20, v >= 10], [10, 7], 3),
+    "de": (lambda v: [v < 1, v <= 2], [10, 6], 2),
+    "beta": (
+        lambda v: [(v >= 0.8) & (v <= 1.2), (v > 1.2) & (v <= 1.5), (v > 1.5) & (v <= 2)],
+        [10, 7, 5],
+        2,
+    ),
+    "dividend": (lambda v: [v > 0.03, v >= 0.01], [10, 7], 3),
+    "growth": (lambda v: [v > 0.10, v >= 0], [10, 6], 2),
+    "evebitda": (lambda v: [v < 8, v <= 14], [10, 6], 2),
+}
+
+
+def _metrics_matrix(infos: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build an (n_tickers, n_metrics) float matrix from info blobs.
+    Returns (values, present) where ``present`` is False for missing/non-numeric values.
+    """
+    values = np.full((len(infos), len(METRIC_FIELDS)), np.nan)
+    present = np.zeros(values.shape, dtype=bool)
+    for i, info in enumerate(infos):
+        for j, field in enumerate(METRIC_FIELDS.values()):
+            value = info.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[i, j] = value
+                present[i, j] = True
+    return values, present
+
+
+def score_matrix(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Score a metrics matrix column by column. Missing values score 0."""
+    scores = np.zeros(values.shape)
+    with np.errstate(invalid="ignore"):
+        for j, key in enumerate(METRIC_FIELDS):
+            column = values[:, j] * 100 if key == "roe" else values[:, j]
+            conditions, choices, default = _SCORE_RULES[key]
+            scored = np.select(conditions(column), choices, default=default)
+            scores[:, j] = np.where(present[:, j], scored, 0)
+    return scores
+
+
+def score_universe(infos: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Score many tickers in one pass from their info blobs.
+    Per-ticker results match analyze_stock_sync.
+    """
+    tickers = list(infos)
+    values, present = _metrics_matrix([infos[t] for t in tickers])
+    scores = score_matrix(values, present)
+
+    # Accumulate in WEIGHTS order with the same compensated (Neumaier) summation
+    # that builtin sum() uses for floats, so totals are bit-identical to the scalar path
+    totals = np.zeros(len(tickers))
+    compensation = np.zeros(len(tickers))
+    for j, key in enumerate(METRIC_FIELDS):
+        term = scores[:, j] * WEIGHTS[key]
+        partial = totals + term
+        compensation += np.where(
+            np.abs(totals) >= np.abs(term), (totals - partial) + term, (term - partial) + totals
+        )
+        totals = partial
+    totals = np.where((compensation != 0) & np.isfinite(compensation), totals + compensation, totals)
+    decisions = np.select([totals >= 7.5, totals >= 6], ["BUY", "HOLD"], default="SELL")
+
+    results = []
+    for i, ticker in enumerate(tickers):
+        info = infos[ticker]
+        results.append(
+            {
+                "ticker": ticker.upper(),
+                "raw_metrics": {field: info.get(field) for field in METRIC_FIELDS.values()},
+                "scores": {key: int(scores[i, j]) for j, key in enumerate(METRIC_FIELDS)},
+                "total_score": round(float(totals[i]), 2),
+                "decision": str(decisions[i]),
+            }
+        )
+    return results
+
+
+def analyze_universe(tickers: list[str], sort_by: str = "total_score", top_n: int | None = None) -> dict[str, Any]:
+    """
+    Score a universe of tickers and rank them.
+    ``sort_by`` is "total_score" or a score key (e.g. "dividend"); ties are broken by total score.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if not tickers:
+        return {"error": "At least 1 ticker required"}
+    tickers = tickers[:MAX_UNIVERSE_TICKERS]
+    if sort_by != "total_score" and sort_by not in WEIGHTS:
+        return {"error": f"Invalid sort_by. Must be one of: {['total_score', *WEIGHTS]}"}
+
+    infos = market_data.get_info_batch(tickers)
+    results = score_universe({t: infos.get(t, {}) for t in tickers})
+
+    totals = np.array([r["total_score"] for r in results])
+    primary = totals if sort_by == "total_score" else np.array([r["scores"][sort_by] for r in results])
+    # lexsort: last key is primary; negate for descending, stable on input order
+    order = np.lexsort((-totals, -primary))
+    ranked = [results[i] for i in order]
+    if top_n:
+        ranked = ranked[:top_n]
+
+    decisions = [r["decision"] for r in results]
+    return {
+        "universe_size": len(results),
+        "sort_by": sort_by,
+        "weights": WEIGHTS,
+        "summary": {d: decisions.count(d) for d in ("BUY", "HOLD", "SELL")},
+        "ranking": ranked,
+    }
+
+
 # --- Analysis Functions ---
 
 
@@ -165,9 +302,8 @@ def get_stock_price_sync(ticker: str, period: str = "1mo") -> dict[str, Any]:
     """
     Get current price and historical data for a stock.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info or {}
-    hist = stock.history(period=period)
+    info = market_data.get_info(ticker)
+    hist = market_data.get_history(ticker, period)
 
     if hist.empty:
         return {"ticker": ticker.upper(), "error": "No data available"}
@@ -216,20 +352,27 @@ def get_stock_price_sync(ticker: str, period: str = "1mo") -> dict[str, Any]:
 def compare_stocks_sync(tickers: list[str]) -> dict[str, Any]:
     """
     Compare multiple stocks side by side.
+    Fundamentals and 1y price histories are fetched in batch and rankings
+    are computed on a single columnar frame.
     """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
     if len(tickers) < 2:
         return {"error": "At least 2 tickers required"}
-    if len(tickers) > 5:
-        tickers = tickers[:5]  # Limit to 5
+    if len(tickers) > MAX_COMPARE_TICKERS:
+        tickers = tickers[:MAX_COMPARE_TICKERS]
+
+    infos = market_data.get_info_batch(tickers)
+    try:
+        histories = market_data.get_history_batch(tickers, "1y")
+    except Exception:
+        histories = {}
 
     comparison = []
     for ticker in tickers:
-        stock = yf.Ticker(ticker)
-        info = stock.info or {}
-
+        info = infos.get(ticker, {})
         comparison.append(
             {
-                "ticker": ticker.upper(),
+                "ticker": ticker,
                 "name": info.get("shortName", "N/A"),
                 "price": info.get("currentPrice") or info.get("regularMarketPrice"),
                 "market_cap": info.get("marketCap"),
@@ -243,22 +386,38 @@ def compare_stocks_sync(tickers: list[str]) -> dict[str, Any]:
             }
         )
 
-    # Rank by metrics
-    rankings = {
-        "by_pe": sorted([c for c in comparison if c["pe_ratio"]], key=lambda x: x["pe_ratio"] or 999),
-        "by_roe": sorted([c for c in comparison if c["roe"]], key=lambda x: x["roe"] or 0, reverse=True),
-        "by_market_cap": sorted(
-            [c for c in comparison if c["market_cap"]], key=lambda x: x["market_cap"] or 0, reverse=True
-        ),
-    }
+    frame = pd.DataFrame(comparison).set_index("ticker")
+    numeric = frame[["market_cap", "pe_ratio", "roe"]].apply(pd.to_numeric, errors="coerce")
+
+    # 1y performance from aligned closing prices
+    closes = pd.DataFrame(
+        {t: h["Close"] for t, h in histories.items() if not h.empty and "Close" in h}
+    )
+    if not closes.empty:
+        first = closes.bfill().iloc[0]
+        last = closes.ffill().iloc[-1]
+        change_1y = ((last - first) / first * 100).round(2).reindex(frame.index)
+    else:
+        change_1y = pd.Series(np.nan, index=frame.index)
+    for item in comparison:
+        value = change_1y.get(item["ticker"])
+        item["change_1y_pct"] = None if value is None or pd.isna(value) else float(value)
+
+    def _pick(series: pd.Series, highest: bool) -> str | None:
+        # Same semantics as before: ignore missing and zero values
+        valid = series[series.notna() & (series != 0)]
+        if valid.empty:
+            return None
+        return valid.idxmax() if highest else valid.idxmin()
 
     return {
-        "tickers": [t.upper() for t in tickers],
+        "tickers": tickers,
         "comparison": comparison,
         "rankings": {
-            "lowest_pe": rankings["by_pe"][0]["ticker"] if rankings["by_pe"] else None,
-            "highest_roe": rankings["by_roe"][0]["ticker"] if rankings["by_roe"] else None,
-            "largest_market_cap": rankings["by_market_cap"][0]["ticker"] if rankings["by_market_cap"] else None,
+            "lowest_pe": _pick(numeric["pe_ratio"], highest=False),
+            "highest_roe": _pick(numeric["roe"], highest=True),
+            "largest_market_cap": _pick(numeric["market_cap"], highest=True),
+            "best_performance_1y": _pick(change_1y, highest=True),
         },
     }
 
@@ -267,9 +426,8 @@ def dividend_analysis_sync(ticker: str) -> dict[str, Any]:
     """
     Analyze dividend history and metrics.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info or {}
-    dividends = stock.dividends
+    info = market_data.get_info(ticker)
+    dividends = market_data.get_dividends(ticker)
 
     dividend_yield = info.get("dividendYield")
     payout_ratio = info.get("payoutRatio")
@@ -318,8 +476,7 @@ def company_profile_sync(ticker: str) -> dict[str, Any]:
     """
     Get company profile information.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info or {}
+    info = market_data.get_info(ticker)
 
     return {
         "ticker": ticker.upper(),
@@ -341,8 +498,7 @@ def stock_news_sync(ticker: str) -> dict[str, Any]:
     """
     Get recent news for a stock.
     """
-    stock = yf.Ticker(ticker)
-    news = stock.news or []
+    news = market_data.get_news(ticker)
 
     news_list = []
     for item in news[:5]:  # Last 5 news
@@ -367,8 +523,7 @@ def technical_indicators_sync(ticker: str, period: str = "3mo") -> dict[str, Any
     """
     Calculate technical indicators for a stock.
     """
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period=period)
+    hist = market_data.get_history(ticker, period)
 
     if hist.empty:
         return {"ticker": ticker.upper(), "error": "No data available"}
@@ -432,10 +587,9 @@ def earnings_calendar_sync(ticker: str) -> dict[str, Any]:
     """
     Get earnings calendar and history.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info or {}
-    calendar = stock.calendar or {}
-    earnings = stock.earnings_history
+    info = market_data.get_info(ticker)
+    calendar = market_data.get_calendar(ticker)
+    earnings = market_data.get_earnings_history(ticker)
 
     # Next earnings date
     earnings_dates = calendar.get("Earnings Date") if isinstance(calendar, dict) else None
@@ -0,0 +1,279 @@
+# src/services/ingestion.py
+"""Bulk knowledge-base ingestion: read, chunk, deduplicate, embed in batches, upsert to Qdrant.
+
+Usage:
+    uv run python -m src.services.ingestion docs/ glossary.csv --topic valuation
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from qdrant_client import models
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.embedding_cache import point_id_for
+from src.services.llm import OllamaService
+from src.services.vector_store import VectorStoreService, get_vector_store
+
+logger = get_logger("ingestion")
+
+SUPPORTED_SUFFIXES = {".md", ".markdown", ".txt", ".csv"}
+
+
+@dataclass
+class Document:
+    """A unit of source text with its origin."""
+
+    source: str
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Chunk:
+    """A chunk ready to be embedded."""
+
+    point_id: str
+    text: str
+    payload: dict[str, Any]
+
+
+@dataclass
+class IngestionStats:
+    """Counters reported at the end of a run."""
+
+    files: int = 0
+    skipped_files: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    upserted: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+# --- Readers ---
+
+
+def read_documents(path: Path) -> list[Document]:
+    """Read a Markdown/text file (one document) or a CSV file (one document per row)."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        documents = []
+        for index, row in enumerate(rows):
+            # A "text"/"content" column is used as-is; otherwise all columns become "key: value" lines
+            text = row.get("text") or row.get("content") or "\n".join(f"{k}: {v}" for k, v in row.items() if v)
+            metadata = {"row": index}
+            if row.get("topic"):
+                metadata["topic"] = row["topic"]
+            documents.append(Document(source=str(path), text=text, metadata=metadata))
+        return documents
+    if suffix in SUPPORTED_SUFFIXES:
+        return [Document(source=str(path), text=path.read_text(encoding="utf-8"))]
+    raise ValueError(f"Unsupported file type: {path}")
+
+
+def discover_files(paths: list[Path]) -> list[Path]:
+    """Expand directories into supported files (sorted for a stable, resumable order)."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES)
+        elif path.suffix.lower() in SUPPORTED_SUFFIXES:
+            files.append(path)
+        else:
+            logger.warning("Skipping unsupported file", extra={"path": str(path)})
+    return sorted(set(files))
+
+
+# --- Chunking ---
+
+
+def chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """Split text into ~``chunk_size`` character chunks overlapping by ``overlap`` characters.
+
+    Chunks end at the last paragraph, line or word boundary inside the window when possible.
+    """
+    if overlap >= chunk_size:
+        raise ValueError("overlap must be smaller than chunk_size")
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            window = text[start:end]
+            for separator in ("\n\n", "\n", ". ", " "):
+                cut = window.rfind(separator)
+                if cut > chunk_size // 2:
+                    end = start + cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def build_chunks(documents: list[Document], chunk_size: int, overlap: int, topic: str | None) -> list[Chunk]:
+    """Chunk documents into payload-ready chunks with deterministic IDs."""
+    created_at = datetime.now(timezone.utc).isoformat()
+    chunks = []
+    for document in documents:
+        for index, text in enumerate(chunk_text(document.text, chunk_size, overlap)):
+            payload = {
+                "text": text,
+                "source": document.source,
+                "chunk_index": index,
+                "created_at": created_at,
+                **document.metadata,
+            }
+            if topic and "topic" not in payload:
+                payload["topic"] = topic
+            chunks.append(Chunk(point_id=point_id_for(text), text=text, payload=payload))
+    return chunks
+
+
+# --- Progress ---
+
+
+class Progress:
+    """JSON progress file: files already ingested (by content sha256) are skipped on re-runs."""
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.files: dict[str, dict[str, Any]] = {}
+        if path is not None and path.exists():
+            self.files = json.loads(path.read_text(encoding="utf-8")).get("files", {})
+
+    @staticmethod
+    def fingerprint(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def is_done(self, path: Path, fingerprint: str) -> bool:
+        return self.files.get(str(path), {}).get("sha256") == fingerprint
+
+    def mark_done(self, path: Path, fingerprint: str, chunks: int) -> None:
+        self.files[str(path)] = {
+            "sha256": fingerprint,
+            "chunks": chunks,
+            "ingested_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps({"files": self.files}, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+
+
+# --- Pipeline ---
+
+
+class IngestionPipeline:
+    """Embeds chunks in batches and upserts them with bounded parallelism."""
+
+    def __init__(
+        self,
+        vector_store: VectorStoreService | None = None,
+        embedder: OllamaService | None = None,
+        batch_size: int | None = None,
+        upsert_concurrency: int | None = None,
+        chunk_size: int | None = None,
+        chunk_overlap: int | None = None,
+    ):
+        self.vector_store = vector_store or get_vector_store()
+        self.embedder = embedder or OllamaService()
+        self.batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        self.chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+        self.chunk_overlap = settings.INGEST_CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self._upsert_slots = asyncio.Semaphore(upsert_concurrency or settings.INGEST_UPSERT_CONCURRENCY)
+
+    async def ingest_chunks(self, chunks: list[Chunk], stats: IngestionStats) -> None:
+        """Deduplicate, embed and upsert chunks; embedding of batch N+1 overlaps upsert of batch N."""
+        unique: dict[str, Chunk] = {}
+        for chunk in chunks:
+            unique.setdefault(chunk.point_id, chunk)
+        stats.chunks += len(chunks)
+        stats.duplicates += len(chunks) - len(unique)
+
+        pending = list(unique.values())
+        await self.vector_store.initialize()
+        upserts: list[asyncio.Task] = []
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            stored = await self.vector_store.existing_ids([c.point_id for c in batch])
+            batch = [c for c in batch if c.point_id not in stored]
+            stats.duplicates += len(stored)
+            if not batch:
+                continue
+            vectors = await self.embedder.create_embeddings([c.text for c in batch])
+            points = [
+                models.PointStruct(
+                    id=c.point_id, vector=self.vector_store.point_vector(vector.tolist(), c.text), payload=c.payload
+                )
+                for c, vector in zip(batch, vectors, strict=True)
+            ]
+            upserts.append(asyncio.create_task(self._upsert(points)))
+        for count in await asyncio.gather(*upserts):
+            stats.upserted += count
+
+    async def _upsert(self, points: list[models.PointStruct]) -> int:
+        async with self._upsert_slots:
+            await self.vector_store.upsert_points(points)
+        return len(points)
+
+    async def ingest_paths(
+        self,
+        paths: list[Path],
+        topic: str | None = None,
+        progress_file: Path | None = None,
+    ) -> IngestionStats:
+        """Ingest files/directories, skipping files already recorded in ``progress_file``."""
+        progress = Progress(progress_file)
+        stats = IngestionStats()
+        for path in discover_files(paths):
+            fingerprint = progress.fingerprint(path)
+            if progress.is_done(path, fingerprint):
+                stats.skipped_files += 1
+                continue
+            chunks = build_chunks(read_documents(path), self.chunk_size, self.chunk_overlap, topic)
+            await self.ingest_chunks(chunks, stats)
+            progress.mark_done(path, fingerprint, len(chunks))
+            stats.files += 1
+            logger.info("File ingested", extra={"path": str(path), "chunks": len(chunks)})
+        return stats
+
+
+async def _main(args: argparse.Namespace) -> None:
+    pipeline = IngestionPipeline(batch_size=args.batch_size)
+    try:
+        stats = await pipeline.ingest_paths(args.paths, topic=args.topic, progress_file=args.progress_file)
+    finally:
+        await pipeline.vector_store.close()
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest Markdown/text/CSV files into the knowledge base.")
+    parser.add_argument("paths", nargs="+", type=Path, help="Files or directories to ingest")
+    parser.add_argument("--topic", help="Topic stored on every chunk (CSV 'topic' column wins)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Chunks per embedding/upsert batch")
+    parser.add_argument(
+        "--progress-file",
+        type=Path,
+        default=Path(settings.INGEST_PROGRESS_FILE),
+        help="JSON file recording ingested files (re-runs skip unchanged files)",
+    )
+    asyncio.run(_main(parser.parse_args()))
@@ -1,28 +1,77 @@
 # src/services/knowledge.py
 """Knowledge retrieval service using SerpAPI."""
 
-from serpapi import SerpApiClient
+import asyncio
+from typing import Any
 
+from src.core.cache import AsyncSingleFlight
 from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.search_cache import SearchCache, cache_key, get_search_cache, ttl_for
+from src.services.search_provider import get_search_provider
 
+logger = get_logger("knowledge")
 
-def google_search(query: str, num_results: int = 1) -> str:
+_flights = AsyncSingleFlight()
+# Background revalidation tasks of stale entries (references kept until done)
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+# SearchCache is synchronous SQLite (WAL writes, busy timeout): its calls run on worker threads
+
+
+async def _get_cache() -> SearchCache | None:
+    if not settings.SERPAPI_CACHE_ENABLED:
+        return None
+    return await asyncio.to_thread(get_search_cache)
+
+
+async def _fetch_and_store(cache: SearchCache, query: str, gl: str, hl: str, key: str) -> list[dict[str, Any]]:
+    organic_results = await get_search_provider().search(query, gl, hl)
+    await asyncio.to_thread(cache.set, key, query, organic_results, ttl_for(query))
+    return organic_results
+
+
+async def _revalidate(cache: SearchCache, query: str, gl: str, hl: str, key: str) -> None:
+    try:
+        await _flights.do(key, lambda: _fetch_and_store(cache, query, gl, hl, key))
+    except Exception as e:
+        logger.warning("Search revalidation failed", extra={"query": query, "error": str(e)})
+
+
+async def search_organic_results(query: str, gl: str | None = None, hl: str | None = None) -> list[dict[str, Any]]:
+    """
+    Raw organic results for ``query``, served from the persistent cache when possible.
+
+    Stale entries are returned immediately and refreshed in the background;
+    concurrent misses for the same query share one upstream call.
+    """
+    gl = gl or settings.SERPAPI_GL
+    hl = hl or settings.SERPAPI_HL
+    cache = await _get_cache()
+    if cache is None:
+        return await get_search_provider().search(query, gl, hl)
+
+    key = cache_key(query, gl, hl)
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        organic_results, stale = cached
+        if stale and key not in _refreshing:
+            task = asyncio.create_task(_revalidate(cache, query, gl, hl, key))
+            _refreshing[key] = task
+            task.add_done_callback(lambda _: _refreshing.pop(key, None))
+        return organic_results
+
+    return await _flights.do(key, lambda: _fetch_and_store(cache, query, gl, hl, key))
+
+
+async def google_search(query: str, num_results: int = 1) -> str:
     """
     Perform Google search using SerpAPI.
     Returns concatenated snippets from organic results.
     """
     try:
-        params = {
-            "q": query,
-            "api_key": settings.SERPAPI_API_KEY,
-            "engine": "google",
-            "gl": "it",
-            "hl": "it",
-        }
-        client = SerpApiClient(params)
-        results = client.get_dict()
-
-        organic_results = results.get("organic_results", [])
+        organic_results = await search_organic_results(query)
         snippets = [
             item.get("snippet", "")
             for item in organic_results[:num_results]
@@ -35,5 +84,13 @@ def google_search(query: str, num_results: int = 1) -> str:
         return " ".join(snippets).replace("\n", " ")
 
     except Exception as e:
-        print(f"SerpAPI search error: {e}")
+        logger.error("SerpAPI search error", extra={"query": query, "error": str(e)})
         return "No information found due to an error."
+
+
+async def search_cache_stats() -> dict[str, Any]:
+    """Persistent cache counters plus request coalescing stats."""
+    cache = await _get_cache()
+    if cache is None:
+        return {"enabled": False, "single_flight": _flights.stats()}
+    return {**await asyncio.to_thread(cache.stats), "single_flight": _flights.stats()}
@@ -2,8 +2,55 @@
 """Ollama LLM service."""
 
 import httpx
+import numpy as np
 
 from src.core.config import settings
+from src.core.context_manager import text_tokens
+from src.services.embedding_cache import embedding_cache
+
+# Process-wide pooled client (HTTP keep-alive), created lazily and closed in lifespan
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Ollama HTTP client."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=settings.OLLAMA_BASE_URL,
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.OLLAMA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared Ollama HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def batch_texts(texts: list[str], max_batch: int, max_tokens: int) -> list[list[str]]:
+    """Split texts into batches of at most ``max_batch`` items and ~``max_tokens`` tokens.
+
+    A single text larger than ``max_tokens`` gets its own batch (Ollama truncates it).
+    """
+    batches: list[list[str]] = []
+    tokens = 0
+    for text in texts:
+        size = text_tokens(text)
+        if not batches or (batches[-1] and (len(batches[-1]) >= max_batch or tokens + size > max_tokens)):
+            batches.append([])
+            tokens = 0
+        batches[-1].append(text)
+        tokens += size
+    return batches
 
 
 class OllamaService:
@@ -16,18 +63,42 @@ class OllamaService:
 
     async def _make_request(self, endpoint: str, payload: dict) -> dict:
         """Make async request to Ollama API."""
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            response = await client.post(
-                f"{self.base_url}/api/{endpoint}", json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(f"{self.base_url}/api/{endpoint}", json=payload)
+        response.raise_for_status()
+        return response.json()
 
     async def create_embedding(self, text: str) -> list[float]:
-        """Create embedding for text."""
-        payload = {"model": self.embedding_model, "prompt": text}
-        response = await self._make_request("embeddings", payload)
-        return response.get("embedding", [])
+        """Create embedding for text (served from the embedding cache when possible)."""
+        matrix = await self.create_embeddings([text])
+        return matrix[0].tolist() if matrix.size else []
+
+    async def create_embeddings(self, texts: list[str]) -> np.ndarray:
+        """Embed many texts via ``/api/embed`` with array input.
+
+        Cached texts are skipped; the rest are sent in batches bounded by
+        ``EMBEDDING_BATCH_SIZE`` and ``EMBEDDING_BATCH_MAX_TOKENS``.
+
+        Returns:
+            C-contiguous float32 matrix of shape (len(texts), dim).
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        cached = await embedding_cache.get_many(self.embedding_model, texts)
+        # Embed each distinct missing text once
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached, strict=True) if v is None))
+        computed: dict[str, np.ndarray] = {}
+        for batch in batch_texts(missing, settings.EMBEDDING_BATCH_SIZE, settings.EMBEDDING_BATCH_MAX_TOKENS):
+            response = await self._make_request("embed", {"model": self.embedding_model, "input": batch})
+            vectors = np.asarray(response.get("embeddings", []), dtype=np.float32)
+            if vectors.ndim != 2 or len(vectors) != len(batch):
+                raise ValueError(f"Ollama returned {len(vectors)} embeddings for {len(batch)} inputs")
+            await embedding_cache.set_many(self.embedding_model, batch, vectors)
+            computed.update(zip(batch, vectors, strict=True))
+
+        rows = [vector if vector is not None else computed[text] for text, vector in zip(texts, cached, strict=True)]
+        return np.ascontiguousarray(np.vstack(rows), dtype=np.float32)
 
     async def generate(self, prompt: str, temperature: float = 0.7) -> str:
         """Generate text from prompt."""
@@ -0,0 +1,186 @@
+"""Cached market data access layer in front of yfinance."""
+
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pandas as pd
+import yfinance as yf
+
+from src.core.cache import SingleFlight, TTLCache
+from src.core.config import settings
+from src.services.ohlcv_store import get_ohlcv_store
+
+# Dataset TTLs (seconds)
+DATASET_TTLS: dict[str, int] = {
+    "info": settings.MARKET_CACHE_TTL_INFO,
+    "history": settings.MARKET_CACHE_TTL_HISTORY,
+    # yf.download frames (tz-naive index, own column layout): never mixed with per-ticker history
+    "history_batch": settings.MARKET_CACHE_TTL_HISTORY,
+    "dividends": settings.MARKET_CACHE_TTL_DIVIDENDS,
+    "news": settings.MARKET_CACHE_TTL_NEWS,
+    "calendar": settings.MARKET_CACHE_TTL_CALENDAR,
+    "earnings_history": settings.MARKET_CACHE_TTL_EARNINGS,
+}
+
+_MISSING = object()
+
+_cache = TTLCache(max_entries=settings.MARKET_CACHE_MAX_ENTRIES)
+_flights = SingleFlight()
+_stats_lock = threading.Lock()
+_dataset_stats: dict[str, dict[str, int]] = {name: {"hits": 0, "misses": 0} for name in DATASET_TTLS}
+
+
+def _normalize_ticker(ticker: str) -> str:
+    return ticker.strip().upper()
+
+
+def _cached(ticker: str, dataset: str, loader: Callable[[yf.Ticker], Any], period: str | None = None) -> Any:
+    """
+    Read-through lookup keyed by (ticker, dataset[, period]).
+    Concurrent misses for the same key share a single upstream fetch.
+    Values are shared between callers and must be treated as read-only.
+    """
+    symbol = _normalize_ticker(ticker)
+    key = (symbol, dataset, period)
+
+    value = _cache.get(key, _MISSING)
+    with _stats_lock:
+        _dataset_stats[dataset]["hits" if value is not _MISSING else "misses"] += 1
+    if value is not _MISSING:
+        return value
+
+    def fetch() -> Any:
+        # Re-check: a fetch for this key may have completed while we waited
+        cached = _cache.peek(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        fetched = loader(yf.Ticker(symbol))
+        _cache.set(key, fetched, ttl=DATASET_TTLS[dataset])
+        return fetched
+
+    return _flights.do(key, fetch)
+
+
+# --- Dataset accessors ---
+
+
+def get_info(ticker: str) -> dict[str, Any]:
+    """Get the ``Ticker.info`` blob."""
+    return _cached(ticker, "info", lambda stock: stock.info or {})
+
+
+def _load_history(stock: yf.Ticker, period: str) -> pd.DataFrame:
+    store = get_ohlcv_store() if settings.OHLCV_STORE_ENABLED else None
+    if store is None:
+        return stock.history(period=period)
+    return store.get_history(stock.ticker, period)
+
+
+def get_history(ticker: str, period: str = "1mo") -> pd.DataFrame:
+    """Get OHLCV history for ``period`` (served from the local OHLCV store when enabled)."""
+    return _cached(ticker, "history", lambda stock: _load_history(stock, period), period=period)
+
+
+def get_dividends(ticker: str) -> pd.Series:
+    """Get the dividend history."""
+    return _cached(ticker, "dividends", lambda stock: stock.dividends)
+
+
+def get_news(ticker: str) -> list[dict[str, Any]]:
+    """Get recent news items."""
+    return _cached(ticker, "news", lambda stock: stock.news or [])
+
+
+def get_calendar(ticker: str) -> dict[str, Any]:
+    """Get the earnings/dividend calendar."""
+    return _cached(ticker, "calendar", lambda stock: stock.calendar or {})
+
+
+def get_earnings_history(ticker: str) -> pd.DataFrame | None:
+    """Get the EPS estimate/actual history."""
+    return _cached(ticker, "earnings_history", lambda stock: stock.earnings_history)
+
+
+# --- Batched accessors ---
+
+
+def _unique_symbols(tickers: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(_normalize_ticker(t) for t in tickers))
+
+
+def get_info_batch(tickers: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """
+    Get ``info`` for several tickers concurrently on a bounded worker pool.
+    Failed lookups map to an empty dict.
+    """
+    symbols = _unique_symbols(tickers)
+    if not symbols:
+        return {}
+
+    def load(symbol: str) -> dict[str, Any]:
+        try:
+            return get_info(symbol)
+        except Exception:
+            return {}
+
+    workers = min(settings.MARKET_DATA_MAX_WORKERS, len(symbols))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="market-data") as pool:
+        return dict(zip(symbols, pool.map(load, symbols), strict=True))
+
+
+def get_history_batch(tickers: Iterable[str], period: str = "1mo") -> dict[str, pd.DataFrame]:
+    """
+    Get OHLCV history for several tickers.
+    Cache misses are fetched with a single multi-ticker ``yf.download`` call
+    and cached per ticker under their own dataset, separate from ``get_history``.
+    """
+    symbols = _unique_symbols(tickers)
+    result: dict[str, pd.DataFrame] = {}
+    missing = []
+    for symbol in symbols:
+        cached = _cache.get((symbol, "history_batch", period), _MISSING)
+        with _stats_lock:
+            _dataset_stats["history_batch"]["hits" if cached is not _MISSING else "misses"] += 1
+        if cached is _MISSING:
+            missing.append(symbol)
+        else:
+            result[symbol] = cached
+
+    if missing:
+        frame = yf.download(
+            missing,
+            period=period,
+            group_by="ticker",
+            actions=True,
+            threads=min(settings.MARKET_DATA_MAX_WORKERS, len(missing)),
+            progress=False,
+        )
+        for symbol in missing:
+            if frame is None or frame.empty:
+                hist = pd.DataFrame()
+            elif isinstance(frame.columns, pd.MultiIndex):
+                hist = frame[symbol] if symbol in frame.columns.get_level_values(0) else pd.DataFrame()
+            else:
+                hist = frame
+            hist = hist.dropna(how="all")
+            _cache.set((symbol, "history_batch", period), hist, ttl=DATASET_TTLS["history_batch"])
+            result[symbol] = hist
+
+    return {symbol: result[symbol] for symbol in symbols}
+
+
+# --- Monitoring ---
+
+
+def cache_stats() -> dict[str, Any]:
+    """Return global and per-dataset hit/miss counters."""
+    with _stats_lock:
+        datasets = {name: dict(counters) for name, counters in _dataset_stats.items()}
+    return {**_cache.stats(), "single_flight": _flights.stats(), "datasets": datasets}
+
+
+def clear_cache() -> None:
+    """Drop all cached market data."""
+    _cache.clear()
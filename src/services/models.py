@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, Text, func
 from sqlalchemy.orm import declarative_base, relationship
 
 # 1. Declarative Base
@@ -27,3 +27,13 @@ class Message(Base):
     content = Column(Text)
     timestamp = Column(DateTime, server_default=func.now(), nullable=False)
     conversation = relationship("Conversation", back_populates="messages")
+
+
+# Cache persistente degli embedding (vettori float32 serializzati)
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+    model = Column(String, primary_key=True)
+    text_hash = Column(String(64), primary_key=True)  # sha256 del testo normalizzato
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,247 @@
+"""Local incremental OHLCV history store (SQLite) with delta refresh from yfinance."""
+
+import contextlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger("ohlcv_store")
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+# Calendar-based periods -> offset back from today
+_PERIOD_OFFSETS: dict[str, pd.DateOffset] = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+# Bar-count periods -> (number of bars, calendar days that surely contain them)
+_PERIOD_BARS: dict[str, tuple[int, int]] = {
+    "1d": (1, 10),
+    "5d": (5, 14),
+}
+
+SUPPORTED_PERIODS = {*_PERIOD_OFFSETS, *_PERIOD_BARS, "ytd", "max"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    dividends REAL, splits REAL,
+    PRIMARY KEY (ticker, date)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT PRIMARY KEY,
+    covered_from TEXT,          -- earliest date known to be complete (NULL = full history)
+    last_date TEXT NOT NULL,    -- last stored bar
+    refreshed_at REAL NOT NULL  -- epoch seconds of the last upstream fetch
+);
+"""
+
+
+def period_start(period: str, today: pd.Timestamp | None = None) -> pd.Timestamp | None:
+    """First calendar date needed to serve ``period`` (None for "max")."""
+    today = (today or pd.Timestamp.today()).normalize()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return today.replace(month=1, day=1)
+    if period in _PERIOD_BARS:
+        return today - pd.Timedelta(days=_PERIOD_BARS[period][1])
+    return today - _PERIOD_OFFSETS[period]
+
+
+class OHLCVStore:
+    """
+    Per-ticker daily OHLCV store.
+
+    The first request for a ticker downloads the requested range; later
+    requests only fetch the tail since the last stored bar (at most once per
+    ``refresh_interval`` seconds) and serve any period by slicing local data.
+    Bars are split/dividend adjusted upstream, so a tail containing a new
+    corporate action replaces the stored range with a fresh download.
+    """
+
+    def __init__(self, path: str | Path, refresh_interval: int = 60):
+        self.path = Path(path)
+        self.refresh_interval = refresh_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived connection: commits on success and always closes."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Public API ---
+
+    def get_history(self, ticker: str, period: str = "1mo") -> pd.DataFrame:
+        """Return daily bars for ``period``, refreshing from upstream only as needed."""
+        ticker = ticker.strip().upper()
+        if period not in SUPPORTED_PERIODS:
+            return yf.Ticker(ticker).history(period=period)
+
+        start = period_start(period)
+        coverage = self._coverage(ticker)
+
+        stale = coverage is not None and time.time() - coverage[2] >= self.refresh_interval
+        if coverage is None or self._needs_backfill(coverage[0], start) or (stale and not coverage[1]):
+            self._store(ticker, self._fetch(ticker, start=start), covered_from=start)
+        elif stale:
+            # Re-fetch from the last stored bar (inclusive): it may have been partial
+            tail = self._fetch(ticker, start=coverage[1])
+            if self._has_corporate_action(tail, after=coverage[1]):
+                covered_from = None if coverage[0] is None else pd.Timestamp(coverage[0])
+                logger.info("Corporate action in new bars, refetching history", extra={"ticker": ticker})
+                self._store(ticker, self._fetch(ticker, start=covered_from), covered_from=covered_from, replace=True)
+            else:
+                self._store(ticker, tail, covered_from=None, delta=True)
+
+        frame = self._load(ticker, start)
+        if period in _PERIOD_BARS:
+            frame = frame.tail(_PERIOD_BARS[period][0])
+        return frame
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop all stored bars for ``ticker``."""
+        ticker = ticker.strip().upper()
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+            conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+
+    # --- Internals ---
+
+    @staticmethod
+    def _needs_backfill(covered_from: str | None, start: pd.Timestamp | None) -> bool:
+        if covered_from is None:
+            return False  # full history already stored
+        if start is None:
+            return True  # "max" requested
+        return start.strftime("%Y-%m-%d") < covered_from
+
+    @staticmethod
+    def _has_corporate_action(frame: pd.DataFrame | None, after: str) -> bool:
+        """True if a bar newer than ``after`` carries a split or dividend (older bars need re-adjusting)."""
+        if frame is None or frame.empty:
+            return False
+        new = frame[frame.index.strftime("%Y-%m-%d") > after]
+        actions = new.reindex(columns=["Dividends", "Stock Splits"]).fillna(0.0)
+        return bool((actions != 0).to_numpy().any())
+
+    def _coverage(self, ticker: str) -> tuple[str | None, str, float] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT covered_from, last_date, refreshed_at FROM coverage WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        return row
+
+    @staticmethod
+    def _fetch(ticker: str, start: pd.Timestamp | str | None) -> pd.DataFrame:
+        """Fetch daily bars from ``start`` (inclusive) to today; full history if None."""
+        stock = yf.Ticker(ticker)
+        if start is None:
+            return stock.history(period="max")
+        if isinstance(start, pd.Timestamp):
+            start = start.strftime("%Y-%m-%d")
+        return stock.history(start=start)
+
+    def _store(
+        self,
+        ticker: str,
+        frame: pd.DataFrame,
+        covered_from: pd.Timestamp | None,
+        delta: bool = False,
+        replace: bool = False,
+    ) -> None:
+        rows = []
+        if frame is not None and not frame.empty:
+            frame = frame.reindex(columns=COLUMNS)
+            dates = frame.index.strftime("%Y-%m-%d")
+            rows = [
+                (ticker, date, *(None if pd.isna(v) else float(v) for v in values))
+                for date, values in zip(dates, frame.itertuples(index=False, name=None), strict=True)
+            ]
+
+        with self._write_lock, self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+                conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            last_date = conn.execute("SELECT MAX(date) FROM bars WHERE ticker = ?", (ticker,)).fetchone()[0]
+            if last_date is None:
+                # Nothing upstream (unknown ticker / no data): retried after refresh_interval
+                last_date = ""
+            if delta:
+                conn.execute(
+                    "UPDATE coverage SET last_date = ?, refreshed_at = ? WHERE ticker = ?",
+                    (last_date, time.time(), ticker),
+                )
+            else:
+                existing = conn.execute("SELECT covered_from FROM coverage WHERE ticker = ?", (ticker,)).fetchone()
+                new_from = None if covered_from is None else covered_from.strftime("%Y-%m-%d")
+                if existing is not None and existing[0] is not None and new_from is not None:
+                    new_from = min(existing[0], new_from)
+                elif existing is not None and existing[0] is None:
+                    new_from = None
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)",
+                    (ticker, new_from, last_date, time.time()),
+                )
+        logger.debug("OHLCV stored", extra={"ticker": ticker, "bars": len(rows), "delta": delta})
+
+    def _load(self, ticker: str, start: pd.Timestamp | None) -> pd.DataFrame:
+        query = "SELECT date, open, high, low, close, volume, dividends, splits FROM bars WHERE ticker = ?"
+        params: list = [ticker]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.strftime("%Y-%m-%d"))
+        query += " ORDER BY date"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        frame = pd.DataFrame([row[1:] for row in rows], columns=COLUMNS, dtype="float64")
+        frame.index = pd.DatetimeIndex([row[0] for row in rows], name="Date")
+        return frame
+
+
+_store: OHLCVStore | None = None
+_store_failed = False
+_store_lock = threading.Lock()
+
+
+def get_ohlcv_store() -> OHLCVStore | None:
+    """Get the process-wide OHLCV store; None if it can't be opened (e.g. read-only filesystem)."""
+    global _store, _store_failed
+    if _store is None and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                try:
+                    _store = OHLCVStore(settings.OHLCV_STORE_PATH, settings.OHLCV_REFRESH_INTERVAL)
+                except (OSError, sqlite3.Error) as e:
+                    _store_failed = True
+                    logger.warning(
+                        "OHLCV store unavailable, fetching history directly",
+                        extra={"path": settings.OHLCV_STORE_PATH, "error": str(e)},
+                    )
+    return _store
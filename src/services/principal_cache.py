@@ -0,0 +1,76 @@
+# src/services/principal_cache.py
+"""Short-TTL cache of the authorization-relevant fields of a user (one query per user per TTL)."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.services.auth_models import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by authorization checks (no password hash, no ORM state)."""
+
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    email_verified: bool
+
+    @property
+    def is_sysadmin(self) -> bool:
+        """Check if user is a system administrator."""
+        return self.role == UserRole.SYSADMIN.value
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is an admin or sysadmin."""
+        return self.role in (UserRole.ADMIN.value, UserRole.SYSADMIN.value)
+
+
+# Changes made by this process invalidate immediately; other workers see them within the TTL
+_cache = TTLCache(max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES, default_ttl=settings.PRINCIPAL_CACHE_TTL)
+
+
+async def get_principal(session: AsyncSession, user_id: int) -> Principal | None:
+    """Cached principal for ``user_id``; None if the user does not exist (not cached)."""
+    principal = _cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await session.execute(
+        select(User.id, User.username, User.role, User.is_active, User.email_verified).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    principal = Principal(
+        id=row.id,
+        username=row.username,
+        role=row.role,
+        is_active=row.is_active,
+        email_verified=row.email_verified,
+    )
+    if settings.PRINCIPAL_CACHE_TTL > 0:
+        _cache.set(user_id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop the cached principal after the user row changed."""
+    _cache.invalidate(user_id)
+
+
+def clear_principal_cache() -> None:
+    """Drop every cached principal."""
+    _cache.clear()
+
+
+def principal_cache_stats() -> dict[str, Any]:
+    """Size and hit rate of the principal cache."""
+    return {**_cache.stats(), "ttl_s": settings.PRINCIPAL_CACHE_TTL}
@@ -0,0 +1,226 @@
+# src/services/revocation_cache.py
+"""Per-process token revocation cache: Bloom filter of blacklisted JTIs synced from token_blacklist."""
+
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.auth_models import TokenBlacklist
+from src.services.database import AsyncSessionLocal
+
+logger = get_logger("revocation_cache")
+
+# Rows are re-read this far behind the watermark: blacklisted_at is the inserting
+# transaction's start time, so a slow commit can land "in the past"
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives, tunable false-positive rate)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            new = new or not self._bits[position >> 3] & mask
+            self._bits[position >> 3] |= mask
+        # Approximate distinct count: re-adding a (probably) present item doesn't count
+        self.count += new
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationCache:
+    """
+    Answers "is this JTI revoked?" without a DB round-trip for the common case.
+
+    A Bloom filter holds the JTIs of unexpired blacklist rows. A negative is
+    final; a positive is confirmed with one indexed lookup (false positives
+    are rare). The filter is refreshed incrementally by ``blacklisted_at``
+    watermark every ``sync_interval`` seconds (inline on the first stale
+    check, or by the maintenance task), so revocations made by other
+    processes are visible within that interval; revocations made by this
+    process are visible immediately. Until a sync succeeds, and whenever the
+    filter is more than three intervals stale, every check goes to the DB.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._watermark: datetime | None = None
+        self._synced_at: float | None = None
+        self._syncing = False
+        self._added_during_rebuild: list[str] | None = None
+        self.checks = 0
+        self.filter_negatives = 0
+        self.db_checks = 0
+        self.false_positives = 0
+
+    def add(self, jti: str) -> None:
+        """Record a revocation made by this process."""
+        self._bloom.add(jti)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(jti)
+
+    def _age(self) -> float:
+        return math.inf if self._synced_at is None else time.monotonic() - self._synced_at
+
+    async def sync(self, session: AsyncSession, full: bool = False) -> int:
+        """Load blacklist rows newer than the watermark; ``full`` rebuilds from all unexpired rows."""
+        rebuild = full or self._watermark is None
+        if not rebuild:
+            rows = await self._load(session, self._watermark - SYNC_OVERLAP)
+            for jti, _ in rows:
+                self._bloom.add(jti)
+        else:
+            self._added_during_rebuild = []
+            try:
+                rows = await self._load(session, None)
+                bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+                for jti in [jti for jti, _ in rows] + self._added_during_rebuild:
+                    bloom.add(jti)
+                self._bloom = bloom
+            finally:
+                self._added_during_rebuild = None
+
+        newest = max((blacklisted_at for _, blacklisted_at in rows), default=None)
+        if newest is not None and (self._watermark is None or newest > self._watermark):
+            self._watermark = newest
+        elif self._watermark is None:
+            self._watermark = datetime.now(timezone.utc)
+        self._synced_at = time.monotonic()
+        return len(rows)
+
+    async def is_revoked(self, session: AsyncSession, jti: str) -> bool:
+        """True if ``jti`` is blacklisted (DB lookup only on a filter hit or a stale filter)."""
+        self.checks += 1
+        if self._age() >= self.sync_interval and not self._syncing:
+            self._syncing = True
+            try:
+                await self.sync(session)
+            except Exception as e:
+                logger.warning("Revocation cache sync failed", extra={"error": str(e)})
+            finally:
+                self._syncing = False
+
+        if self._age() < 3 * self.sync_interval and jti not in self._bloom:
+            self.filter_negatives += 1
+            return False
+        self.db_checks += 1
+        revoked = await self._exists(session, jti)
+        if not revoked and jti in self._bloom:
+            self.false_positives += 1
+        return revoked
+
+    @staticmethod
+    async def _load(session: AsyncSession, since: datetime | None) -> list[tuple[str, datetime]]:
+        query = select(TokenBlacklist.token_jti, TokenBlacklist.blacklisted_at).where(
+            TokenBlacklist.expires_at > datetime.now(timezone.utc)
+        )
+        if since is not None:
+            query = query.where(TokenBlacklist.blacklisted_at >= since)
+        result = await session.execute(query)
+        return [(jti, blacklisted_at) for jti, blacklisted_at in result.all()]
+
+    @staticmethod
+    async def _exists(session: AsyncSession, jti: str) -> bool:
+        result = await session.execute(select(TokenBlacklist.id).where(TokenBlacklist.token_jti == jti).limit(1))
+        return result.first() is not None
+
+    def stats(self) -> dict[str, Any]:
+        """Filter size and how many checks the filter answered without the DB."""
+        return {
+            "entries": self._bloom.count,
+            "capacity": self._bloom.capacity,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "sync_age_s": None if self._synced_at is None else round(self._age(), 2),
+            "checks": self.checks,
+            "filter_negatives": self.filter_negatives,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+            "db_avoided_rate": round(self.filter_negatives / self.checks, 4) if self.checks else 0.0,
+        }
+
+
+async def purge_expired(session: AsyncSession) -> int:
+    """Delete expired blacklist rows. Returns the number removed."""
+    now = datetime.now(timezone.utc)
+    result = await session.execute(delete(TokenBlacklist).where(TokenBlacklist.expires_at < now))
+    await session.commit()
+    return result.rowcount
+
+
+revocation_cache = RevocationCache(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_INTERVAL,
+)
+
+_maintenance_task: asyncio.Task | None = None
+
+
+async def _maintenance_loop() -> None:
+    last_purge = time.monotonic()
+    while True:
+        await asyncio.sleep(revocation_cache.sync_interval)
+        try:
+            async with AsyncSessionLocal() as session:
+                if time.monotonic() - last_purge >= settings.REVOCATION_PURGE_INTERVAL:
+                    removed = await purge_expired(session)
+                    # Bloom filters can't delete: rebuild from the remaining rows
+                    await revocation_cache.sync(session, full=True)
+                    last_purge = time.monotonic()
+                    logger.info("Expired blacklist entries purged", extra={"removed": removed})
+                else:
+                    await revocation_cache.sync(session)
+        except Exception as e:
+            logger.warning("Revocation maintenance failed", extra={"error": str(e)})
+
+
+async def start_revocation_maintenance() -> None:
+    """Initial full sync and background sync/purge task (started in lifespan)."""
+    global _maintenance_task
+    try:
+        async with AsyncSessionLocal() as session:
+            loaded = await revocation_cache.sync(session, full=True)
+        logger.info("Revocation cache loaded", extra={"entries": loaded})
+    except Exception as e:
+        logger.warning("Revocation cache initial sync failed, checks fall back to DB", extra={"error": str(e)})
+    if _maintenance_task is None or _maintenance_task.done():
+        _maintenance_task = asyncio.create_task(_maintenance_loop())
+
+
+async def stop_revocation_maintenance() -> None:
+    """Cancel the background task."""
+    global _maintenance_task
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        try:
+            await _maintenance_task
+        except asyncio.CancelledError:
+            pass
+        _maintenance_task = None
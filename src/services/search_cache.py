@@ -0,0 +1,152 @@
+"""Persistent web search result cache (SQLite) with query normalization and stale-while-revalidate."""
+
+import contextlib
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.embedding_cache import normalize_text
+
+logger = get_logger("search_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_results (
+    key TEXT PRIMARY KEY,       -- sha256 of (normalized query, gl, hl)
+    query TEXT NOT NULL,        -- normalized query, for inspection
+    organic_results TEXT NOT NULL,
+    fetched_at REAL NOT NULL,   -- epoch seconds
+    ttl REAL NOT NULL
+);
+"""
+
+# Queries about recent events expire quickly; definitions and concepts can be kept for days
+_TIME_SENSITIVE = re.compile(
+    r"\b(news|notizie|ultime|latest|oggi|today|ieri|yesterday|breaking|settimana|week|adesso|now|"
+    r"prezzo|price|quotazione|earnings|trimestrale|risultati|guidance|dividendo|dividend|20\d\d)\b"
+)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical query form: NFKC, case-folded, collapsed whitespace, no trailing punctuation."""
+    return normalize_text(query).strip(" ?!.;:")
+
+
+def cache_key(query: str, gl: str, hl: str) -> str:
+    """Cache key for a normalized query and SerpAPI locale."""
+    return hashlib.sha256(f"{normalize_query(query)}\x1f{gl}\x1f{hl}".encode("utf-8")).hexdigest()
+
+
+def ttl_for(query: str) -> int:
+    """TTL in seconds: short for news-like queries, long for evergreen ones."""
+    if _TIME_SENSITIVE.search(normalize_query(query)):
+        return settings.SERPAPI_CACHE_TTL_NEWS
+    return settings.SERPAPI_CACHE_TTL_EVERGREEN
+
+
+class SearchCache:
+    """
+    Raw ``organic_results`` per (normalized query, gl, hl).
+
+    Results are stored unsliced, so callers can ask for any number of
+    results without refetching. An entry is fresh for its TTL and stale (still
+    served while a refresh runs) for one more TTL; after that it is a miss.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived connection: commits on success and always closes."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> tuple[list[dict[str, Any]], bool] | None:
+        """Return ``(organic_results, is_stale)`` or None on miss."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT organic_results, fetched_at, ttl FROM search_results WHERE key = ?", (key,)
+            ).fetchone()
+        age = time.time() - row[1] if row is not None else None
+        with self._stats_lock:
+            if row is None or age >= 2 * row[2]:
+                self.misses += 1
+                return None
+            stale = age >= row[2]
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]), stale
+
+    def set(self, key: str, query: str, organic_results: list[dict[str, Any]], ttl: int) -> None:
+        """Store results and drop entries past their stale window."""
+        now = time.time()
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?)",
+                (key, normalize_query(query), json.dumps(organic_results, ensure_ascii=False), now, ttl),
+            )
+            conn.execute("DELETE FROM search_results WHERE fetched_at + 2 * ttl < ?", (now,))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM search_results")
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and fresh/stale/miss counters."""
+        with self._connect() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+        with self._stats_lock:
+            hits, stale_hits, misses = self.hits, self.stale_hits, self.misses
+        lookups = hits + stale_hits + misses
+        return {
+            "size": size,
+            "hits": hits,
+            "stale_hits": stale_hits,
+            "misses": misses,
+            "hit_rate": round((hits + stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache: SearchCache | None = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache | None:
+    """Get the process-wide search cache; None if it can't be opened (e.g. read-only filesystem)."""
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = SearchCache(settings.SERPAPI_CACHE_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    _cache_failed = True
+                    logger.warning(
+                        "Search cache unavailable, searching without cache",
+                        extra={"path": settings.SERPAPI_CACHE_PATH, "error": str(e)},
+                    )
+    return _cache
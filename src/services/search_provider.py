@@ -0,0 +1,134 @@
+# src/services/search_provider.py
+"""Async web search providers (httpx) with a shared pooled client and jittered retries."""
+
+import asyncio
+import random
+from typing import Any, Protocol
+
+import httpx
+
+from src.core.config import settings
+from src.core.exceptions import ExternalServiceError
+from src.core.logging import get_logger
+
+logger = get_logger("search_provider")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SearchProvider(Protocol):
+    """A web search backend returning SerpAPI-shaped ``organic_results``."""
+
+    async def search(self, query: str, gl: str, hl: str) -> list[dict[str, Any]]: ...
+
+
+# Process-wide pooled client (HTTP keep-alive), created lazily and closed in lifespan
+_client: httpx.AsyncClient | None = None
+
+
+def get_search_http_client() -> httpx.AsyncClient:
+    """Get the shared web search HTTP client."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=settings.SERPAPI_BASE_URL,
+            timeout=httpx.Timeout(settings.SERPAPI_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SERPAPI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SERPAPI_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_search_http_client() -> None:
+    """Close the shared web search HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class SerpApiProvider:
+    """SerpAPI Google engine over ``GET /search.json``.
+
+    Timeouts, transport errors and 429/5xx responses are retried up to
+    ``max_retries`` times with jittered backoff; other errors fail fast.
+    ``base_url`` (``SERPAPI_BASE_URL``) can point at a local stand-in server.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_retries: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+    ):
+        self._client = client
+        self.max_retries = settings.SERPAPI_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = settings.SERPAPI_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = settings.SERPAPI_BACKOFF_MAX if backoff_max is None else backoff_max
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_search_http_client()
+
+    async def search(self, query: str, gl: str, hl: str) -> list[dict[str, Any]]:
+        params = {
+            "q": query,
+            "api_key": settings.SERPAPI_API_KEY,
+            "engine": "google",
+            "gl": gl,
+            "hl": hl,
+        }
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.get("/search.json", params=params)
+            except httpx.TransportError as e:  # includes timeouts
+                if attempt >= self.max_retries:
+                    raise ExternalServiceError("serpapi", f"Search request failed: {e!r}") from e
+                logger.warning("Search request failed, retrying", extra={"attempt": attempt + 1, "error": repr(e)})
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return self._organic_results(response)
+                logger.warning(
+                    "Search request throttled/failed, retrying",
+                    extra={"attempt": attempt + 1, "status_code": response.status_code},
+                )
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+            attempt += 1
+
+    @staticmethod
+    def _organic_results(response: httpx.Response) -> list[dict[str, Any]]:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        # A 200 with "error" means no results; HTTP errors are quota/key/upstream failures
+        if response.is_error:
+            message = body.get("error") or f"HTTP {response.status_code}"
+            raise ExternalServiceError("serpapi", message, details={"status_code": response.status_code})
+        return body.get("organic_results", [])
+
+
+_provider: SearchProvider | None = None
+
+
+def get_search_provider() -> SearchProvider:
+    """Get the active web search provider (SerpAPI unless overridden)."""
+    global _provider
+    if _provider is None:
+        _provider = SerpApiProvider()
+    return _provider
+
+
+def set_search_provider(provider: SearchProvider | None) -> None:
+    """Install a different provider (None restores the default on next use)."""
+    global _provider
+    _provider = provider
@@ -0,0 +1,70 @@
+# src/services/sparse.py
+"""Local BM25-style sparse vectors for hybrid retrieval.
+
+Documents get BM25 term-frequency weights; IDF is applied server-side by
+Qdrant (``Modifier.IDF`` on the sparse vector), so queries only carry the
+term indices. Tokenization keeps tickers and financial acronyms whole
+("ENEL.MI", "EV/EBITDA", "S&P") and also indexes their parts.
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import Counter
+
+from qdrant_client import models
+
+# BM25 parameters; AVG_DOC_TOKENS approximates an ingestion chunk (~1200 characters)
+BM25_K1 = 1.2
+BM25_B = 0.75
+AVG_DOC_TOKENS = 200
+
+_TOKEN = re.compile(r"[^\W_]+(?:[./&\-][^\W_]+)*")
+_PARTS = re.compile(r"[./&\-]")
+
+STOPWORDS = frozenset(
+    # English
+    "a an and are as at be by for from has in is it of on or that the to was were with "
+    # Italian
+    "ai al alla alle agli che con da dal dei del della delle di e gli ha il in la le lo "
+    "nei nel nella per più si sono su sul sulla tra un una uno".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased terms; compound tokens are kept whole and also split into parts."""
+    terms = []
+    for token in _TOKEN.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        if _PARTS.search(token):
+            terms.extend(part for part in _PARTS.split(token) if part and part not in STOPWORDS)
+    return terms
+
+
+def term_index(term: str) -> int:
+    """Stable 32-bit term id (Qdrant sparse indices are uint32)."""
+    return zlib.crc32(term.encode("utf-8"))
+
+
+def _sparse(weights: dict[int, float]) -> models.SparseVector:
+    indices = sorted(weights)
+    return models.SparseVector(indices=indices, values=[weights[i] for i in indices])
+
+
+def document_vector(text: str) -> models.SparseVector:
+    """BM25 term-frequency weights of a document (IDF is applied by Qdrant)."""
+    terms = tokenize(text)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / AVG_DOC_TOKENS)
+    weights: dict[int, float] = {}
+    for term, tf in Counter(terms).items():
+        index = term_index(term)
+        # Hash collisions are rare; merge them by summing
+        weights[index] = weights.get(index, 0.0) + tf * (BM25_K1 + 1) / (tf + norm)
+    return _sparse(weights)
+
+
+def query_vector(text: str) -> models.SparseVector:
+    """Binary query vector over the distinct query terms."""
+    return _sparse({term_index(term): 1.0 for term in tokenize(text)})
@@ -1,57 +1,434 @@
 # src/services/vector_store.py
 """Qdrant vector store service."""
 
-from qdrant_client import QdrantClient, models
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
 
 from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.sparse import document_vector, query_vector
+
+logger = get_logger("vector_store")
+
+# Payload fields indexed for filtered retrieval
+PAYLOAD_INDEXES = {
+    "user_id": models.PayloadSchemaType.INTEGER,
+    "topic": models.PayloadSchemaType.KEYWORD,
+    "created_at": models.PayloadSchemaType.DATETIME,
+}
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage/index layout of the dense vectors.
+
+    Layout fields apply when the collection is created; ``hnsw_ef`` and the
+    rescoring options are search-time and apply to every query.
+    """
+
+    name: str
+    on_disk: bool = False  # Original float32 vectors memory-mapped instead of in RAM
+    quantization: bool = False  # Scalar int8 copy (kept in RAM) used for the HNSW search
+    rescore: bool = True  # Re-rank quantized candidates with the original vectors
+    oversampling: float = 2.0  # Quantized candidates fetched per requested hit before rescoring
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef: int | None = None  # None = Qdrant default (limit-dependent)
+
+    def vector_params(self, size: int) -> models.VectorParams:
+        return models.VectorParams(size=size, distance=models.Distance.COSINE, on_disk=self.on_disk)
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self) -> models.ScalarQuantization | None:
+        if not self.quantization:
+            return None
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+
+    def search_params(self, hnsw_ef: int | None = None) -> models.SearchParams:
+        quantization = None
+        if self.quantization:
+            quantization = models.QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        return models.SearchParams(hnsw_ef=hnsw_ef or self.hnsw_ef, quantization=quantization)
+
+
+COLLECTION_PROFILES = {
+    # Qdrant defaults: float32 vectors and HNSW graph in RAM
+    "default": CollectionProfile(name="default"),
+    # int8 in RAM (~4x smaller), originals on disk only read for rescoring
+    "balanced": CollectionProfile(name="balanced", on_disk=True, quantization=True, hnsw_ef=128),
+    # Denser graph and wider search for recall-critical deployments
+    "high_recall": CollectionProfile(name="high_recall", hnsw_m=32, hnsw_ef_construct=256, hnsw_ef=256),
+    # Smallest footprint: int8 in RAM, no rescoring, lighter graph
+    "low_memory": CollectionProfile(
+        name="low_memory", on_disk=True, quantization=True, rescore=False, hnsw_m=8, hnsw_ef_construct=64
+    ),
+}
+
+
+def get_collection_profile(name: str) -> CollectionProfile:
+    """Profile by name (``KB_COLLECTION_PROFILE``)."""
+    try:
+        return COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile {name!r}; choose from {sorted(COLLECTION_PROFILES)}") from None
+
+
+def build_filter(
+    user_id: int | None = None,
+    topic: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> models.Filter | None:
+    """Qdrant payload filter from optional user/topic/date constraints (None if unfiltered)."""
+    conditions: list[models.Condition] = []
+    if user_id is not None:
+        conditions.append(models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id)))
+    if topic:
+        conditions.append(models.FieldCondition(key="topic", match=models.MatchValue(value=topic)))
+    if created_after is not None or created_before is not None:
+        conditions.append(
+            models.FieldCondition(
+                key="created_at",
+                range=models.DatetimeRange(gte=created_after, lte=created_before),
+            )
+        )
+    return models.Filter(must=conditions) if conditions else None
+
+
+def mmr_rerank(query: np.ndarray, candidates: np.ndarray, k: int, lambda_mult: float = 0.5) -> list[int]:
+    """Maximal Marginal Relevance: indices of ``k`` candidates balancing relevance and diversity.
+
+    ``lambda_mult`` = 1 ranks by relevance only, 0 by diversity only.
+    """
+    if len(candidates) == 0 or k <= 0:
+        return []
+    query = query / (np.linalg.norm(query) or 1.0)
+    norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+    candidates = candidates / np.where(norms == 0, 1.0, norms)
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of each candidate to anything already selected
+    redundancy = similarity[:, selected[0]].copy()
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        np.maximum(redundancy, similarity[:, best], out=redundancy)
+    return selected
+
+
+def _dense(vector: list[float] | dict[str, Any]) -> list[float]:
+    """Dense part of a returned point vector (named vectors come back as a dict)."""
+    return vector[""] if isinstance(vector, dict) else vector
+
+
+def _cosine(query: list[float], vectors: list[list[float]]) -> list[float]:
+    """Cosine similarity of ``query`` to each of ``vectors``."""
+    if not vectors:
+        return []
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1)
+    q = np.asarray(query, dtype=np.float32)
+    return (matrix @ q / (np.where(norms == 0, 1.0, norms) * (np.linalg.norm(q) or 1.0))).tolist()
 
 
 class VectorStoreService:
-    """Service for interacting with Qdrant vector database."""
+    """Service for interacting with Qdrant vector database (async client, gRPC when enabled)."""
 
     COLLECTION_NAME = "instagram_content_kb"
     VECTOR_SIZE = 768  # nomic-embed-text dimension
+    SPARSE_VECTOR_NAME = "bm25"
 
-    def __init__(self):
-        self.client = QdrantClient(
-            host=settings.QDRANT_HOST, port=settings.QDRANT_PORT
+    def __init__(self, client: AsyncQdrantClient | None = None, profile: CollectionProfile | None = None):
+        self.client = client or AsyncQdrantClient(
+            host=settings.QDRANT_HOST,
+            port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            timeout=settings.QDRANT_TIMEOUT,
         )
-        self._initialize_collection()
-
-    def _initialize_collection(self):
-        """Initialize collection if it doesn't exist."""
-        try:
-            self.client.get_collection(collection_name=self.COLLECTION_NAME)
-            print(f"-> Qdrant: Found collection '{self.COLLECTION_NAME}'")
-        except Exception:
-            print(f"-> Qdrant: Creating collection '{self.COLLECTION_NAME}'...")
-            self.client.create_collection(
+        self._initialized = False
+        self.hybrid = settings.KB_HYBRID_ENABLED
+        self.profile = profile or get_collection_profile(settings.KB_COLLECTION_PROFILE)
+        self._search_params = self.profile.search_params(settings.KB_HNSW_EF)
+
+    async def initialize(self) -> None:
+        """Create the collection if it doesn't exist (runs once per process)."""
+        if self._initialized:
+            return
+        if await self.client.collection_exists(collection_name=self.COLLECTION_NAME):
+            logger.info("Qdrant collection found", extra={"collection": self.COLLECTION_NAME})
+            info = await self.client.get_collection(collection_name=self.COLLECTION_NAME)
+            if self.hybrid and self.SPARSE_VECTOR_NAME not in (info.config.params.sparse_vectors or {}):
+                # Sparse vectors can't be added to an existing collection: recreate and re-ingest to enable
+                logger.warning(
+                    "Collection has no sparse vectors, hybrid retrieval disabled",
+                    extra={"collection": self.COLLECTION_NAME},
+                )
+                self.hybrid = False
+        else:
+            logger.info(
+                "Creating Qdrant collection",
+                extra={"collection": self.COLLECTION_NAME, "profile": self.profile.name},
+            )
+            await self.client.create_collection(
                 collection_name=self.COLLECTION_NAME,
-                vectors_config=models.VectorParams(
-                    size=self.VECTOR_SIZE, distance=models.Distance.COSINE
+                vectors_config=self.profile.vector_params(self.VECTOR_SIZE),
+                hnsw_config=self.profile.hnsw_config(),
+                quantization_config=self.profile.quantization_config(),
+                sparse_vectors_config=(
+                    {self.SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)}
+                    if self.hybrid
+                    else None
                 ),
             )
+        for field, schema in PAYLOAD_INDEXES.items():
+            await self.client.create_payload_index(
+                collection_name=self.COLLECTION_NAME, field_name=field, field_schema=schema
+            )
+        self._initialized = True
+
+    async def close(self) -> None:
+        """Close the underlying client connections."""
+        await self.client.close()
+
+    def point_vector(self, embedding: list[float], text: str) -> list[float] | dict[str, Any]:
+        """Vector(s) to store for ``text``: dense only, or dense + BM25 sparse when hybrid.
+
+        Call after ``initialize()``, which settles whether the collection is hybrid.
+        """
+        if not self.hybrid:
+            return embedding
+        return {"": embedding, self.SPARSE_VECTOR_NAME: document_vector(text)}
 
     async def add_context(
-        self, question_id: int, embedding: list[float], text: str
+        self,
+        question_id: str | int,
+        embedding: list[float],
+        text: str,
+        user_id: int | None = None,
+        topic: str | None = None,
     ):
         """Add a vectorized context to the collection."""
-        self.client.upsert(
+        await self.initialize()
+        payload: dict[str, Any] = {"text": text, "created_at": datetime.now(timezone.utc).isoformat()}
+        if user_id is not None:
+            payload["user_id"] = user_id
+        if topic:
+            payload["topic"] = topic
+        await self.client.upsert(
             collection_name=self.COLLECTION_NAME,
             points=[
                 models.PointStruct(
-                    id=question_id, vector=embedding, payload={"text": text}
+                    id=question_id, vector=self.point_vector(embedding, text), payload=payload
                 )
             ],
         )
 
-    async def search(self, query_embedding: list[float], limit: int = 1) -> str:
-        """Search for relevant contexts in the collection."""
-        hits = self.client.search(
+    async def upsert_points(self, points: list[models.PointStruct]) -> None:
+        """Upsert a batch of prepared points."""
+        await self.initialize()
+        await self.client.upsert(collection_name=self.COLLECTION_NAME, points=points)
+
+    async def existing_ids(self, ids: list[str | int]) -> set[str | int]:
+        """Subset of ``ids`` already stored in the collection."""
+        await self.initialize()
+        records = await self.client.retrieve(
+            collection_name=self.COLLECTION_NAME, ids=ids, with_payload=False, with_vectors=False
+        )
+        return {record.id for record in records}
+
+    async def write_deduplicated(
+        self,
+        point_id: str | int,
+        embedding: list[float],
+        text: str,
+        similarity_threshold: float,
+        user_id: int | None = None,
+        topic: str | None = None,
+    ) -> tuple[str | int, str]:
+        """Write a point unless the knowledge is already stored.
+
+        ``point_id`` should be derived from the content hash, so an exact
+        repeat only refreshes ``created_at``. Otherwise the nearest neighbour
+        (same user scope) at or above ``similarity_threshold`` is refreshed,
+        or replaced when the new text is longer (more complete).
+
+        Returns:
+            (point id, action) with action one of "created", "refreshed", "replaced".
+        """
+        await self.initialize()
+        now = datetime.now(timezone.utc).isoformat()
+        if await self.existing_ids([point_id]):
+            await self.client.set_payload(
+                collection_name=self.COLLECTION_NAME, payload={"created_at": now}, points=[point_id]
+            )
+            return point_id, "refreshed"
+
+        response = await self.client.query_points(
             collection_name=self.COLLECTION_NAME,
-            query_vector=query_embedding,
-            limit=limit,
+            query=embedding,
+            query_filter=build_filter(user_id=user_id),
+            limit=1,
+            score_threshold=similarity_threshold,
+            with_payload=True,
         )
+        if response.points:
+            nearest = response.points[0]
+            if len(text) <= len(nearest.payload.get("text", "")):
+                payload = {"created_at": now}
+                if topic and not nearest.payload.get("topic"):
+                    payload["topic"] = topic
+                await self.client.set_payload(
+                    collection_name=self.COLLECTION_NAME, payload=payload, points=[nearest.id]
+                )
+                return nearest.id, "refreshed"
+            payload = {**nearest.payload, "text": text, "created_at": now}
+            if topic:
+                payload["topic"] = topic
+            await self.upsert_points(
+                [models.PointStruct(id=nearest.id, vector=self.point_vector(embedding, text), payload=payload)]
+            )
+            return nearest.id, "replaced"
+
+        await self.add_context(point_id, embedding, text, user_id=user_id, topic=topic)
+        return point_id, "created"
+
+    async def query(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        query_text: str | None = None,
+        score_threshold: float | None = None,
+        mmr: bool = False,
+        mmr_lambda: float = 0.5,
+        fetch_k: int | None = None,
+        user_id: int | None = None,
+        topic: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Top-k retrieval with scores.
+
+        ``score`` is always the dense cosine similarity and hits below
+        ``score_threshold`` are dropped. With ``query_text`` on a hybrid
+        collection, dense and BM25 sparse candidates are ranked by reciprocal
+        rank fusion (also returned as ``rrf_score``); the threshold is applied
+        to the fused hits, so a keyword match alone can't bring in an
+        unrelated passage. With ``mmr`` the best ``fetch_k`` hits are
+        re-ranked for diversity and the first ``top_k`` are returned.
+        """
+        await self.initialize()
+        limit = max(fetch_k or top_k * settings.KB_MMR_FETCH_MULTIPLIER, top_k) if mmr else top_k
+        query_filter = build_filter(user_id, topic, created_after, created_before)
+        hybrid = self.hybrid and bool(query_text)
+        if hybrid:
+            prefetch_limit = max(limit, top_k * settings.KB_HYBRID_PREFETCH_MULTIPLIER)
+            response = await self.client.query_points(
+                collection_name=self.COLLECTION_NAME,
+                prefetch=[
+                    models.Prefetch(
+                        query=query_embedding,
+                        filter=query_filter,
+                        params=self._search_params,
+                        limit=prefetch_limit,
+                        score_threshold=score_threshold,
+                    ),
+                    models.Prefetch(
+                        query=query_vector(query_text),
+                        using=self.SPARSE_VECTOR_NAME,
+                        filter=query_filter,
+                        limit=prefetch_limit,
+                    ),
+                ],
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                limit=limit,
+                with_payload=True,
+                with_vectors=True,  # dense vectors rescore the fused hits
+            )
+        else:
+            response = await self.client.query_points(
+                collection_name=self.COLLECTION_NAME,
+                query=query_embedding,
+                query_filter=query_filter,
+                search_params=self._search_params,
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=True,
+                with_vectors=mmr,
+            )
+        points = response.points
+        if hybrid:
+            # RRF scores are rank-based: threshold and report the dense similarity instead
+            similarities = _cosine(query_embedding, [_dense(p.vector) for p in points])
+            hits = [
+                (point, similarity)
+                for point, similarity in zip(points, similarities, strict=True)
+                if score_threshold is None or similarity >= score_threshold
+            ]
+        else:
+            hits = [(point, point.score) for point in points]
+        if mmr and len(hits) > 1:
+            order = mmr_rerank(
+                np.asarray(query_embedding, dtype=np.float32),
+                np.asarray([_dense(point.vector) for point, _ in hits], dtype=np.float32),
+                top_k,
+                mmr_lambda,
+            )
+            hits = [hits[i] for i in order]
+
+        return [
+            {
+                "id": point.id,
+                "score": round(similarity, 4),
+                **({"rrf_score": round(point.score, 4)} if hybrid else {}),
+                "text": point.payload.get("text", ""),
+                **{key: point.payload[key] for key in ("topic", "created_at") if key in point.payload},
+            }
+            for point, similarity in hits[:top_k]
+        ]
+
+    async def search(self, query_embedding: list[float], limit: int = 1) -> str:
+        """Search for relevant contexts in the collection (text of the best hit)."""
+        hits = await self.query(query_embedding, top_k=limit)
         if hits:
-            return hits[0].payload.get("text", "")
+            return hits[0]["text"]
         return "No relevant context found."
+
+
+_vector_store: VectorStoreService | None = None
+
+
+def get_vector_store() -> VectorStoreService:
+    """Get the process-wide vector store service."""
+    global _vector_store
+    if _vector_store is None:
+        _vector_store = VectorStoreService()
+    return _vector_store
+
+
+async def init_vector_store() -> None:
+    """Bootstrap the collection at startup; on failure it is retried on first use."""
+    try:
+        await get_vector_store().initialize()
+    except Exception as e:
+        logger.warning("Qdrant bootstrap failed, will retry on first use", extra={"error": str(e)})
+
+
+async def close_vector_store() -> None:
+    """Close the process-wide vector store client."""
+    global _vector_store
+    if _vector_store is not None:
+        await _vector_store.close()
+        _vector_store = None
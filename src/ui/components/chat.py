@@ -7,10 +7,13 @@ from nicegui import ui
 class ChatMessage:
     """A single chat message component - WhatsApp style bubble."""
 
-    def __init__(self, role: str, content: str, is_dark: bool = True):
+    def __init__(self, role: str, content: str, is_dark: bool = True, streaming: bool = False):
         self.role = role
         self.content = content
         self.is_dark = is_dark
+        self.streaming = streaming
+        self.markdown = None
+        self.status_label = None
         self._render()
 
     def _render(self):
@@ -45,13 +48,47 @@ class ChatMessage:
                             ui.icon("smart_toy").classes("text-purple-400 text-xs")
                             ui.label("Assistente").classes("text-purple-400 text-xs font-semibold")
 
+                    # Tool activity / typing indicator while streaming
+                    if self.streaming:
+                        self.status_label = ui.label("Sto pensando...").classes("text-gray-400 text-xs italic")
+
                     # Message content
-                    ui.markdown(self.content).classes(f"{bubble_text} text-sm leading-relaxed")
+                    self.markdown = ui.markdown(self.content).classes(f"{bubble_text} text-sm leading-relaxed")
 
                     # Timestamp (optional, styled like WhatsApp)
                     # ui.label("10:30").classes("text-xs text-gray-400 text-right mt-1")
 
 
+class StreamingChatMessage(ChatMessage):
+    """Assistant bubble updated incrementally while the agent streams its answer."""
+
+    def __init__(self, is_dark: bool = True):
+        super().__init__("assistant", "", is_dark, streaming=True)
+
+    def append(self, token: str):
+        """Append a streamed token."""
+        self.content += token
+        self.markdown.set_content(self.content)
+        if self.status_label.visible and self.content.strip():
+            self.status_label.visible = False
+
+    def reset(self):
+        """Discard streamed text (e.g. preamble of a tool-calling turn)."""
+        self.content = ""
+        self.markdown.set_content("")
+
+    def set_status(self, text: str):
+        """Show tool activity under the header."""
+        self.status_label.set_text(text)
+        self.status_label.visible = bool(text)
+
+    def finalize(self, content: str):
+        """Replace streamed text with the final message content."""
+        self.content = content
+        self.markdown.set_content(content)
+        self.status_label.visible = False
+
+
 class ChatInput:
     """Chat input component - Floating centered style."""
 
@@ -225,6 +262,11 @@ class ChatContainer:
         with self.container:
             ChatMessage(role, content, self.is_dark)
 
+    def add_streaming_message(self) -> StreamingChatMessage:
+        """Add an empty assistant bubble to be filled by streamed tokens."""
+        with self.container:
+            return StreamingChatMessage(self.is_dark)
+
     def clear(self):
         self.container.clear()
 
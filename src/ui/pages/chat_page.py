@@ -3,7 +3,7 @@
 
 from nicegui import app, ui
 
-from src.core.agent_graph import get_agent_graph_response
+from src.core.agent_graph import stream_agent_graph_response
 from src.services.database import (
     add_message,
     create_conversation,
@@ -220,6 +220,8 @@ class ChatPage:
 
         # Show loading
         self.loading_spinner.visible = True
+        bubble = self.chat_container.add_streaming_message()
+        self.chat_container.scroll_to_bottom()
 
         try:
             # Get message history for context
@@ -229,17 +231,28 @@ class ChatPage:
             history = [{"role": m.role, "content": m.content} for m in messages[:-1]]
             # Pass thread_id for LangGraph checkpointing
             thread_id = f"conv_{self.selected_conv_id}"
-            response = await get_agent_graph_response(message, history, thread_id)
-            response_text = response.content
-
-            # Save and display response
+            response_text = ""
+            async for event in stream_agent_graph_response(message, history, thread_id):
+                if event["type"] == "token":
+                    bubble.append(event["content"])
+                    self.chat_container.scroll_to_bottom()
+                elif event["type"] == "tool_start":
+                    # Text streamed before a tool call is not part of the final answer
+                    bubble.reset()
+                    bubble.set_status(f"Strumento in uso: {event['name']}...")
+                elif event["type"] == "tool_end":
+                    bubble.set_status("Sto elaborando i risultati...")
+                elif event["type"] == "final":
+                    response_text = event["message"].content
+
+            # Persist the final response once
+            bubble.finalize(response_text)
             async with get_db_session() as session:
                 await add_message(session, self.selected_conv_id, "assistant", response_text)
-            self.chat_container.add_message("assistant", response_text)
 
         except Exception as e:
             error_msg = f"Errore: {str(e)}"
-            self.chat_container.add_message("assistant", error_msg)
+            bubble.finalize(error_msg)
             ui.notify(error_msg, type="negative")
 
         finally:
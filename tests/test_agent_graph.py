@@ -0,0 +1,168 @@
+"""
+Tests for the LangGraph agent graph.
+"""
+
+import asyncio
+import itertools
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.core import agent_graph
+
+
+@pytest.fixture
+def fake_llm(monkeypatch) -> GenericFakeChatModel:
+    """Replace the tool-bound LLM with a deterministic fake."""
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Apple is trading at 150 USD")]))
+    monkeypatch.setattr(agent_graph, "llm_with_tools", llm)
+    return llm
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """Tests for stream_agent_graph_response."""
+
+    async def test_streams_tokens_then_final(self, fake_llm) -> None:
+        """Test that tokens are streamed and the final message is emitted once."""
+        events = [e async for e in agent_graph.stream_agent_graph_response("Price of AAPL?", [])]
+
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        finals = [e for e in events if e["type"] == "final"]
+
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Apple is trading at 150 USD"
+        assert len(finals) == 1
+        assert events[-1] is finals[0]
+        assert finals[0]["message"].content == "Apple is trading at 150 USD"
+
+
+@pytest.mark.unit
+class TestCompiledGraphCache:
+    """Tests for get_compiled_graph."""
+
+    async def test_compiles_once_per_checkpointer(self, monkeypatch) -> None:
+        """Test that the compiled graph is reused until the checkpointer changes."""
+        checkpointers = [InMemorySaver()]
+
+        async def fake_get_checkpointer():
+            return checkpointers[-1]
+
+        monkeypatch.setattr(agent_graph, "get_checkpointer", fake_get_checkpointer)
+        monkeypatch.setattr(agent_graph, "_compiled_graph", None)
+        monkeypatch.setattr(agent_graph, "_compiled_graph_checkpointer", None)
+
+        first = await agent_graph.get_compiled_graph()
+        assert await agent_graph.get_compiled_graph() is first
+
+        checkpointers.append(InMemorySaver())
+        assert await agent_graph.get_compiled_graph() is not first
+
+
+@pytest.mark.unit
+class TestCheckpointerPool:
+    """Tests for the pooled Postgres checkpointer."""
+
+    @pytest.fixture
+    def fake_pool(self, monkeypatch) -> MagicMock:
+        pool = MagicMock(min_size=5, max_size=15)
+        pool.open = AsyncMock()
+        pool.close = AsyncMock()
+        pool.get_stats.return_value = {"pool_size": 8, "pool_available": 2, "requests_waiting": 0}
+        pool_cls = MagicMock(return_value=pool)
+        saver = MagicMock()
+        saver.return_value.setup = AsyncMock()
+        monkeypatch.setattr(agent_graph, "AsyncConnectionPool", pool_cls)
+        monkeypatch.setattr(agent_graph, "AsyncPostgresSaver", saver)
+        monkeypatch.setattr(agent_graph, "_checkpointer", None)
+        monkeypatch.setattr(agent_graph, "_checkpointer_pool", None)
+        monkeypatch.setattr(agent_graph, "_checkpointer_lock", asyncio.Lock())
+        return pool_cls
+
+    async def test_opens_single_pool(self, fake_pool: MagicMock) -> None:
+        """Test that concurrent callers share one pool sized from settings."""
+        checkpointers = await asyncio.gather(*(agent_graph.get_checkpointer() for _ in range(10)))
+
+        assert fake_pool.call_count == 1
+        assert all(c is checkpointers[0] for c in checkpointers)
+        kwargs = fake_pool.call_args.kwargs
+        assert kwargs["min_size"] == agent_graph.settings.DB_POOL_SIZE
+        assert kwargs["max_size"] == agent_graph.settings.DB_POOL_SIZE + agent_graph.settings.DB_MAX_OVERFLOW
+        assert kwargs["kwargs"]["autocommit"] is True
+
+    async def test_stats_and_close(self, fake_pool: MagicMock) -> None:
+        """Test saturation metrics and that closing releases the pool."""
+        assert agent_graph.checkpointer_pool_stats() == {}
+        await agent_graph.open_checkpointer()
+
+        stats = agent_graph.checkpointer_pool_stats()
+        assert stats["in_use"] == 6
+        assert stats["saturation"] == 0.4
+
+        await agent_graph.close_checkpointer()
+        fake_pool.return_value.close.assert_awaited_once()
+        assert agent_graph.checkpointer_pool_stats() == {}
+
+
+@pytest.mark.unit
+class TestCheckpointAwareAssembly:
+    """Tests for checkpoint-aware message assembly and thread compaction."""
+
+    @pytest.fixture
+    def checkpointed(self, monkeypatch) -> InMemorySaver:
+        checkpointer = InMemorySaver()
+
+        async def fake_get_checkpointer():
+            return checkpointer
+
+        llm = GenericFakeChatModel(messages=(AIMessage(content="answer") for _ in itertools.count()))
+        monkeypatch.setattr(agent_graph, "llm_with_tools", llm)
+        monkeypatch.setattr(agent_graph, "get_checkpointer", fake_get_checkpointer)
+        monkeypatch.setattr(agent_graph, "_compiled_graph", None)
+        return checkpointer
+
+    async def _stored(self, thread_id: str) -> list:
+        graph = await agent_graph.get_compiled_graph()
+        snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        return snapshot.values["messages"]
+
+    async def test_sends_only_new_message(self, checkpointed) -> None:
+        """Test that later turns rely on the checkpoint instead of replaying history."""
+        history: list[dict] = []
+        for turn in range(3):
+            question = f"question {turn}"
+            _, graph_input, _ = await agent_graph._prepare_invocation(question, history, "conv_1")
+            assert len(graph_input["messages"]) == (2 if turn == 0 else 1)
+            await agent_graph.get_agent_graph_response(question, history, "conv_1")
+            history += [{"role": "user", "content": question}, {"role": "assistant", "content": "answer"}]
+
+        stored = await self._stored("conv_1")
+        assert len(stored) == 7  # system + 3 x (human, ai)
+        assert sum(isinstance(m, SystemMessage) for m in stored) == 1
+
+    async def test_compacts_bloated_thread(self, checkpointed) -> None:
+        """Test that threads written with full-history replay are compacted."""
+        graph = await agent_graph.get_compiled_graph()
+        config = {"configurable": {"thread_id": "conv_2"}}
+        history: list[dict] = []
+        for turn in range(3):
+            question = f"question {turn}"
+            # Pre-fix behaviour: system prompt + full DB history replayed every turn
+            replay = [
+                SystemMessage(content="system"),
+                *agent_graph.format_history_to_langchain(history),
+                HumanMessage(content=question),
+            ]
+            await graph.ainvoke({"messages": replay}, config=config)
+            history += [{"role": "user", "content": question}, {"role": "assistant", "content": "answer"}]
+
+        removed = await agent_graph.compact_thread("conv_2")
+
+        stored = await self._stored("conv_2")
+        assert removed == 2 + 2 + 4  # two extra system prompts + replays of 2 and 4 messages
+        assert [m.type for m in stored] == ["system", "human", "ai", "human", "ai", "human", "ai"]
+        assert [m.content for m in stored if m.type == "human"] == ["question 0", "question 1", "question 2"]
+        assert await agent_graph.compact_thread("conv_2") == 0
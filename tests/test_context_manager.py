@@ -0,0 +1,115 @@
+"""
+Tests for the token-budgeted context window manager.
+"""
+
+import itertools
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.core import agent_graph, context_manager
+
+TEMPLATE = "Riepilogo: {summary}"
+
+
+def _conversation(turns: int, tool_chars: int = 0) -> list:
+    messages = [SystemMessage(content="system", id="sys")]
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i} " * 20, id=f"h{i}"))
+        if tool_chars:
+            call = {"name": "stock_scoring_tool", "args": {"ticker": "AAPL"}, "id": f"call{i}"}
+            messages.append(AIMessage(content="", tool_calls=[call], id=f"c{i}"))
+            messages.append(ToolMessage(content="x" * tool_chars, tool_call_id=f"call{i}", id=f"t{i}"))
+        messages.append(AIMessage(content=f"answer {i} " * 20, id=f"a{i}"))
+    return messages
+
+
+@pytest.mark.unit
+class TestBuildPrompt:
+    """Tests for build_prompt."""
+
+    def test_small_conversation_unchanged(self) -> None:
+        """Test that a conversation within budget is passed through verbatim."""
+        messages = _conversation(3)
+        assert context_manager.build_prompt(messages, "", TEMPLATE, 10_000, 1500) == messages
+
+    def test_always_fits_budget(self) -> None:
+        """Test that huge tool outputs and long histories are trimmed to the budget."""
+        messages = _conversation(30, tool_chars=40_000)
+        messages.append(HumanMessage(content="current", id="now"))
+
+        prompt = context_manager.build_prompt(messages, "old summary " * 50, TEMPLATE, 2_000, 1500)
+
+        assert context_manager.count_messages_tokens(prompt) <= 2_000
+        assert prompt[0].id == "sys"
+        assert prompt[1].content.startswith("Riepilogo:")
+        assert prompt[-1].id == "now"
+        # Tool results are never separated from the AI message that requested them
+        for index, message in enumerate(prompt):
+            if isinstance(message, ToolMessage):
+                assert prompt[index - 1].tool_calls[0]["id"] == message.tool_call_id
+
+    def test_current_tool_output_shrunk_last(self) -> None:
+        """Test that the current turn keeps its tool output when past turns can be dropped."""
+        messages = _conversation(10, tool_chars=4_000)
+
+        prompt = context_manager.build_prompt(messages, "", TEMPLATE, 3_000, 200)
+
+        assert prompt[-2].content == "x" * 4_000
+        assert all(len(m.content) < 4_000 for m in prompt[:-2] if isinstance(m, ToolMessage))
+
+
+@pytest.mark.unit
+class TestSummarizationSelection:
+    """Tests for select_messages_to_summarize and token caching."""
+
+    def test_threshold_and_recent_turns(self) -> None:
+        """Test that old turns are folded only above the threshold, keeping recent turns."""
+        messages = _conversation(10)
+        kwargs = {"keep_recent_turns": 4, "threshold": 0.75, "tool_output_max_tokens": 1500}
+
+        assert context_manager.select_messages_to_summarize(messages, "", budget=100_000, **kwargs) == []
+
+        folded = context_manager.select_messages_to_summarize(messages, "", budget=500, **kwargs)
+        assert [m.id for m in folded] == [f"{p}{i}" for i in range(6) for p in ("h", "a")]
+
+    def test_token_count_cached_per_id(self) -> None:
+        """Test that token counts are cached by message id."""
+        message = HumanMessage(content="abcd" * 10, id="cached-msg")
+        first = context_manager.count_tokens(message)
+        message.content = ""  # stored messages never change; the cache wins
+        assert context_manager.count_tokens(message) == first == 14
+
+
+@pytest.mark.unit
+class TestContextNode:
+    """Tests for the context manager node in the graph."""
+
+    async def test_old_turns_folded_into_stored_summary(self, monkeypatch) -> None:
+        """Test that the graph stores a rolling summary and removes summarized turns."""
+        checkpointer = InMemorySaver()
+
+        async def fake_get_checkpointer():
+            return checkpointer
+
+        answers = (AIMessage(content="answer " * 200) for _ in itertools.count())
+        monkeypatch.setattr(agent_graph, "llm_with_tools", GenericFakeChatModel(messages=answers))
+        summaries = (AIMessage(content=f"summary {i}") for i in itertools.count())
+        monkeypatch.setattr(agent_graph, "llm", GenericFakeChatModel(messages=summaries))
+        monkeypatch.setattr(agent_graph, "CONTEXT_BUDGET", 2_000)
+        monkeypatch.setattr(agent_graph, "get_checkpointer", fake_get_checkpointer)
+        monkeypatch.setattr(agent_graph, "_compiled_graph", None)
+
+        for turn in range(8):
+            events = [e async for e in agent_graph.stream_agent_graph_response(f"question {turn}", [], "conv_ctx")]
+            assert not any(e["type"] == "token" and "summary" in e["content"] for e in events)
+
+        graph = await agent_graph.get_compiled_graph()
+        state = (await graph.aget_state({"configurable": {"thread_id": "conv_ctx"}})).values
+
+        assert state["summary"].startswith("summary")
+        turns = sum(isinstance(m, HumanMessage) for m in state["messages"])
+        assert turns <= agent_graph.settings.CONTEXT_KEEP_RECENT_TURNS + 1
+        assert state["messages"][-2].content == "question 7"
@@ -0,0 +1,71 @@
+"""
+Tests for the embedding cache.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.embedding_cache import EmbeddingCache, normalize_text, point_id_for, text_hash
+
+
+@pytest.mark.unit
+class TestNormalization:
+    """Tests for cache key normalization."""
+
+    def test_equivalent_texts_share_key(self) -> None:
+        """Test that case, whitespace and Unicode width differences map to one key."""
+        assert normalize_text("  Cos'è   l'EV/EBITDA?\n") == "cos'è l'ev/ebitda?"
+        assert text_hash("What is P/E") == text_hash("what  is Ｐ/Ｅ")
+        assert text_hash("What is P/E") != text_hash("What is P/B")
+
+    def test_point_ids_are_content_hashes(self) -> None:
+        """Test that point IDs are deterministic and ignore case/whitespace differences."""
+        assert point_id_for("P/E ratio") == point_id_for("p/e   ratio")
+        assert point_id_for("P/E ratio") != point_id_for("P/B ratio")
+
+
+@pytest.mark.unit
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    async def test_memory_tier(self) -> None:
+        """Test hits, model isolation and float32 storage."""
+        cache = EmbeddingCache(max_entries=10)
+        assert await cache.get("nomic", "what is P/E") is None
+
+        await cache.set("nomic", "what is P/E", [0.1, 0.2, 0.3])
+        vector = await cache.get("nomic", "What is  P/E")
+
+        assert vector.dtype == np.float32
+        np.testing.assert_allclose(vector, [0.1, 0.2, 0.3], rtol=1e-6)
+        assert await cache.get("other-model", "what is P/E") is None
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+    async def test_persistent_tier_promotes_to_memory(self, monkeypatch) -> None:
+        """Test that persistent hits are served without the embedding model and cached in memory."""
+        store: dict = {}
+
+        async def fake_store(model, rows):
+            store.update({(model, digest): vector.tobytes() for digest, vector in rows.items()})
+
+        async def fake_load(model, digests):
+            found = {d: store[(model, d)] for d in digests if (model, d) in store}
+            return {d: np.frombuffer(data, dtype=np.float32) for d, data in found.items()}
+
+        writer = EmbeddingCache(max_entries=10, persistent=True)
+        reader = EmbeddingCache(max_entries=10, persistent=True)
+        for cache in (writer, reader):
+            monkeypatch.setattr(cache, "_store_many", fake_store)
+            monkeypatch.setattr(cache, "_load_many", fake_load)
+
+        await writer.set("nomic", "dividend yield", [1.0, 2.0])
+        first = await reader.get("nomic", "Dividend Yield")
+        second = await reader.get("nomic", "dividend yield")
+
+        np.testing.assert_array_equal(first, [1.0, 2.0])
+        assert second is first
+        assert reader.stats()["persistent_hits"] == 1
+        assert reader.stats()["memory_hits"] == 1
@@ -0,0 +1,75 @@
+"""
+Tests for the vectorized universe scoring engine.
+"""
+
+import random
+
+import pytest
+
+from src.services import financial, market_data
+
+# Threshold values and their neighbours, to exercise every < / <= boundary
+BOUNDARY_VALUES = {
+    "trailingPE": [14.99, 15, 29.99, 30, 44.99, 45, -3.0, 120.0],
+    "returnOnEquity": [0.0999, 0.10, 0.20, 0.2001, -0.05],
+    "debtToEquity": [0.99, 1, 2, 2.01, 150.0],
+    "beta": [0.79, 0.8, 1.2, 1.21, 1.5, 1.51, 2, 2.01],
+    "dividendYield": [0.0099, 0.01, 0.03, 0.0301, 0.0],
+    "revenueGrowth": [-0.01, 0, 0.10, 0.1001],
+    "enterpriseToEbitda": [7.99, 8, 14, 14.01],
+}
+
+
+def _random_info(rng: random.Random) -> dict:
+    info = {}
+    for field, candidates in BOUNDARY_VALUES.items():
+        choice = rng.random()
+        if choice < 0.15:
+            continue  # missing
+        if choice < 0.2:
+            info[field] = None
+        elif choice < 0.6:
+            info[field] = rng.choice(candidates)
+        else:
+            info[field] = rng.uniform(-1, 60)
+    return info
+
+
+@pytest.mark.unit
+class TestUniverseScoring:
+    """Tests for score_universe / analyze_universe."""
+
+    def test_matches_analyze_stock_sync(self, monkeypatch) -> None:
+        """Test per-ticker equivalence with the scalar scoring path."""
+        rng = random.Random(42)
+        infos = {f"T{i}": _random_info(rng) for i in range(500)}
+        monkeypatch.setattr(market_data, "get_info", lambda ticker: infos[ticker.upper()])
+
+        vectorized = financial.score_universe(infos)
+
+        for result in vectorized:
+            scalar = financial.analyze_stock_sync(result["ticker"])
+            assert result["scores"] == scalar["scores"]
+            assert result["total_score"] == scalar["total_score"]
+            assert result["decision"] == scalar["decision"]
+            assert result["raw_metrics"] == scalar["raw_metrics"]
+
+    def test_ranking_by_metric(self, monkeypatch) -> None:
+        """Test ranking by a single score key with total-score tie-break."""
+        infos = {
+            "LOW": {"dividendYield": 0.005, "trailingPE": 10},
+            "HIGH": {"dividendYield": 0.05, "trailingPE": 50},
+            "HIGHER": {"dividendYield": 0.04, "trailingPE": 10},
+        }
+        monkeypatch.setattr(market_data, "get_info_batch", lambda tickers: infos)
+
+        result = financial.analyze_universe(list(infos), sort_by="dividend", top_n=2)
+
+        assert [r["ticker"] for r in result["ranking"]] == ["HIGHER", "HIGH"]
+        assert result["universe_size"] == 3
+        assert sum(result["summary"].values()) == 3
+
+    def test_invalid_sort_key(self) -> None:
+        """Test that unknown sort keys are rejected."""
+        result = financial.analyze_universe(["AAPL"], sort_by="price")
+        assert "error" in result
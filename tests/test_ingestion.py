@@ -0,0 +1,88 @@
+"""
+Tests for the bulk knowledge-base ingestion pipeline.
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from src.services.ingestion import IngestionPipeline, chunk_text
+from src.services.vector_store import VectorStoreService
+
+
+class FakeEmbedder:
+    """Deterministic embeddings derived from the text hash."""
+
+    def __init__(self):
+        self.calls: list[int] = []
+
+    async def create_embeddings(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(len(texts))
+        seeds = [int(hashlib.sha256(t.encode()).hexdigest()[:8], 16) for t in texts]
+        return np.stack([np.random.default_rng(s).random(VectorStoreService.VECTOR_SIZE) for s in seeds]).astype(
+            np.float32
+        )
+
+
+@pytest.fixture
+async def pipeline() -> IngestionPipeline:
+    store = VectorStoreService(client=AsyncQdrantClient(location=":memory:"))
+    yield IngestionPipeline(vector_store=store, embedder=FakeEmbedder(), batch_size=4, chunk_size=200, chunk_overlap=40)
+    await store.close()
+
+
+@pytest.mark.unit
+class TestChunking:
+    """Tests for chunk_text."""
+
+    def test_overlap_and_boundaries(self) -> None:
+        """Test that chunks respect the size, overlap and end on word boundaries."""
+        text = " ".join(f"word{i}" for i in range(300))
+        chunks = chunk_text(text, chunk_size=200, overlap=40)
+
+        assert all(len(c) <= 200 for c in chunks)
+        assert all(c.split()[-1].startswith("word") for c in chunks)
+        for previous, current in zip(chunks, chunks[1:], strict=False):
+            assert current.split()[0] in previous
+        assert chunks[-1].endswith("word299")
+
+
+@pytest.mark.unit
+class TestIngestionPipeline:
+    """Tests for IngestionPipeline."""
+
+    async def test_ingest_dedup_and_resume(self, tmp_path, pipeline: IngestionPipeline) -> None:
+        """Test batched ingestion, content dedup and skipping of already ingested files."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "pe.md").write_text("# P/E\n\n" + "Price to earnings explained. " * 40, encoding="utf-8")
+        (docs / "copy.txt").write_text("# P/E\n\n" + "Price to earnings explained. " * 40, encoding="utf-8")
+        (docs / "glossary.csv").write_text(
+            "term,text,topic\nROE,Return on equity,ratios\nBeta,Volatility vs market,risk\n"
+        )
+        (docs / "image.png").write_bytes(b"\x89PNG")
+        progress = tmp_path / "progress.json"
+
+        first = await pipeline.ingest_paths([docs], topic="kb", progress_file=progress)
+
+        count = (await pipeline.vector_store.client.count(VectorStoreService.COLLECTION_NAME)).count
+        assert first.files == 3
+        assert first.upserted == count
+        assert first.duplicates == first.chunks - count  # copy.txt adds nothing
+        assert max(pipeline.embedder.calls) <= 4
+
+        hits = await pipeline.vector_store.query(
+            (await pipeline.embedder.create_embeddings(["Return on equity"]))[0].tolist(), top_k=1
+        )
+        assert hits[0]["topic"] == "ratios"
+
+        second = await pipeline.ingest_paths([docs], progress_file=progress)
+        assert second.skipped_files == 3
+        assert second.upserted == 0
+
+        (docs / "glossary.csv").write_text("term,text\nEV,Enterprise value\n")
+        third = await pipeline.ingest_paths([docs], progress_file=progress)
+        assert third.files == 1
+        assert third.upserted == 1
@@ -0,0 +1,108 @@
+"""
+Tests for the Ollama service HTTP client.
+"""
+
+import json
+
+import httpx
+import numpy as np
+import pytest
+
+from src.services import llm
+from src.services.embedding_cache import EmbeddingCache
+from src.services.llm import OllamaService, batch_texts
+
+
+@pytest.mark.unit
+class TestOllamaHttpClient:
+    """Tests for the shared pooled HTTP client."""
+
+    async def test_client_is_shared(self) -> None:
+        """Test that one pooled client is reused until closed."""
+        client = llm.get_http_client()
+        assert llm.get_http_client() is client
+        assert client.timeout.read == llm.settings.LLM_TIMEOUT
+
+        await llm.close_http_client()
+        assert client.is_closed
+        assert llm.get_http_client() is not client
+        await llm.close_http_client()
+
+    async def test_requests_reuse_client(self, monkeypatch) -> None:
+        """Test that service calls go through the shared client."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"embeddings": [[0.1, 0.2]]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm, "_client", client)
+        monkeypatch.setattr(llm, "embedding_cache", EmbeddingCache(max_entries=10))
+
+        service = OllamaService()
+        assert await service.create_embedding("cos'è il P/E?") == pytest.approx([0.1, 0.2])
+        assert await service.create_embedding("what is P/E") == pytest.approx([0.1, 0.2])
+
+        assert len(requests) == 2
+        assert llm.get_http_client() is client
+        await client.aclose()
+
+    async def test_embedding_cache_skips_model(self, monkeypatch) -> None:
+        """Test that repeated equivalent queries hit the embedding cache."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"embeddings": [[0.5, 0.25]]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm, "_client", client)
+        monkeypatch.setattr(llm, "embedding_cache", EmbeddingCache(max_entries=10))
+
+        service = OllamaService()
+        first = await service.create_embedding("Cos'è l'EV/EBITDA?")
+        second = await service.create_embedding("cos'è   l'ev/ebitda?")
+
+        assert calls == 1
+        assert first == second == [0.5, 0.25]
+        await client.aclose()
+
+
+@pytest.mark.unit
+class TestBatchEmbeddings:
+    """Tests for OllamaService.create_embeddings."""
+
+    def test_batching_limits(self) -> None:
+        """Test that batches respect both the item and the token limits."""
+        texts = ["a" * 40] * 5 + ["b" * 400] + ["c" * 4]
+        batches = batch_texts(texts, max_batch=3, max_tokens=50)
+
+        assert [len(b) for b in batches] == [3, 2, 1, 1]
+        assert batches[2] == ["b" * 400]
+
+    async def test_matrix_with_cache(self, monkeypatch) -> None:
+        """Test batched requests, cache reuse and the returned float32 matrix."""
+        inputs: list[list[str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            assert request.url.path == "/api/embed"
+            inputs.append(body["input"])
+            return httpx.Response(200, json={"embeddings": [[len(t), 1.0] for t in body["input"]]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm, "_client", client)
+        monkeypatch.setattr(llm, "embedding_cache", EmbeddingCache(max_entries=100))
+        monkeypatch.setattr(llm.settings, "EMBEDDING_BATCH_SIZE", 2)
+
+        service = OllamaService()
+        await service.create_embedding("aa")
+        matrix = await service.create_embeddings(["aa", "bbb", "c", "bbb", "dddd"])
+
+        assert inputs == [["aa"], ["bbb", "c"], ["dddd"]]
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(matrix[:, 0], [2, 3, 1, 3, 4])
+        await client.aclose()
@@ -0,0 +1,199 @@
+"""
+Tests for the TTL cache and the cached market data layer.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.core.cache import SingleFlight, TTLCache
+from src.services import market_data, ohlcv_store
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Test that lookups are counted."""
+        cache = TTLCache(max_entries=4)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_expiration(self, monkeypatch) -> None:
+        """Test that entries expire after their TTL."""
+        now = [1000.0]
+        monkeypatch.setattr("src.core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1, ttl=10)
+
+        now[0] += 5
+        assert cache.get("a") == 1
+        now[0] += 10
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Tests for SingleFlight request coalescing."""
+
+    def test_concurrent_calls_share_one_execution(self) -> None:
+        """Test that concurrent callers for the same key run the function once."""
+        flights = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch() -> str:
+            calls.append(1)
+            release.wait(timeout=2)
+            return "NVDA"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flights.do, "NVDA", slow_fetch) for _ in range(8)]
+            while flights.stats()["coalesced"] < 7:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result(timeout=2) for f in futures]
+
+        assert results == ["NVDA"] * 8
+        assert len(calls) == 1
+        assert flights.stats()["in_flight"] == 0
+
+    def test_failed_execution_not_memoized(self) -> None:
+        """Test that a failed execution is not memoized."""
+        flights = SingleFlight()
+
+        def failing() -> None:
+            raise ValueError("upstream error")
+
+        with pytest.raises(ValueError):
+            flights.do("key", failing)
+        assert flights.do("key", lambda: 42) == 42
+
+
+@pytest.mark.unit
+class TestMarketDataCache:
+    """Tests for the market data read-through cache."""
+
+    @pytest.fixture(autouse=True)
+    def fake_ticker(self, monkeypatch) -> MagicMock:
+        market_data.clear_cache()
+        monkeypatch.setattr(market_data.settings, "OHLCV_STORE_ENABLED", False)
+        ticker_cls = MagicMock()
+        ticker_cls.return_value.info = {"trailingPE": 12.0}
+        monkeypatch.setattr(market_data.yf, "Ticker", ticker_cls)
+        yield ticker_cls
+        market_data.clear_cache()
+
+    def test_info_fetched_once(self, fake_ticker: MagicMock) -> None:
+        """Test that repeated info lookups hit the cache."""
+        assert market_data.get_info("aapl") == {"trailingPE": 12.0}
+        assert market_data.get_info("AAPL ") == {"trailingPE": 12.0}
+        assert fake_ticker.call_count == 1
+        assert market_data.cache_stats()["datasets"]["info"]["hits"] >= 1
+
+    def test_history_keyed_by_period(self, fake_ticker: MagicMock) -> None:
+        """Test that history is cached separately per period."""
+        market_data.get_history("AAPL", "1mo")
+        market_data.get_history("AAPL", "1y")
+        market_data.get_history("AAPL", "1mo")
+        history = fake_ticker.return_value.history
+        assert history.call_count == 2
+
+    def test_loader_errors_not_cached(self, fake_ticker: MagicMock) -> None:
+        """Test that failed fetches are retried on the next call."""
+        fake_ticker.return_value.history.side_effect = [RuntimeError("rate limited"), "ok"]
+        with pytest.raises(RuntimeError):
+            market_data.get_history("AAPL", "1mo")
+        assert market_data.get_history("AAPL", "1mo") == "ok"
+
+    def test_batch_history_does_not_replace_single_history(self, fake_ticker: MagicMock, monkeypatch) -> None:
+        """Test that yf.download frames are cached apart from per-ticker history."""
+        batch = pd.DataFrame({"Close": [1.0]}, index=pd.DatetimeIndex(["2024-01-02"]))
+        monkeypatch.setattr(market_data.yf, "download", MagicMock(return_value=batch))
+        fake_ticker.return_value.history.return_value = "ticker history"
+
+        assert market_data.get_history_batch(["AAPL"], "1y")["AAPL"] is not None
+        assert market_data.get_history("AAPL", "1y") == "ticker history"
+        assert market_data.cache_stats()["datasets"]["history_batch"]["misses"] == 1
+
+    def test_unwritable_store_falls_back_to_upstream(self, fake_ticker: MagicMock, tmp_path, monkeypatch) -> None:
+        """Test that history still works when the OHLCV store path can't be created."""
+        blocker = tmp_path / "readonly"
+        blocker.write_text("")  # a file where the store directory should be
+        monkeypatch.setattr(market_data.settings, "OHLCV_STORE_ENABLED", True)
+        monkeypatch.setattr(ohlcv_store.settings, "OHLCV_STORE_PATH", str(blocker / "ohlcv.sqlite3"))
+        monkeypatch.setattr(ohlcv_store, "_store", None)
+        monkeypatch.setattr(ohlcv_store, "_store_failed", False)
+        fake_ticker.return_value.history.return_value = "bars"
+
+        assert market_data.get_history("AAPL", "1mo") == "bars"
+        assert ohlcv_store.get_ohlcv_store() is None
+
+
+@pytest.mark.unit
+class TestCompareStocks:
+    """Tests for the batched compare_stocks_sync path."""
+
+    def test_vectorized_rankings(self, monkeypatch) -> None:
+        """Test rankings computed on the columnar frame."""
+        import pandas as pd
+
+        from src.services import financial
+
+        infos = {
+            "AAA": {"trailingPE": 20.0, "returnOnEquity": 0.10, "marketCap": 100},
+            "BBB": {"trailingPE": 0, "returnOnEquity": 0.30, "marketCap": 300},
+            "CCC": {"trailingPE": 12.0, "returnOnEquity": None, "marketCap": 200},
+        }
+        closes = {"AAA": [10.0, 11.0], "BBB": [10.0, 9.0], "CCC": [10.0, 15.0]}
+        monkeypatch.setattr(market_data, "get_info_batch", lambda tickers: infos)
+        monkeypatch.setattr(
+            market_data,
+            "get_history_batch",
+            lambda tickers, period: {t: pd.DataFrame({"Close": c}) for t, c in closes.items()},
+        )
+
+        result = financial.compare_stocks_sync(["aaa", "bbb", "ccc", "AAA"])
+
+        assert result["tickers"] == ["AAA", "BBB", "CCC"]
+        assert result["rankings"] == {
+            "lowest_pe": "CCC",
+            "highest_roe": "BBB",
+            "largest_market_cap": "BBB",
+            "best_performance_1y": "CCC",
+        }
+        assert result["comparison"][2]["change_1y_pct"] == 50.0
+
+    def test_ticker_cap(self, monkeypatch) -> None:
+        """Test that the ticker list is capped at MAX_COMPARE_TICKERS."""
+        from src.services import financial
+
+        monkeypatch.setattr(market_data, "get_info_batch", lambda tickers: {})
+        monkeypatch.setattr(market_data, "get_history_batch", lambda tickers, period: {})
+
+        result = financial.compare_stocks_sync([f"T{i}" for i in range(80)])
+        assert len(result["tickers"]) == financial.MAX_COMPARE_TICKERS
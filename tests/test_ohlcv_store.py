@@ -0,0 +1,120 @@
+"""
+Tests for the incremental OHLCV history store.
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.services import ohlcv_store
+from src.services.ohlcv_store import OHLCVStore
+
+
+def _bars(start: str, end: str, close: float = 100.0) -> pd.DataFrame:
+    index = pd.bdate_range(start, end, tz="America/New_York", name="Date")
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000.0,
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+@pytest.mark.unit
+class TestOHLCVStore:
+    """Tests for OHLCVStore."""
+
+    @pytest.fixture
+    def upstream(self, monkeypatch) -> MagicMock:
+        today = pd.Timestamp.today().normalize()
+
+        def history(period: str | None = None, start: str | None = None) -> pd.DataFrame:
+            begin = pd.Timestamp(start) if start else today - pd.DateOffset(years=20)
+            frame = _bars(begin.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d"))
+            frame.iloc[-1, frame.columns.get_loc("Close")] = 123.0  # latest (partial) bar
+            return frame
+
+        ticker_cls = MagicMock()
+        ticker_cls.return_value.history.side_effect = history
+        monkeypatch.setattr(ohlcv_store.yf, "Ticker", ticker_cls)
+        return ticker_cls.return_value.history
+
+    def test_serves_shorter_periods_locally(self, tmp_path, upstream: MagicMock) -> None:
+        """Test that a cached long range serves shorter periods without fetching."""
+        store = OHLCVStore(tmp_path / "ohlcv.sqlite3", refresh_interval=3600)
+
+        one_year = store.get_history("aapl", "1y")
+        one_month = store.get_history("AAPL", "1mo")
+        five_days = store.get_history("AAPL", "5d")
+
+        assert upstream.call_count == 1
+        assert len(one_month) < len(one_year)
+        assert len(five_days) == 5
+        assert one_month["Close"].iloc[-1] == 123.0
+        assert one_month.index[0] >= pd.Timestamp.today().normalize() - pd.DateOffset(months=1)
+
+    def test_longer_period_triggers_backfill(self, tmp_path, upstream: MagicMock) -> None:
+        """Test that requesting beyond stored coverage fetches the missing range."""
+        store = OHLCVStore(tmp_path / "ohlcv.sqlite3", refresh_interval=3600)
+
+        store.get_history("AAPL", "1mo")
+        store.get_history("AAPL", "1y")
+        store.get_history("AAPL", "6mo")
+
+        assert upstream.call_count == 2
+
+    def test_stale_data_fetches_only_tail(self, tmp_path, upstream: MagicMock) -> None:
+        """Test that refreshes request bars from the last stored date only."""
+        store = OHLCVStore(tmp_path / "ohlcv.sqlite3", refresh_interval=0)
+
+        store.get_history("AAPL", "1y")
+        store.get_history("AAPL", "1y")
+
+        last_call = upstream.call_args_list[-1]
+        last_date = pd.Timestamp.today().normalize()
+        while last_date.weekday() >= 5:
+            last_date -= pd.Timedelta(days=1)
+        assert last_call.kwargs == {"start": last_date.strftime("%Y-%m-%d")}
+
+    def test_split_in_tail_refetches_history(self, tmp_path, monkeypatch) -> None:
+        """Test that a split in the refreshed tail replaces the stored (pre-split) bars."""
+        today = pd.Timestamp.today().normalize()
+        split_day = today - pd.Timedelta(days=1)
+        while split_day.weekday() >= 5:
+            split_day -= pd.Timedelta(days=1)
+        state = {"split": False}
+
+        def history(period: str | None = None, start: str | None = None) -> pd.DataFrame:
+            begin = pd.Timestamp(start) if start else today - pd.DateOffset(years=20)
+            frame = _bars(begin.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d"))
+            if state["split"]:
+                # 10:1 split: upstream re-adjusts the bars before it to the post-split price
+                frame[["Open", "High", "Low", "Close"]] /= 10
+                frame.loc[frame.index.normalize().tz_localize(None) == split_day, "Stock Splits"] = 10.0
+            return frame
+
+        ticker_cls = MagicMock()
+        ticker_cls.return_value.history.side_effect = history
+        monkeypatch.setattr(ohlcv_store.yf, "Ticker", ticker_cls)
+        upstream = ticker_cls.return_value.history
+        store = OHLCVStore(tmp_path / "ohlcv.sqlite3", refresh_interval=3600)
+
+        store.get_history("AAPL", "1y")
+        # Pretend the last stored bar predates the split and the data is stale
+        with store._connect() as conn:
+            conn.execute("DELETE FROM bars WHERE date >= ?", (split_day.strftime("%Y-%m-%d"),))
+            conn.execute("UPDATE coverage SET last_date = (SELECT MAX(date) FROM bars), refreshed_at = 0")
+        state["split"] = True
+
+        frame = store.get_history("AAPL", "1y")
+
+        assert upstream.call_count == 3  # initial load, tail, full refetch
+        assert (frame["Close"] == 10.0).all()  # no artificial -90% gap
+        assert frame["Stock Splits"].max() == 10.0
@@ -0,0 +1,98 @@
+"""
+Tests for the bounded bcrypt hasher pool.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.exceptions import ServiceOverloadedError
+from src.core.password_hasher import PasswordHasher, hash_rounds
+from src.services import auth_service
+
+
+@pytest.fixture
+def hasher() -> PasswordHasher:
+    instance = PasswordHasher(max_workers=2, max_queue=2, rounds=4)
+    yield instance
+    instance.shutdown()
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """Tests for PasswordHasher."""
+
+    async def test_hash_and_verify(self, hasher: PasswordHasher) -> None:
+        """Test that hashes verify and use the configured cost factor."""
+        hashed = await hasher.hash("S3cret!pw")
+
+        assert hash_rounds(hashed) == 4
+        assert await hasher.verify("S3cret!pw", hashed)
+        assert not await hasher.verify("wrong", hashed)
+
+    async def test_event_loop_stays_responsive(self) -> None:
+        """Test that the loop keeps running other coroutines while bcrypt works."""
+        hasher = PasswordHasher(max_workers=1, max_queue=0, rounds=11)
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await hasher.hash("S3cret!pw")
+        task.cancel()
+        hasher.shutdown()
+
+        assert ticks >= 3
+
+    async def test_backpressure(self) -> None:
+        """Test that calls beyond workers + queue are rejected instead of queued."""
+        hasher = PasswordHasher(max_workers=1, max_queue=1, rounds=8)
+        results = await asyncio.gather(*(hasher.hash("S3cret!pw") for _ in range(4)), return_exceptions=True)
+        hasher.shutdown()
+
+        rejected = [r for r in results if isinstance(r, ServiceOverloadedError)]
+        assert len(rejected) == 2
+        assert rejected[0].status_code == 503
+        assert hasher.stats()["rejected"] == 2
+        assert hasher.stats()["pending"] == 0
+
+    async def test_usable_after_shutdown(self, hasher: PasswordHasher) -> None:
+        """Test that a shut-down hasher starts a fresh pool on the next call (e.g. a second lifespan)."""
+        hashed = await hasher.hash("S3cret!pw")
+
+        await asyncio.to_thread(hasher.shutdown)
+
+        assert await hasher.verify("S3cret!pw", hashed)
+
+    async def test_verify_and_update(self, hasher: PasswordHasher) -> None:
+        """Test that a valid password with an outdated cost factor gets a new hash."""
+        old = await PasswordHasher(max_workers=1, max_queue=0, rounds=5).hash("S3cret!pw")
+
+        valid, new_hash = await hasher.verify_and_update("S3cret!pw", old)
+        assert valid and hash_rounds(new_hash) == 4
+        assert await hasher.verify_and_update("S3cret!pw", new_hash) == (True, None)
+        assert await hasher.verify_and_update("wrong", old) == (False, None)
+
+
+@pytest.mark.unit
+class TestRehashOnLogin:
+    """Tests for transparent rehash in authenticate_user."""
+
+    async def test_login_upgrades_hash(self, hasher: PasswordHasher, monkeypatch) -> None:
+        """Test that a successful login stores a hash with the current cost factor."""
+        old = await PasswordHasher(max_workers=1, max_queue=0, rounds=5).hash("S3cret!pw")
+        user = SimpleNamespace(hashed_password=old, failed_login_attempts=2, locked_until=None, last_login=None)
+        monkeypatch.setattr(auth_service, "password_hasher", hasher)
+        monkeypatch.setattr(auth_service, "get_user_by_username", AsyncMock(return_value=user))
+        session = AsyncMock()
+
+        assert await auth_service.authenticate_user(session, "mario", "S3cret!pw") is user
+        assert hash_rounds(user.hashed_password) == 4
+        assert user.failed_login_attempts == 0
+        session.commit.assert_awaited_once()
@@ -0,0 +1,81 @@
+"""
+Tests for the short-TTL authenticated principal cache.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services import auth_service, principal_cache
+from src.services.principal_cache import Principal, get_principal
+
+
+def _session(*rows) -> AsyncMock:
+    """AsyncSession stub whose execute() returns the given rows, one per call."""
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(first=MagicMock(return_value=row)) for row in rows]
+    return session
+
+
+def _row(role: str = "user", is_active: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(id=7, username="mario", role=role, is_active=is_active, email_verified=True)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    principal_cache.clear_principal_cache()
+    yield
+    principal_cache.clear_principal_cache()
+
+
+@pytest.mark.unit
+class TestPrincipalCache:
+    """Tests for get_principal and its invalidation."""
+
+    async def test_repeated_lookups_hit_cache(self) -> None:
+        """Test that only the first lookup within the TTL queries the DB."""
+        session = _session(_row())
+
+        first = await get_principal(session, 7)
+        for _ in range(5):
+            assert await get_principal(session, 7) is first
+
+        assert first == Principal(id=7, username="mario", role="user", is_active=True, email_verified=True)
+        assert session.execute.await_count == 1
+        assert principal_cache.principal_cache_stats()["hits"] == 5
+
+    async def test_missing_user_not_cached(self) -> None:
+        """Test that unknown users are looked up again rather than cached."""
+        session = _session(None, _row())
+
+        assert await get_principal(session, 7) is None
+        assert await get_principal(session, 7) is not None
+
+    def test_role_properties(self) -> None:
+        """Test that admin checks mirror the User model."""
+        assert Principal(1, "root", "sysadmin", True, True).is_admin
+        assert Principal(1, "root", "sysadmin", True, True).is_sysadmin
+        assert not Principal(2, "ann", "admin", True, True).is_sysadmin
+        assert not Principal(3, "bob", "user", True, True).is_admin
+
+    async def test_update_user_invalidates(self, monkeypatch) -> None:
+        """Test that deactivating a user is visible on the next lookup."""
+        session = _session(_row(), _row(is_active=False))
+        await get_principal(session, 7)
+
+        user = SimpleNamespace(id=7, is_active=True)
+        monkeypatch.setattr(auth_service, "get_user_by_id", AsyncMock(return_value=user))
+        await auth_service.update_user(session, 7, is_active=False)
+
+        assert not (await get_principal(session, 7)).is_active
+
+    async def test_delete_user_invalidates(self, monkeypatch) -> None:
+        """Test that a deleted user is not served from the cache."""
+        session = _session(_row(), None)
+        await get_principal(session, 7)
+
+        monkeypatch.setattr(auth_service, "get_user_by_id", AsyncMock(return_value=SimpleNamespace(id=7)))
+        assert await auth_service.delete_user(session, 7)
+
+        assert await get_principal(session, 7) is None
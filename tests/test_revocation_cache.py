@@ -0,0 +1,136 @@
+"""
+Tests for the Bloom-filter token revocation cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.services.revocation_cache import BloomFilter, RevocationCache
+
+
+class FakeBlacklist:
+    """In-memory token_blacklist standing in for the DB queries of RevocationCache."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, datetime] = {}
+        self.loads = 0
+        self.lookups = 0
+
+    def revoke(self, jti: str, at: datetime | None = None) -> None:
+        self.rows[jti] = at or datetime.now(timezone.utc)
+
+    async def load(self, session, since):
+        self.loads += 1
+        return [(jti, at) for jti, at in self.rows.items() if since is None or at >= since]
+
+    async def exists(self, session, jti):
+        self.lookups += 1
+        return jti in self.rows
+
+
+@pytest.fixture
+def blacklist(monkeypatch: pytest.MonkeyPatch) -> FakeBlacklist:
+    fake = FakeBlacklist()
+    monkeypatch.setattr(RevocationCache, "_load", staticmethod(fake.load))
+    monkeypatch.setattr(RevocationCache, "_exists", staticmethod(fake.exists))
+    return fake
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    def test_no_false_negatives(self) -> None:
+        """Test that every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert 990 <= bloom.count <= 1000  # approximate: a false positive on add is not counted
+
+    def test_false_positive_rate_near_target(self) -> None:
+        """Test that the false-positive rate at capacity stays close to the configured rate."""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"revoked-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives / 10000 < 0.03
+
+    def test_readding_does_not_inflate_count(self) -> None:
+        """Test that re-adding the same item (sync overlap) is not counted twice."""
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        bloom.add("a")
+        bloom.add("a")
+
+        assert bloom.count == 1
+
+
+@pytest.mark.unit
+class TestRevocationCache:
+    """Tests for RevocationCache."""
+
+    async def test_negative_checks_skip_db(self, blacklist: FakeBlacklist) -> None:
+        """Test that non-revoked tokens are answered by the filter without a DB lookup."""
+        blacklist.revoke("revoked")
+        cache = RevocationCache(capacity=100, error_rate=0.001, sync_interval=60)
+        await cache.sync(None, full=True)
+
+        for i in range(50):
+            assert not await cache.is_revoked(None, f"valid-{i}")
+        assert await cache.is_revoked(None, "revoked")
+
+        assert blacklist.lookups == 1
+        assert blacklist.loads == 1
+        assert cache.stats()["filter_negatives"] == 50
+
+    async def test_local_revocation_visible_immediately(self, blacklist: FakeBlacklist) -> None:
+        """Test that a revocation made by this process is seen before the next sync."""
+        cache = RevocationCache(capacity=100, error_rate=0.001, sync_interval=60)
+        await cache.sync(None, full=True)
+
+        blacklist.revoke("logout")
+        cache.add("logout")
+
+        assert await cache.is_revoked(None, "logout")
+        assert blacklist.loads == 1
+
+    async def test_incremental_sync_picks_up_other_processes(self, blacklist: FakeBlacklist) -> None:
+        """Test that rows written elsewhere are loaded by the next watermark sync."""
+        cache = RevocationCache(capacity=100, error_rate=0.001, sync_interval=60)
+        blacklist.revoke("old", datetime.now(timezone.utc) - timedelta(days=1))
+        blacklist.revoke("recent", datetime.now(timezone.utc) - timedelta(minutes=10))
+        await cache.sync(None, full=True)
+
+        blacklist.revoke("remote")
+        assert not await cache.is_revoked(None, "remote")  # not synced yet
+
+        loaded = await cache.sync(None)
+        assert loaded == 2  # "recent" (watermark minus overlap) and "remote", not "old"
+        assert await cache.is_revoked(None, "remote")
+
+    async def test_unsynced_cache_falls_back_to_db(self, blacklist: FakeBlacklist) -> None:
+        """Test that checks go to the DB while the filter cannot be trusted."""
+
+        async def failing_load(session, since):
+            raise ConnectionError("db down")
+
+        blacklist.revoke("revoked")
+        cache = RevocationCache(capacity=100, error_rate=0.001, sync_interval=60)
+        cache._load = failing_load
+
+        assert await cache.is_revoked(None, "revoked")
+        assert not await cache.is_revoked(None, "valid")
+        assert blacklist.lookups == 2
+        assert cache.stats()["filter_negatives"] == 0
+
+    async def test_stale_check_triggers_sync(self, blacklist: FakeBlacklist) -> None:
+        """Test that the first check after the sync interval refreshes the filter inline."""
+        cache = RevocationCache(capacity=100, error_rate=0.001, sync_interval=0)
+        blacklist.revoke("remote")
+
+        assert await cache.is_revoked(None, "remote")
+        assert blacklist.loads == 1
@@ -0,0 +1,146 @@
+"""
+Tests for the persistent web search cache.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services import knowledge, search_cache, search_provider
+from src.services.search_cache import SearchCache, cache_key, ttl_for
+
+RESULTS = [{"snippet": f"snippet {i}", "link": f"https://example.com/{i}"} for i in range(5)]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> SearchCache:
+    instance = SearchCache(tmp_path / "search.sqlite3")
+    monkeypatch.setattr(search_cache, "_cache", instance)
+    monkeypatch.setattr(knowledge.settings, "SERPAPI_CACHE_ENABLED", True)
+    return instance
+
+
+class FakeProvider:
+    """Records queries and returns canned results."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def search(self, query: str, gl: str, hl: str) -> list[dict]:
+        self.calls.append(query)
+        await asyncio.sleep(0)
+        return RESULTS
+
+
+@pytest.fixture
+def upstream(monkeypatch) -> list[str]:
+    provider = FakeProvider()
+    monkeypatch.setattr(search_provider, "_provider", provider)
+    return provider.calls
+
+
+@pytest.mark.unit
+class TestKeysAndTTL:
+    """Tests for query normalization and TTL selection."""
+
+    def test_normalized_key(self) -> None:
+        """Test that case, spacing and trailing punctuation don't split the cache."""
+        assert cache_key("Cos'è il  P/E?", "it", "it") == cache_key("cos'è il p/e", "it", "it")
+        assert cache_key("p/e", "it", "it") != cache_key("p/e", "us", "en")
+
+    def test_news_queries_expire_sooner(self) -> None:
+        """Test that time-sensitive queries get the short TTL."""
+        assert ttl_for("ENEL ultime notizie") == knowledge.settings.SERPAPI_CACHE_TTL_NEWS
+        assert ttl_for("cos'è l'EBITDA") == knowledge.settings.SERPAPI_CACHE_TTL_EVERGREEN
+
+
+@pytest.mark.unit
+class TestGoogleSearch:
+    """Tests for google_search on top of the cache."""
+
+    async def test_hit_serves_any_num_results(self, cache: SearchCache, upstream: list[str]) -> None:
+        """Test that raw results are reused for a different num_results without refetching."""
+        assert await knowledge.google_search("Definizione P/E", 1) == "snippet 0"
+        assert await knowledge.google_search("definizione p/e?", 3) == "snippet 0 snippet 1 snippet 2"
+
+        assert upstream == ["Definizione P/E"]
+        assert cache.stats()["hits"] == 1
+
+    async def test_stale_served_then_revalidated(self, cache: SearchCache, upstream: list[str], monkeypatch) -> None:
+        """Test that a stale entry is returned immediately and refreshed in the background."""
+        key = cache_key("definizione p/e", knowledge.settings.SERPAPI_GL, knowledge.settings.SERPAPI_HL)
+        now = time.time()
+        monkeypatch.setattr(search_cache.time, "time", lambda: now - 150)
+        cache.set(key, "definizione p/e", [{"snippet": "old"}], ttl=100)
+        monkeypatch.setattr(search_cache.time, "time", lambda: now)
+
+        assert await knowledge.google_search("definizione p/e") == "old"
+        await asyncio.gather(*knowledge._refreshing.values())
+
+        assert upstream == ["definizione p/e"]
+        assert cache.get(key) == (RESULTS, False)
+        assert cache.stats()["stale_hits"] == 1
+
+    async def test_expired_entry_is_refetched(self, cache: SearchCache, upstream: list[str], monkeypatch) -> None:
+        """Test that entries past the stale window are fetched synchronously."""
+        key = cache_key("p/e", knowledge.settings.SERPAPI_GL, knowledge.settings.SERPAPI_HL)
+        now = time.time()
+        monkeypatch.setattr(search_cache.time, "time", lambda: now - 250)
+        cache.set(key, "p/e", [{"snippet": "old"}], ttl=100)
+        monkeypatch.setattr(search_cache.time, "time", lambda: now)
+
+        assert await knowledge.google_search("p/e") == "snippet 0"
+        assert upstream == ["p/e"]
+
+    async def test_concurrent_misses_coalesce(self, cache: SearchCache, upstream: list[str]) -> None:
+        """Test that identical in-flight searches share one upstream call."""
+        results = await asyncio.gather(*(knowledge.google_search("EV/EBITDA") for _ in range(5)))
+
+        assert set(results) == {"snippet 0"}
+        assert upstream == ["EV/EBITDA"]
+
+    async def test_sqlite_calls_run_off_the_event_loop(
+        self, cache: SearchCache, upstream: list[str], monkeypatch
+    ) -> None:
+        """Test that cache reads and writes don't run on the event loop thread."""
+        threads = []
+        for name in ("get", "set"):
+            original = getattr(cache, name)
+
+            def record(*args, _original=original):
+                threads.append(threading.get_ident())
+                return _original(*args)
+
+            monkeypatch.setattr(cache, name, record)
+
+        await knowledge.google_search("p/e")
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+    async def test_upstream_error(self, cache: SearchCache, monkeypatch) -> None:
+        """Test that SerpAPI failures degrade to a message and are not cached."""
+
+        class FailingProvider:
+            async def search(self, query: str, gl: str, hl: str) -> list[dict]:
+                raise RuntimeError("quota exceeded")
+
+        monkeypatch.setattr(search_provider, "_provider", FailingProvider())
+        assert await knowledge.google_search("p/e") == "No information found due to an error."
+        assert cache.stats()["size"] == 0
+
+    async def test_unwritable_cache_path_searches_uncached(self, tmp_path, upstream: list[str], monkeypatch) -> None:
+        """Test that search and metrics keep working when the cache can't be opened."""
+        blocker = tmp_path / "readonly"
+        blocker.write_text("")  # a file where the cache directory should be
+        monkeypatch.setattr(search_cache.settings, "SERPAPI_CACHE_PATH", str(blocker / "search.sqlite3"))
+        monkeypatch.setattr(search_cache, "_cache", None)
+        monkeypatch.setattr(search_cache, "_cache_failed", False)
+        monkeypatch.setattr(knowledge.settings, "SERPAPI_CACHE_ENABLED", True)
+
+        assert await knowledge.google_search("p/e") == "snippet 0"
+        assert await knowledge.google_search("p/e") == "snippet 0"
+        assert upstream == ["p/e", "p/e"]
+        assert (await knowledge.search_cache_stats())["enabled"] is False
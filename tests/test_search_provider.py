@@ -0,0 +1,80 @@
+"""
+Tests for the async web search provider.
+"""
+
+import httpx
+import pytest
+
+from src.core.exceptions import ExternalServiceError
+from src.services.search_provider import SerpApiProvider, backoff_delay
+
+ORGANIC = [{"snippet": "EV/EBITDA is ...", "link": "https://example.com"}]
+
+
+def _provider(responses: list, max_retries: int = 2) -> tuple[SerpApiProvider, list[httpx.Request]]:
+    """Provider backed by a stand-in transport replaying ``responses`` (exceptions are raised)."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://search.local")
+    return SerpApiProvider(client=client, max_retries=max_retries, backoff_base=0.001, backoff_max=0.002), requests
+
+
+@pytest.mark.unit
+class TestSerpApiProvider:
+    """Tests for SerpApiProvider."""
+
+    async def test_search_params(self) -> None:
+        """Test the request shape and that organic results are returned."""
+        provider, requests = _provider([httpx.Response(200, json={"organic_results": ORGANIC})])
+
+        assert await provider.search("EV/EBITDA", "it", "it") == ORGANIC
+        assert requests[0].url.path == "/search.json"
+        assert requests[0].url.params["q"] == "EV/EBITDA"
+        assert requests[0].url.params["gl"] == "it"
+
+    async def test_retries_transient_failures(self) -> None:
+        """Test that timeouts and 503/429 are retried until success."""
+        provider, requests = _provider(
+            [
+                httpx.ReadTimeout("slow"),
+                httpx.Response(503),
+                httpx.Response(200, json={"organic_results": ORGANIC}),
+            ]
+        )
+
+        assert await provider.search("p/e", "it", "it") == ORGANIC
+        assert len(requests) == 3
+
+    async def test_gives_up_after_max_retries(self) -> None:
+        """Test that exhausted retries raise ExternalServiceError."""
+        provider, requests = _provider([httpx.Response(429, json={"error": "rate limited"})] * 3)
+
+        with pytest.raises(ExternalServiceError, match="rate limited"):
+            await provider.search("p/e", "it", "it")
+        assert len(requests) == 3
+
+    async def test_client_errors_fail_fast(self) -> None:
+        """Test that non-retryable errors (e.g. invalid key) are not retried."""
+        provider, requests = _provider([httpx.Response(401, json={"error": "Invalid API key"})])
+
+        with pytest.raises(ExternalServiceError, match="Invalid API key"):
+            await provider.search("p/e", "it", "it")
+        assert len(requests) == 1
+
+    async def test_no_results_is_empty(self) -> None:
+        """Test that SerpAPI's 200 'no results' error maps to an empty list."""
+        provider, _ = _provider([httpx.Response(200, json={"error": "Google hasn't returned any results"})])
+        assert await provider.search("zzzz", "it", "it") == []
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        """Test that delays stay within [0, min(cap, base * 2**attempt)]."""
+        delays = [backoff_delay(attempt, 0.5, 4.0) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= d <= 4.0 for d in delays)
+        assert all(0 <= backoff_delay(0, 0.5, 4.0) <= 0.5 for _ in range(50))
@@ -0,0 +1,45 @@
+"""
+Tests for the local BM25 sparse encoder.
+"""
+
+import pytest
+
+from src.services.sparse import document_vector, query_vector, term_index, tokenize
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """Tests for tokenize."""
+
+    def test_keeps_tickers_and_acronyms(self) -> None:
+        """Test that tickers and acronyms are indexed whole and by parts."""
+        terms = tokenize("ENEL.MI trades at 6x EV/EBITDA, below the S&P 500")
+
+        assert "enel.mi" in terms and "enel" in terms
+        assert "ev/ebitda" in terms and "ebitda" in terms
+        assert "s&p" in terms
+        assert "the" not in terms
+
+    def test_stopwords_removed(self) -> None:
+        """Test that English and Italian stopwords are dropped."""
+        assert tokenize("il rapporto P/E della società") == ["rapporto", "p/e", "p", "società"]
+
+
+@pytest.mark.unit
+class TestVectors:
+    """Tests for document_vector and query_vector."""
+
+    def test_document_weights_saturate(self) -> None:
+        """Test that repeated terms weigh more, with BM25 saturation."""
+        vector = document_vector("dividend dividend dividend yield")
+        weights = dict(zip(vector.indices, vector.values, strict=True))
+
+        dividend, yield_ = weights[term_index("dividend")], weights[term_index("yield")]
+        assert yield_ < dividend < 3 * yield_
+        assert vector.indices == sorted(vector.indices)
+
+    def test_query_is_binary(self) -> None:
+        """Test that query vectors carry one unit weight per distinct term."""
+        vector = query_vector("ROE roe ROE")
+        assert vector.indices == [term_index("roe")]
+        assert vector.values == [1.0]
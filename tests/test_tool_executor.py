@@ -0,0 +1,116 @@
+"""
+Tests for the tool execution engine.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import ToolNode
+
+from src.core.tool_executor import Histogram, ToolExecutor
+
+
+class _Probe:
+    """Blocking function that records its peak concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return value
+
+
+@pytest.mark.unit
+class TestToolExecutor:
+    """Tests for ToolExecutor."""
+
+    async def test_per_tool_limit(self) -> None:
+        """Test that a tool never exceeds its concurrency limit while others still run."""
+        executor = ToolExecutor(max_workers=8, default_limit=4, limits={"web_search_tool": 2})
+        search, prices = _Probe(), _Probe()
+
+        results = await asyncio.gather(
+            *(executor.run("web_search_tool", search, f"q{i}") for i in range(6)),
+            *(executor.run("stock_price_tool", prices, f"p{i}") for i in range(6)),
+        )
+
+        assert results[:2] == ["q0", "q1"]
+        assert search.peak == 2
+        assert prices.peak == 4
+        stats = executor.stats()["tools"]
+        assert stats["web_search_tool"]["run_time"]["count"] == 6
+        assert stats["web_search_tool"]["queue_wait"]["max_ms"] >= 50
+        assert stats["web_search_tool"]["in_flight"] == 0
+        executor.shutdown()
+
+    async def test_errors_counted(self) -> None:
+        """Test that failures propagate and are counted."""
+        executor = ToolExecutor(max_workers=2, default_limit=2)
+
+        def boom() -> None:
+            raise ValueError("upstream down")
+
+        with pytest.raises(ValueError):
+            await executor.run("stock_news_tool", boom)
+        assert executor.stats()["tools"]["stock_news_tool"]["errors"] == 1
+        executor.shutdown()
+
+    async def test_usable_after_shutdown(self) -> None:
+        """Test that a shut-down executor starts a fresh pool on the next call (e.g. a second lifespan)."""
+        executor = ToolExecutor(max_workers=2, default_limit=2)
+        assert await executor.run("stock_price_tool", str, 1) == "1"
+
+        await asyncio.to_thread(executor.shutdown)
+
+        assert await executor.run("stock_price_tool", str, 2) == "2"
+        executor.shutdown()
+
+    async def test_tool_calls_in_one_turn_run_concurrently(self) -> None:
+        """Test that several tool calls emitted in one turn execute in parallel."""
+        executor = ToolExecutor(max_workers=4, default_limit=4)
+        probe = _Probe(delay=0.2)
+
+        @tool("slow_tool")
+        async def slow_tool(value: str) -> str:
+            """Slow blocking tool."""
+            return await executor.run("slow_tool", probe, value)
+
+        calls = [{"name": "slow_tool", "args": {"value": str(i)}, "id": f"call{i}"} for i in range(4)]
+        start = time.perf_counter()
+        result = await ToolNode([slow_tool]).ainvoke({"messages": [AIMessage(content="", tool_calls=calls)]})
+
+        assert len(result["messages"]) == 4
+        assert probe.peak == 4
+        assert time.perf_counter() - start < 0.6
+        executor.shutdown()
+
+
+@pytest.mark.unit
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_quantiles_and_buckets(self) -> None:
+        """Test bucket counts and bucket-bound quantiles."""
+        histogram = Histogram()
+        for value in (0.5, 3, 3, 40, 2000):
+            histogram.observe(value)
+
+        stats = histogram.stats()
+        assert stats["count"] == 5
+        assert stats["p50_ms"] == 5
+        assert stats["max_ms"] == 2000
+        assert stats["buckets"]["1"] == 1
+        assert stats["buckets"]["+Inf"] == 5
@@ -0,0 +1,202 @@
+"""
+Tests for the Qdrant vector store service.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+
+from src.services import vector_store
+from src.services.vector_store import COLLECTION_PROFILES, VectorStoreService, get_collection_profile, mmr_rerank
+
+
+def _vector(seed: int) -> list[float]:
+    return np.random.default_rng(seed).random(VectorStoreService.VECTOR_SIZE).tolist()
+
+
+@pytest.fixture
+async def store() -> VectorStoreService:
+    service = VectorStoreService(client=AsyncQdrantClient(location=":memory:"))
+    yield service
+    await service.close()
+
+
+@pytest.mark.unit
+class TestVectorStoreService:
+    """Tests for VectorStoreService on the async client."""
+
+    async def test_bootstrap_once(self, store: VectorStoreService, monkeypatch) -> None:
+        """Test that the collection is created once and not re-checked per call."""
+        await store.initialize()
+        calls = 0
+        original = store.client.collection_exists
+
+        async def counting(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(store.client, "collection_exists", counting)
+        await store.add_context(question_id=1, embedding=_vector(1), text="P/E ratio")
+        await store.search(_vector(1))
+
+        assert calls == 0
+        assert await original(collection_name=store.COLLECTION_NAME)
+
+    async def test_add_and_search(self, store: VectorStoreService) -> None:
+        """Test that the nearest stored context is returned."""
+        await store.add_context(question_id=1, embedding=_vector(1), text="P/E ratio")
+        await store.add_context(question_id=2, embedding=_vector(2), text="EV/EBITDA")
+
+        assert await store.search(_vector(2)) == "EV/EBITDA"
+
+    def test_singleton(self, monkeypatch) -> None:
+        """Test that tools share one service instance."""
+        monkeypatch.setattr(vector_store, "_vector_store", None)
+        monkeypatch.setattr(vector_store, "VectorStoreService", lambda: object())
+        assert vector_store.get_vector_store() is vector_store.get_vector_store()
+
+
+@pytest.mark.unit
+class TestRetrieval:
+    """Tests for top-k retrieval, thresholds, filters and MMR."""
+
+    async def test_threshold_and_filters(self, store: VectorStoreService) -> None:
+        """Test score threshold and topic/date payload filters."""
+        base = np.ones(VectorStoreService.VECTOR_SIZE)
+        await store.add_context(question_id=1, embedding=base.tolist(), text="P/E", topic="valuation")
+        tilted = base + 0.1 * np.arange(768) / 768
+        await store.add_context(question_id=2, embedding=tilted.tolist(), text="EV", topic="valuation")
+        await store.add_context(question_id=3, embedding=(-base).tolist(), text="opposite", topic="dividends")
+
+        hits = await store.query(base.tolist(), top_k=5, score_threshold=0.5)
+        assert [h["text"] for h in hits] == ["P/E", "EV"]
+        assert hits[0]["score"] == pytest.approx(1.0, abs=1e-4)
+        assert hits[0]["topic"] == "valuation"
+
+        assert [h["text"] for h in await store.query(base.tolist(), topic="dividends")] == ["opposite"]
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+        assert await store.query(base.tolist(), created_after=future) == []
+
+    async def test_mmr_prefers_diverse_hits(self, store: VectorStoreService) -> None:
+        """Test that MMR skips near-duplicates of an already selected hit."""
+        rng = np.random.default_rng(0)
+        query = rng.normal(size=768)
+        other = rng.normal(size=768)
+        await store.add_context(question_id=1, embedding=(query + 0.1 * other).tolist(), text="a")
+        await store.add_context(question_id=2, embedding=(query + 0.11 * other).tolist(), text="a-duplicate")
+        await store.add_context(question_id=3, embedding=(query - 0.3 * other).tolist(), text="b")
+
+        plain = await store.query(query.tolist(), top_k=2)
+        diverse = await store.query(query.tolist(), top_k=2, mmr=True, mmr_lambda=0.5)
+
+        assert [h["text"] for h in plain] == ["a", "a-duplicate"]
+        assert [h["text"] for h in diverse] == ["a", "b"]
+
+
+@pytest.mark.unit
+class TestCollectionProfiles:
+    """Tests for collection profiles."""
+
+    async def test_quantized_profile(self, monkeypatch) -> None:
+        """Test that a quantized profile creates int8 storage and still answers queries."""
+        service = VectorStoreService(
+            client=AsyncQdrantClient(location=":memory:"), profile=COLLECTION_PROFILES["balanced"]
+        )
+        created = {}
+        original = service.client.create_collection
+
+        async def spy(**kwargs):
+            created.update(kwargs)
+            return await original(**kwargs)
+
+        monkeypatch.setattr(service.client, "create_collection", spy)
+        await service.add_context(question_id=1, embedding=_vector(1), text="P/E ratio")
+
+        assert created["vectors_config"].on_disk is True
+        assert created["quantization_config"].scalar.type == models.ScalarType.INT8
+        assert service._search_params.quantization.rescore is True
+        assert (await service.query(_vector(1), top_k=1))[0]["id"] == 1
+        await service.close()
+
+    def test_unknown_profile(self) -> None:
+        """Test that an unknown profile name is rejected."""
+        with pytest.raises(ValueError, match="balanced"):
+            get_collection_profile("turbo")
+
+
+@pytest.mark.unit
+class TestHybridRetrieval:
+    """Tests for dense + sparse retrieval with RRF."""
+
+    async def test_exact_ticker_match(self, store: VectorStoreService) -> None:
+        """Test that an exact ticker wins through the sparse branch when dense ranking misses it."""
+        await store.add_context(question_id=1, embedding=_vector(1), text="ENEL.MI pays a semiannual dividend")
+        await store.add_context(question_id=2, embedding=_vector(2), text="Utilities dividend overview")
+
+        dense_only = await store.query(_vector(2), top_k=1)
+        hybrid = await store.query(_vector(2), top_k=2, query_text="ENEL.MI")
+
+        assert dense_only[0]["id"] == 2
+        assert [hit["id"] for hit in hybrid] == [1, 2]
+
+    async def test_threshold_applies_to_keyword_matches(self, store: VectorStoreService) -> None:
+        """Test that a sparse-only match below the cosine threshold is dropped and scores are cosine."""
+        document, unrelated = np.zeros(VectorStoreService.VECTOR_SIZE), np.zeros(VectorStoreService.VECTOR_SIZE)
+        document[0], unrelated[1] = 1.0, 1.0
+        await store.add_context(question_id=1, embedding=document.tolist(), text="ENEL.MI pays a dividend")
+
+        assert await store.query(unrelated.tolist(), query_text="ENEL.MI", score_threshold=0.5) == []
+        hits = await store.query(unrelated.tolist(), query_text="ENEL.MI")
+        assert hits[0]["score"] == 0.0
+        assert hits[0]["rrf_score"] > 0
+        assert (await store.query(document.tolist(), query_text="ENEL.MI", score_threshold=0.5))[0]["score"] == 1.0
+
+    async def test_legacy_collection_falls_back_to_dense(self) -> None:
+        """Test that a collection created without sparse vectors keeps working dense-only."""
+        client = AsyncQdrantClient(location=":memory:")
+        await client.create_collection(
+            VectorStoreService.COLLECTION_NAME,
+            vectors_config=models.VectorParams(size=VectorStoreService.VECTOR_SIZE, distance=models.Distance.COSINE),
+        )
+        service = VectorStoreService(client=client)
+        await service.add_context(question_id=1, embedding=_vector(1), text="ENEL.MI")
+
+        assert service.hybrid is False
+        assert (await service.query(_vector(1), query_text="ENEL.MI"))[0]["id"] == 1
+        await service.close()
+
+
+@pytest.mark.unit
+class TestWriteDedup:
+    """Tests for write-path deduplication."""
+
+    async def test_exact_and_near_duplicates(self, store: VectorStoreService) -> None:
+        """Test that repeats refresh, longer near-duplicates replace, and new knowledge is added."""
+        base = np.asarray(_vector(1))
+        near = (base + 0.01).tolist()
+
+        assert await store.write_deduplicated(1, base.tolist(), "P/E ratio", 0.95) == (1, "created")
+        assert await store.write_deduplicated(1, base.tolist(), "P/E ratio", 0.95) == (1, "refreshed")
+        assert await store.write_deduplicated(2, near, "P/E", 0.95) == (1, "refreshed")
+        assert await store.write_deduplicated(3, near, "P/E ratio: price / EPS", 0.95) == (1, "replaced")
+        assert await store.write_deduplicated(4, _vector(2), "Dividend yield", 0.95) == (4, "created")
+
+        assert (await store.client.count(store.COLLECTION_NAME)).count == 2
+        assert await store.search(base.tolist()) == "P/E ratio: price / EPS"
+
+
+@pytest.mark.unit
+class TestMMR:
+    """Tests for mmr_rerank."""
+
+    def test_lambda_one_is_relevance_order(self) -> None:
+        """Test that lambda=1 reduces to plain relevance ranking."""
+        rng = np.random.default_rng(1)
+        query, candidates = rng.normal(size=16), rng.normal(size=(20, 16))
+        relevance = candidates @ query / np.linalg.norm(candidates, axis=1)
+
+        assert mmr_rerank(query, candidates, 5, lambda_mult=1.0) == list(np.argsort(-relevance)[:5])
+        assert mmr_rerank(query, candidates[:0], 5) == []